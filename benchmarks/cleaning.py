@@ -0,0 +1,76 @@
+"""Compare the single-pass text cleaner with the previous two-pass implementation.
+
+Usage:
+    python -m benchmarks.cleaning [--large] [--repeat 5]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+
+from benchmarks.corpus import DEFAULT_CORPUS, LARGE_CORPUS, build_corpus
+from src.core import iter_pdf_pages
+from src.utils.transformation import clean_extracted_text
+
+LEGACY_HYPHEN_PATTERN = r"-\s*\n\s*"
+LEGACY_SPACING_PATTERN = r"\b(?:[A-ZÄÖÜa-zäöü]-?\s){2,}[A-ZÄÖÜa-zäöü]\b"
+
+
+def legacy_clean(text: str) -> str:
+    """Clean text the way the previous implementation did, with two uncompiled passes.
+
+    Args:
+        text: Text to clean
+
+    Returns:
+        Cleaned text
+
+    """
+    text = re.sub(LEGACY_HYPHEN_PATTERN, "", text)
+    return re.sub(LEGACY_SPACING_PATTERN, lambda m: m.group(0).replace(" ", "").replace("- ", "-"), text)
+
+def time_cleaner(clean: Callable[[str], str], text: str, repeat: int) -> float:
+    """Measure the median time a cleaner takes on text.
+
+    Args:
+        clean: Cleaning function
+        text: Text to clean
+        repeat: Number of timed runs
+
+    Returns:
+        Median duration in seconds
+
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        clean(text)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main() -> None:
+    """Benchmark both cleaners on every corpus document and print the speedup."""
+    parser = argparse.ArgumentParser(description="Benchmark the text cleaner against the previous implementation.")
+    parser.add_argument("--corpus-dir", type=str, default=os.path.join(tempfile.gettempdir(), "pdf-translator-corpus"),
+                        help="Directory for the generated corpus, reused between runs")
+    parser.add_argument("--large", action="store_true", help="Include the 1000-page document")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per case. Default: 5")
+    args = parser.parse_args()
+
+    specs = DEFAULT_CORPUS + (LARGE_CORPUS if args.large else ())
+    print(f"{'document':<24} {'chars':>10} {'legacy':>10} {'current':>10} {'speedup':>8}  identical")
+    for pdf_path in build_corpus(args.corpus_dir, specs):
+        text = "".join(page.text for page in iter_pdf_pages(pdf_path))
+        legacy = time_cleaner(legacy_clean, text, args.repeat)
+        current = time_cleaner(clean_extracted_text, text, args.repeat)
+        identical = legacy_clean(text) == clean_extracted_text(text)
+        name = os.path.splitext(os.path.basename(pdf_path))[0]
+        print(f"{name:<24} {len(text):>10} {legacy * 1000:>8.1f}ms {current * 1000:>8.1f}ms "
+              f"{legacy / current:>7.2f}x  {'yes' if identical else 'no (Unicode letters)'}")
+
+if __name__ == "__main__":
+    main()
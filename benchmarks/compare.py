@@ -0,0 +1,59 @@
+"""Compare two benchmark result files.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 10]
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> dict[tuple[str, str], dict]:
+    """Load a benchmark result file.
+
+    Args:
+        path: Path to a JSON file written by benchmarks.run
+
+    Returns:
+        Measurements keyed by (document, stage)
+
+    """
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {(result["document"], result["stage"]): result for result in report["results"]}
+
+def main() -> None:
+    """Print the relative change of every case and exit non-zero on regressions."""
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline", type=str, help="Results of the reference commit")
+    parser.add_argument("candidate", type=str, help="Results of the commit under test")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Slowdown or memory growth in percent reported as a regression. Default: 10")
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    candidate = load_results(args.candidate)
+    regressions = 0
+
+    print(f"{'document':<24} {'stage':<10} {'time':>10} {'change':>8} {'peak RSS':>10} {'change':>8}")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        before, after = baseline[key], candidate[key]
+        time_change = (after["seconds"] / before["seconds"] - 1) * 100 if before["seconds"] else 0.0
+        rss_change = (after["peak_rss_mb"] / before["peak_rss_mb"] - 1) * 100 if before["peak_rss_mb"] else 0.0
+        flag = ""
+        if time_change > args.threshold or rss_change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key[0]:<24} {key[1]:<10} {after['seconds']:>9.3f}s {time_change:>+7.1f}% "
+              f"{after['peak_rss_mb']:>8.1f}MB {rss_change:>+7.1f}%{flag}")
+
+    for key in sorted(baseline.keys() ^ candidate.keys()):
+        print(f"{key[0]:<24} {key[1]:<10} only in {'baseline' if key in baseline else 'candidate'}")
+
+    if regressions:
+        print(f"\n{regressions} regression(s) above {args.threshold:.0f}%.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Synthetic PDF corpus generator for benchmarks."""
+
+import html
+import os
+import random
+from dataclasses import dataclass
+
+import pymupdf
+
+PAGE_RECT = pymupdf.Rect(56, 56, 539, 786)
+
+WORDS = {
+    "de": ("Übersetzung Vertrag Bedingungen Haftung Lieferung Anforderung Prüfung Größe Geschäftsführer "
+           "Maßnahme Gewährleistung Unterlagen Zeitraum Vereinbarung Kündigung Bestimmung die der das und "
+           "mit für von ist wird werden nicht auch eine einen"),
+    "en": ("translation contract conditions liability delivery requirement inspection size managing "
+           "measure warranty documents period agreement termination provision the of and with for from "
+           "is will be not also an a"),
+    "fr": ("traduction contrat conditions responsabilité livraison exigence contrôle taille gérant mesure "
+           "garantie documents période accord résiliation disposition le la les et avec pour de est sera "
+           "pas aussi une un"),
+    "ru": ("перевод договор условия ответственность поставка требование проверка размер директор мера "
+           "гарантия документы период соглашение расторжение положение и в с для от это будет не также"),  # noqa: RUF001
+    "el": ("μετάφραση σύμβαση όροι ευθύνη παράδοση απαίτηση έλεγχος μέγεθος διευθυντής μέτρο εγγύηση "
+           "έγγραφα περίοδος συμφωνία καταγγελία διάταξη και με για από είναι θα δεν επίσης"),  # noqa: RUF001
+    "zh": "翻译 合同 条件 责任 交付 要求 检查 尺寸 经理 措施 保证 文件 期间 协议 终止 规定 的 和 与 为 是 将 不 也",
+}
+VOCABULARY = {language: words.split() for language, words in WORDS.items()}
+
+DENSITY_WORDS = {
+    "sparse": 120,
+    "normal": 320,
+    "dense": 520,
+}
+# Only words of this length or longer are split by a hyphenated line break
+HYPHENATED_WORD_MIN_CHARS = 7
+
+
+@dataclass
+class CorpusSpec:
+    """Description of one synthetic benchmark document."""
+
+    name: str
+    pages: int
+    density: str = "normal"
+    languages: tuple[str, ...] = ("de",)
+    hyphenate: bool = True
+    spaced_headings: bool = True
+    running_headers: bool = False
+    technical: bool = False
+
+DEFAULT_CORPUS = (
+    CorpusSpec("de-normal-20", 20),
+    CorpusSpec("de-dense-200", 200, density="dense"),
+    CorpusSpec("en-sparse-200", 200, density="sparse", languages=("en",), hyphenate=False, spaced_headings=False),
+    CorpusSpec("mixed-normal-100", 100, languages=("de", "fr", "ru", "el", "zh")),
+    CorpusSpec("de-headers-100", 100, running_headers=True),
+)
+
+RUNNING_HEADER = "Muster GmbH · Rahmenvertrag über Lieferungen und Leistungen · Vertraulich"
+RUNNING_FOOTER = ("Diese Unterlage ist ausschließlich für den internen Gebrauch bestimmt. "
+                  "Weitergabe an Dritte nur mit schriftlicher Zustimmung. Seite {page} von {pages}")
+
+TECHNICAL_CODE = """def read_sensor(port, timeout=0.5):
+    frame = port.read(16)
+    if len(frame) != 16:
+        raise TimeoutError(port.name)
+    return int.from_bytes(frame[4:8], "little") / 1000"""
+
+LARGE_CORPUS = (
+    CorpusSpec("de-normal-1000", 1000),
+)
+
+TECHNICAL_CORPUS = (
+    CorpusSpec("de-spec-100", 100, technical=True),
+)
+
+def _sentence(rng: random.Random, words: list[str], language: str) -> str:
+    """Build a random sentence from a vocabulary.
+
+    Args:
+        rng: Random number generator
+        words: Vocabulary to draw from
+        language: Language code, used to pick the word separator
+
+    Returns:
+        Sentence text
+
+    """
+    separator = "" if language == "zh" else " "
+    sentence = separator.join(rng.choice(words) for _ in range(rng.randint(6, 16)))
+    return sentence[:1].upper() + sentence[1:] + ("。" if language == "zh" else ".")
+
+def _page_html(rng: random.Random, spec: CorpusSpec, page_number: int) -> str:
+    """Build the HTML body of one page.
+
+    Args:
+        rng: Random number generator
+        spec: Document description
+        page_number: Zero-based page number
+
+    Returns:
+        HTML fragment for the page
+
+    """
+    language = spec.languages[page_number % len(spec.languages)]
+    words = VOCABULARY[language]
+    parts = []
+    heading = rng.choice(words).upper()
+    if spec.spaced_headings and language != "zh":
+        heading = " ".join(heading)
+    parts.append(f"<h2>{html.escape(heading)}</h2>")
+
+    target_words = DENSITY_WORDS[spec.density]
+    written = 0
+    while written < target_words:
+        sentences = [_sentence(rng, words, language) for _ in range(rng.randint(2, 5))]
+        paragraph = html.escape(" ".join(sentences))
+        if spec.hyphenate and language != "zh":
+            split_word = max(paragraph.split(" "), key=len)
+            if len(split_word) >= HYPHENATED_WORD_MIN_CHARS:
+                cut = len(split_word) // 2
+                paragraph = paragraph.replace(split_word, f"{split_word[:cut]}-<br>{split_word[cut:]}", 1)
+        parts.append(f"<p>{paragraph}</p>")
+        written += sum(len(sentence.split()) for sentence in sentences)
+    if spec.technical:
+        parts.append(_technical_html(rng, page_number))
+    return "\n".join(parts)
+
+def _technical_html(rng: random.Random, page_number: int) -> str:
+    """Build the parts of an engineering specification page that need no translation.
+
+    A table of part numbers and measurements, a URL, a code listing and a
+    paragraph already in English.
+
+    Args:
+        rng: Random number generator
+        page_number: Zero-based page number
+
+    Returns:
+        HTML fragment
+
+    """
+    rows = [f"{rng.choice('ABKMX')}{rng.randint(100, 999)}-{rng.randint(1000, 9999)}  M{rng.choice((4, 5, 6, 8))}"
+            f"x{rng.randint(8, 60)}  {rng.uniform(0.5, 80):.2f}  {rng.uniform(0.01, 2):.3f}  {rng.randint(1, 500)}"
+            for _ in range(rng.randint(6, 12))]
+    english = " ".join(_sentence(rng, VOCABULARY["en"], "en") for _ in range(rng.randint(4, 6)))
+    return (f"<pre>{html.escape(chr(10).join(rows))}</pre>\n"
+            f"<p>https://docs.example.com/specs/{page_number + 1}/revision-{rng.randint(1, 9)}.html</p>\n"
+            f"<pre>{html.escape(TECHNICAL_CODE)}</pre>\n"
+            f"<p>{html.escape(english)}</p>")
+
+def generate_pdf(path: str, spec: CorpusSpec, seed: int = 0) -> str:
+    """Generate a synthetic PDF described by spec.
+
+    Args:
+        path: Output file path
+        spec: Document description
+        seed: Random seed, the same seed always produces the same document
+
+    Returns:
+        Path of the generated file
+
+    """
+    rng = random.Random(f"{seed}:{spec.name}")  # noqa: S311
+    with pymupdf.open() as doc:
+        for page_number in range(spec.pages):
+            page = doc.new_page()
+            page.insert_htmlbox(PAGE_RECT, _page_html(rng, spec, page_number),
+                                css="* {font-size: 9pt;} h2 {font-size: 13pt;}")
+            if spec.running_headers:
+                page.insert_text((56, 36), RUNNING_HEADER, fontsize=8)
+                page.insert_textbox(pymupdf.Rect(56, 800, 539, 830),
+                                    RUNNING_FOOTER.format(page=page_number + 1, pages=spec.pages), fontsize=7)
+        doc.save(path, garbage=3, deflate=True)
+    return path
+
+def build_corpus(directory: str, specs: tuple[CorpusSpec, ...] = DEFAULT_CORPUS, seed: int = 0) -> list[str]:
+    """Generate every document of a corpus, reusing files generated earlier.
+
+    Args:
+        directory: Directory to write the documents to
+        specs: Documents to generate
+        seed: Random seed
+
+    Returns:
+        Paths of the documents, in spec order
+
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for spec in specs:
+        path = os.path.join(directory, f"{spec.name}-seed{seed}.pdf")
+        if not os.path.exists(path):
+            generate_pdf(path, spec, seed)
+        paths.append(path)
+    return paths
@@ -0,0 +1,67 @@
+"""Measure the memory held by the document model against the size of the raw text.
+
+Usage:
+    python -m benchmarks.document_memory [--pages 1000] [--max-ratio 3]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from collections.abc import Callable
+
+from benchmarks.corpus import CorpusSpec, build_corpus
+from src.core import iter_pdf_pages
+
+
+def retained_bytes(build: Callable[[], object]) -> tuple[int, object]:
+    """Measure the memory still allocated for the result of a function once it returns.
+
+    Args:
+        build: Function creating the measured object
+
+    Returns:
+        Tuple of (bytes retained, created object)
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return after - before, result
+
+def main() -> None:
+    """Extract a large document into the model and fail if it is too large compared to its text."""
+    parser = argparse.ArgumentParser(description="Benchmark the memory footprint of the document model.")
+    parser.add_argument("--corpus-dir", type=str, default=os.path.join(tempfile.gettempdir(), "pdf-translator-corpus"),
+                        help="Directory for the generated corpus, reused between runs")
+    parser.add_argument("--pages", type=int, default=1000, help="Document size in pages. Default: 1000")
+    parser.add_argument("--max-ratio", type=float, default=3.0,
+                        help="Largest accepted model size as a multiple of the UTF-8 text size. Default: 3")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(f"de-normal-{args.pages}", args.pages)
+    pdf_path = build_corpus(args.corpus_dir, (spec,))[0]
+
+    model_bytes, pages = retained_bytes(lambda: list(iter_pdf_pages(pdf_path)))
+    text_bytes = sum(len(page.text.encode("utf-8")) for page in pages)
+    string_bytes = sum(sys.getsizeof(page.text) for page in pages)
+    blocks = sum(len(page.blocks) for page in pages)
+    lines = sum(1 for page in pages for _line in page.lines())
+
+    ratio = model_bytes / text_bytes
+    print(f"{len(pages)} pages, {blocks} blocks, {lines} lines, {text_bytes / 1e6:.2f} MB of UTF-8 text")
+    print(f"model:        {model_bytes / 1e6:>7.2f} MB ({ratio:.2f}x the text)")
+    print(f"page strings: {string_bytes / 1e6:>7.2f} MB ({string_bytes / text_bytes:.2f}x the text)")
+    if ratio > args.max_ratio:
+        sys.exit(f"model uses {ratio:.2f}x the text size, above the limit of {args.max_ratio:.2f}x")
+
+if __name__ == "__main__":
+    main()
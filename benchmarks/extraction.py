@@ -0,0 +1,66 @@
+"""Find the document size from which parallel extraction beats serial extraction.
+
+Usage:
+    python -m benchmarks.extraction [--workers 4] [--pages 25 50 100 200 400 1000] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.corpus import CorpusSpec, build_corpus
+from src.core import DEFAULT_EXTRACT_WORKERS, PARALLEL_EXTRACTION_MIN_PAGES, iter_pdf_pages
+
+DEFAULT_PAGE_COUNTS = (25, 50, 100, 200, 400, 1000)
+
+
+def time_extraction(pdf_path: str, workers: int, repeat: int) -> float:
+    """Measure the median time to extract every page of a document, pool startup included.
+
+    Args:
+        pdf_path: Path to the PDF file
+        workers: Number of extraction processes, 1 for serial extraction
+        repeat: Number of timed runs
+
+    Returns:
+        Median duration in seconds
+
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _page in iter_pdf_pages(pdf_path, workers=workers, min_parallel_pages=0):
+            pass
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main() -> None:
+    """Time serial and parallel extraction for each document size and print the crossover."""
+    parser = argparse.ArgumentParser(description="Benchmark serial against parallel page extraction.")
+    parser.add_argument("--corpus-dir", type=str, default=os.path.join(tempfile.gettempdir(), "pdf-translator-corpus"),
+                        help="Directory for the generated corpus, reused between runs")
+    parser.add_argument("--workers", type=int, default=max(DEFAULT_EXTRACT_WORKERS, 2),
+                        help="Extraction processes for the parallel runs. Default: CPU count, at least 2")
+    parser.add_argument("--pages", type=int, nargs="+", default=DEFAULT_PAGE_COUNTS,
+                        help="Document sizes to measure, in pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per case. Default: 3")
+    args = parser.parse_args()
+
+    specs = tuple(CorpusSpec(f"de-normal-{pages}", pages) for pages in sorted(args.pages))
+    print(f"{args.workers} workers on {os.cpu_count()} CPUs, "
+          f"serial below {PARALLEL_EXTRACTION_MIN_PAGES} pages by default")
+    print(f"{'pages':>6} {'serial':>10} {'parallel':>10} {'speedup':>8}")
+    crossover = None
+    for spec, pdf_path in zip(specs, build_corpus(args.corpus_dir, specs), strict=True):
+        serial = time_extraction(pdf_path, 1, args.repeat)
+        parallel = time_extraction(pdf_path, args.workers, args.repeat)
+        if crossover is None and parallel < serial:
+            crossover = spec.pages
+        print(f"{spec.pages:>6} {serial * 1000:>8.0f}ms {parallel * 1000:>8.0f}ms {serial / parallel:>7.2f}x")
+    print(f"parallel extraction is faster from {crossover} pages" if crossover
+          else "parallel extraction was not faster at any measured size")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Compare a new connection per request with the pooled keep-alive session of the Google backend.
+
+A local server imitates the translation page. It sleeps once per new
+connection to model TCP and TLS setup and once per request to model the
+translation itself.
+
+Usage:
+    python -m benchmarks.http_pool [--requests 200] [--workers 8] [--connect-ms 40] [--response-ms 20]
+"""
+
+import argparse
+import html
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+from src.backends import GoogleBackend
+from src.utils.metrics import METRICS
+
+
+class TranslationPageHandler(BaseHTTPRequestHandler):
+    """Answer every request with a page holding the query text as its translation."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connect_delay = 0.0
+    response_delay = 0.0
+
+    def setup(self) -> None:
+        """Accept a connection, paying the simulated connection setup time."""
+        super().setup()
+        time.sleep(self.connect_delay)
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Send the translation page."""
+        text = parse_qs(urlparse(self.path).query).get("q", [""])[0]
+        time.sleep(self.response_delay)
+        body = f'<html><body><div class="t0">{html.escape(text)}</div></body></html>'.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        """Keep the benchmark output clean."""
+
+def translate_unpooled(url: str, text: str) -> str:
+    """Request a translation on a new connection, as deep_translator does.
+
+    Args:
+        url: Address of the translation page
+        text: Text to translate
+
+    Returns:
+        Translated text
+
+    """
+    response = requests.get(url, params={"sl": "de", "tl": "en", "q": text}, timeout=30)
+    return BeautifulSoup(response.text, "html.parser").find("div", {"class": "t0"}).get_text(strip=True)
+
+def run(translate: Callable[[str], str], texts: list[str], workers: int) -> tuple[float, list[float]]:
+    """Translate texts concurrently and time each request.
+
+    Args:
+        translate: Function translating one text
+        texts: Texts to translate
+        workers: Number of concurrent requests
+
+    Returns:
+        Tuple of (wall time in seconds, duration of each request in seconds)
+
+    """
+    def timed(text: str) -> float:
+        start = time.perf_counter()
+        translate(text)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        latencies = list(executor.map(timed, texts))
+    return time.perf_counter() - start, latencies
+
+def main() -> None:
+    """Run both clients against the local server and print latency and connection counts."""
+    parser = argparse.ArgumentParser(description="Benchmark pooled keep-alive requests against a local server.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client. Default: 200")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent requests. Default: 8")
+    parser.add_argument("--connect-ms", type=float, default=40.0,
+                        help="Simulated connection setup time. Default: 40")
+    parser.add_argument("--response-ms", type=float, default=20.0, help="Simulated translation time. Default: 20")
+    args = parser.parse_args()
+
+    TranslationPageHandler.connect_delay = args.connect_ms / 1000
+    TranslationPageHandler.response_delay = args.response_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TranslationPageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/m"
+    texts = [f"Satz {number} der Übersetzung" for number in range(args.requests)]
+
+    backend = GoogleBackend(pool_size=args.workers, base_url=url)
+    clients = {
+        "new connection": (lambda text: translate_unpooled(url, text)),
+        "pooled session": (lambda text: backend.translate(text, "de", "en")),
+    }
+    print(f"{'client':<16} {'wall':>9} {'mean':>9} {'p95':>9} {'connections':>12}")
+    try:
+        for name, translate in clients.items():
+            METRICS.reset()
+            wall, latencies = run(translate, texts, args.workers)
+            connections = METRICS.to_dict()["counters"].get("http_connections_opened", len(texts))
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(f"{name:<16} {wall * 1000:>7.0f}ms {statistics.mean(latencies) * 1000:>7.1f}ms "
+                  f"{p95 * 1000:>7.1f}ms {connections:>12.0f}")
+    finally:
+        backend.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Measure the characters and requests saved by passing segments that need no translation through unchanged.
+
+Every document is translated from German to English with the offline
+backend, once sending all text and once passing through numbers and
+symbols, URLs, code and English passages.
+
+Usage:
+    python -m benchmarks.passthrough [--workers 4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import DEFAULT_CORPUS, TECHNICAL_CORPUS, build_corpus
+from src.backends import get_backend
+from src.core import TranslationScheduler, clean_pages, iter_pdf_pages
+from src.utils.metrics import METRICS
+from src.utils.passthrough import PASSTHROUGH_KINDS
+
+
+def translate(pages: list[str], workers: int, *, passthrough: bool) -> tuple[list[str], float, dict]:
+    """Translate pages with the offline backend.
+
+    Args:
+        pages: Page texts
+        workers: Maximum number of concurrent requests
+        passthrough: Whether to pass segments that need no translation through unchanged
+
+    Returns:
+        Tuple of (translated pages, seconds, metric counters)
+
+    """
+    METRICS.reset()
+    start = time.perf_counter()
+    with TranslationScheduler(workers, backend=get_backend("offline"), passthrough=passthrough) as scheduler:
+        translated = list(scheduler.translate_pages(pages, "de", "en"))
+    return translated, time.perf_counter() - start, METRICS.to_dict()["counters"]
+
+def main() -> None:
+    """Translate every document with and without passthrough and print what was sent."""
+    parser = argparse.ArgumentParser(description="Benchmark passing segments that need no translation through.")
+    parser.add_argument("--corpus-dir", type=str, default=os.path.join(tempfile.gettempdir(), "pdf-translator-corpus"),
+                        help="Directory for the generated corpus, reused between runs")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent requests. Default: 4")
+    args = parser.parse_args()
+
+    print(f"{'document':<24} {'mode':<12} {'requests':>9} {'chars sent':>11} {'saved':>6} {'time':>8}  identical")
+    for pdf_path in build_corpus(args.corpus_dir, TECHNICAL_CORPUS + DEFAULT_CORPUS[:1]):
+        name = os.path.splitext(os.path.basename(pdf_path))[0]
+        pages = [page.text for page in clean_pages(iter_pdf_pages(pdf_path))]
+        baseline, elapsed, counters = translate(pages, args.workers, passthrough=False)
+        sent = counters.get("translation_request_chars", 0)
+        print(f"{name:<24} {'all':<12} {counters.get('translation_requests', 0):>9} {sent:>11} {'':>6} "
+              f"{elapsed * 1000:>6.0f}ms")
+        translated, elapsed, counters = translate(pages, args.workers, passthrough=True)
+        passed = counters.get("translation_request_chars", 0)
+        print(f"{'':<24} {'passthrough':<12} {counters.get('translation_requests', 0):>9} {passed:>11} "
+              f"{1 - passed / sent if sent else 0:>6.1%} {elapsed * 1000:>6.0f}ms  "
+              f"{'yes' if translated == baseline else 'no'}")
+        print(f"{'':<24} " + ", ".join(f"{kind} {counters.get(f'passthrough_{kind}_chars', 0)}"
+                                       for kind in PASSTHROUGH_KINDS))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Run pipeline benchmarks against a synthetic corpus and report machine-readable results.
+
+Usage:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+import pymupdf
+
+from benchmarks.corpus import DEFAULT_CORPUS, LARGE_CORPUS, build_corpus
+from src.backends import OfflineBackend
+from src.core import TranslationScheduler, clean_pages, iter_pdf_pages, process_output_stream
+from src.document import Page
+from src.utils.transformation import clean_extracted_text
+
+STAGES = ("extract", "clean", "translate", "format", "pipeline")
+OUTPUT_FORMATS = ("txt", "html", "md")
+
+
+def _peak_rss_mb() -> float:
+    """Get the peak resident set size of the current process.
+
+    On Linux, ru_maxrss survives exec and would report the parent's peak, so
+    the high-water mark of the process' own address space is read instead.
+
+    Returns:
+        Peak RSS in megabytes
+
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _pipeline_runner(pdf_path: str, backend: OfflineBackend, options: dict) -> Callable[[], int]:
+    """Prepare the full streaming pipeline: extraction, cleaning, translation and HTML output.
+
+    Args:
+        pdf_path: Benchmark document
+        backend: Offline translator backend
+        options: Benchmark options
+
+    Returns:
+        Callable running the pipeline and returning the characters extracted
+
+    """
+    def pipeline() -> int:
+        chars = 0
+        def counted(stream: Iterator[Page]) -> Iterator[str]:
+            nonlocal chars
+            for page in stream:
+                chars += len(page.text)
+                yield page.text
+
+        cleaned = clean_pages(iter_pdf_pages(pdf_path))
+        with TranslationScheduler(options["workers"], backend=backend) as scheduler:
+            translated = scheduler.translate_pages(counted(cleaned), "de", "en")
+            process_output_stream(os.path.join(options["output_dir"], "pipeline.html"), translated, "html",
+                                  "Benchmark")
+        return chars
+    return pipeline
+
+def _stage_runner(stage: str, pdf_path: str, options: dict) -> tuple[Callable[[], int], int]:
+    """Prepare the inputs of a stage outside the timed region.
+
+    Args:
+        stage: Stage name
+        pdf_path: Benchmark document
+        options: Benchmark options
+
+    Returns:
+        Tuple of (callable running the stage and returning the characters processed, page count)
+
+    """
+    backend = OfflineBackend(latency=options["latency"])
+    output_dir = options["output_dir"]
+    with pymupdf.open(pdf_path) as doc:
+        page_count = doc.page_count
+
+    if stage == "extract":
+        return lambda: sum(len(page.text) for page in iter_pdf_pages(pdf_path)), page_count
+
+    if stage == "pipeline":
+        return _pipeline_runner(pdf_path, backend, options), page_count
+
+    pages = [page.text for page in iter_pdf_pages(pdf_path)]
+    if stage == "clean":
+        return lambda: sum(len(clean_extracted_text(page)) for page in pages), page_count
+
+    if stage == "translate":
+        def translate() -> int:
+            with TranslationScheduler(options["workers"], backend=backend) as scheduler:
+                return sum(len(page) for page in scheduler.translate_pages(pages, "de", "en"))
+        return translate, page_count
+
+    def format_outputs() -> int:
+        for output_format in OUTPUT_FORMATS:
+            output_path = os.path.join(output_dir, f"format.{output_format}")
+            process_output_stream(output_path, iter(pages), output_format, "Benchmark")
+        return sum(len(page) for page in pages) * len(OUTPUT_FORMATS)
+    return format_outputs, page_count
+
+def run_case(stage: str, pdf_path: str, options: dict) -> dict:
+    """Benchmark one stage on one document in the current process.
+
+    Args:
+        stage: Stage name
+        pdf_path: Benchmark document
+        options: Benchmark options
+
+    Returns:
+        Measurement record
+
+    """
+    run, pages = _stage_runner(stage, pdf_path, options)
+    timings = []
+    chars = 0
+    for _ in range(options["repeat"]):
+        start = time.perf_counter()
+        chars = run()
+        timings.append(time.perf_counter() - start)
+
+    seconds = statistics.median(timings)
+    return {
+        "document": os.path.splitext(os.path.basename(pdf_path))[0],
+        "stage": stage,
+        "pages": pages,
+        "chars": chars,
+        "seconds": round(seconds, 6),
+        "min_seconds": round(min(timings), 6),
+        "pages_per_sec": round(pages / seconds, 2) if seconds else None,
+        "chars_per_sec": round(chars / seconds, 1) if seconds else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+def _git_revision() -> str | None:
+    """Get the current git commit, if available.
+
+    Returns:
+        Commit hash or None
+
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,  # noqa: S603, S607
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def options_parser() -> argparse.ArgumentParser:
+    """Parse command line arguments.
+
+    Returns:
+        ArgumentParser object with all arguments configured
+
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the PDF translation pipeline.")
+    parser.add_argument("--corpus-dir", type=str, default=os.path.join(tempfile.gettempdir(), "pdf-translator-corpus"),
+                        help="Directory for the generated corpus, reused between runs")
+    parser.add_argument("--large", action="store_true", help="Include the 1000-page document")
+    parser.add_argument("--stages", type=str, nargs="+", default=list(STAGES), choices=STAGES,
+                        help="Stages to benchmark. Default: all")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per case. Default: 3")
+    parser.add_argument("--workers", type=int, default=8, help="Translation concurrency. Default: 8")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated offline translator latency per request in seconds. Default: 0")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed. Default: 0")
+    parser.add_argument("-o", "--output", type=str, help="Write results to this JSON file instead of stdout")
+    return parser
+
+def main() -> None:
+    """Generate the corpus, benchmark every stage in a fresh process and print the results."""
+    args = options_parser().parse_args()
+    specs = DEFAULT_CORPUS + (LARGE_CORPUS if args.large else ())
+    documents = build_corpus(args.corpus_dir, specs, args.seed)
+
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        options = {"repeat": args.repeat, "workers": args.workers, "latency": args.latency, "output_dir": output_dir}
+        for pdf_path in documents:
+            for stage in args.stages:
+                # A fresh process per case keeps peak RSS attributable to that case.
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    result = pool.submit(run_case, stage, pdf_path, options).result()
+                print(f"{result['document']:<24} {stage:<10} {result['seconds']:>9.3f}s "
+                      f"{result['pages_per_sec'] or 0:>10.1f} pages/s {result['peak_rss_mb']:>8.1f} MB",
+                      file=sys.stderr)
+                results.append(result)
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "options": {"repeat": args.repeat, "workers": args.workers, "latency": args.latency, "seed": args.seed},
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare the latency of translating small PDFs with one CLI process each against the resident service.
+
+Usage:
+    python -m benchmarks.service [--documents 10] [--pages 5]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.corpus import CorpusSpec, build_corpus
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pdf_translator.py")
+OPTIONS = ("-b", "offline", "-s", "de", "-t", "en", "--no-cache")
+
+
+def time_cli(pdf_path: str, output_dir: str, repeat: int) -> list[float]:
+    """Translate a document with a new CLI process each time.
+
+    Args:
+        pdf_path: Path to the PDF file
+        output_dir: Directory to copy the document to, so outputs do not pollute the corpus
+        repeat: Number of runs
+
+    Returns:
+        Duration of each run in seconds
+
+    """
+    timings = []
+    for index in range(repeat):
+        copy = os.path.join(output_dir, f"cli-{index}.pdf")
+        with open(pdf_path, "rb") as source, open(copy, "wb") as target:
+            target.write(source.read())
+        start = time.perf_counter()
+        subprocess.run([sys.executable, SCRIPT, *OPTIONS, "-c", "-f", copy],  # noqa: S603
+                       check=True, stdout=subprocess.DEVNULL, cwd=output_dir)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def time_service(url: str, pdf_path: str, repeat: int) -> list[float]:
+    """Upload a document to the service and read the translated pages until the job is done.
+
+    Args:
+        url: Base URL of the service
+        pdf_path: Path to the PDF file
+        repeat: Number of runs
+
+    Returns:
+        Duration of each run in seconds
+
+    """
+    with open(pdf_path, "rb") as file:
+        content = file.read()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        request = urllib.request.Request(f"{url}/jobs?filename=bench.pdf&clean=1", data=content,  # noqa: S310
+                                         headers={"Content-Type": "application/pdf"})
+        with urllib.request.urlopen(request) as response:  # noqa: S310
+            job = json.load(response)
+        with urllib.request.urlopen(f"{url}/jobs/{job['id']}/pages") as response:  # noqa: S310
+            last = [json.loads(line) for line in response][-1]
+        if last.get("status") != "done":
+            sys.exit(f"service job failed: {last.get('error')}")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main() -> None:
+    """Run both modes on the same small document and print their latencies."""
+    parser = argparse.ArgumentParser(description="Benchmark per-document CLI runs against the resident service.")
+    parser.add_argument("--corpus-dir", type=str, default=os.path.join(tempfile.gettempdir(), "pdf-translator-corpus"),
+                        help="Directory for the generated corpus, reused between runs")
+    parser.add_argument("--pages", type=int, default=5, help="Pages of the benchmark document. Default: 5")
+    parser.add_argument("--documents", type=int, default=10, help="Documents translated in each mode. Default: 10")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(f"de-normal-{args.pages}", args.pages)
+    pdf_path = build_corpus(args.corpus_dir, (spec,))[0]
+    with tempfile.TemporaryDirectory() as output_dir:
+        cli = time_cli(pdf_path, output_dir, args.documents)
+
+        start = time.perf_counter()
+        service = subprocess.Popen([sys.executable, SCRIPT, "--serve", "127.0.0.1:0", *OPTIONS],  # noqa: S603
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, cwd=output_dir)
+        try:
+            match = re.search(r"http://\S+:\d+", service.stdout.readline())
+            if not match:
+                sys.exit("the service did not start")
+            startup = time.perf_counter() - start
+            served = time_service(match.group(0), pdf_path, args.documents)
+        finally:
+            service.terminate()
+            service.wait()
+
+    print(f"{args.documents} documents of {args.pages} pages, offline backend")
+    print(f"{'mode':<10} {'median':>9} {'min':>9} {'total':>9}")
+    for name, timings in (("cli", cli), ("service", served)):
+        print(f"{name:<10} {statistics.median(timings) * 1000:>7.0f}ms {min(timings) * 1000:>7.0f}ms "
+              f"{sum(timings):>8.2f}s")
+    print(f"service startup and warm-up: {startup:.2f}s, paid once")
+
+if __name__ == "__main__":
+    main()
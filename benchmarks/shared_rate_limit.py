@@ -0,0 +1,100 @@
+"""Measure the aggregate request rate of several processes sharing the host-wide rate limit.
+
+Each process translates its own pages with the offline backend, first with
+limits of its own, then with limits shared through one database file.
+
+Usage:
+    python -m benchmarks.shared_rate_limit [--processes 4] [--requests 40] [--rps 20] [--tolerance 0.1]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from src.backends import get_backend
+from src.core import TranslationScheduler
+from src.utils.rate_limit import create_rate_limiter
+
+
+def run_process(rate_limit_path: str | None, args: argparse.Namespace, start_at: float,
+                results: "multiprocessing.Queue[tuple[float, float, int]]") -> None:
+    """Translate distinct single-chunk pages at the same time as the other processes.
+
+    Args:
+        rate_limit_path: Shared rate limit database, or None for limits of this process
+        args: Benchmark options: the rate limits, and the number and length of the pages, one request each
+        start_at: Monotonic time at which every process starts translating
+        results: Queue receiving (start, end, characters sent)
+
+    """
+    pages = [f"{os.getpid()}-{index} ".ljust(args.chars, "x") for index in range(args.requests)]
+    backend = get_backend("offline")
+    # Send each page on its own instead of in batches, so that pages and requests match
+    backend.max_batch_texts = 1
+    with TranslationScheduler(args.requests, backend=backend,
+                              rate_limiter=create_rate_limiter(args.rps, args.cps, rate_limit_path)) as scheduler:
+        time.sleep(max(0.0, start_at - time.monotonic()))
+        start = time.monotonic()
+        for _ in scheduler.translate_pages(pages, "de", "en"):
+            pass
+        results.put((start, time.monotonic(), sum(len(page) for page in pages)))
+
+def measure(rate_limit_path: str | None, args: argparse.Namespace) -> tuple[float, float, float]:
+    """Run the processes together and measure their aggregate rates.
+
+    Args:
+        rate_limit_path: Shared rate limit database, or None for limits of each process
+        args: Benchmark options
+
+    Returns:
+        Tuple of (seconds, requests per second, characters per second) of all processes together
+
+    """
+    results: multiprocessing.Queue[tuple[float, float, int]] = multiprocessing.Queue()
+    start_at = time.monotonic() + 1.0
+    processes = [multiprocessing.Process(target=run_process, args=(rate_limit_path, args, start_at, results))
+                 for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    timings = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = max(end for _, end, _ in timings) - min(start for start, _, _ in timings)
+    requests = args.requests * args.processes
+    chars = sum(sent for _, _, sent in timings)
+    return elapsed, requests / elapsed, chars / elapsed
+
+def main() -> None:
+    """Compare per-process and host-wide limits and fail if the shared limit lets the host exceed its quota."""
+    parser = argparse.ArgumentParser(description="Benchmark the host-wide rate limit shared by several processes.")
+    parser.add_argument("--processes", type=int, default=4, help="Concurrent processes. Default: 4")
+    parser.add_argument("--requests", type=int, default=40, help="Requests sent by each process. Default: 40")
+    parser.add_argument("--chars", type=int, default=200, help="Characters per request. Default: 200")
+    parser.add_argument("--rps", type=float, default=20.0, help="Request limit of the host. Default: 20")
+    parser.add_argument("--cps", type=float, default=0.0, help="Character limit of the host, 0 for none. Default: 0")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Largest accepted excess over the limit, as a fraction. Default: 0.1")
+    args = parser.parse_args()
+
+    total_requests = args.requests * args.processes
+    print(f"{args.processes} processes, {args.requests} requests of {args.chars} characters each, "
+          f"limits: {args.rps:g} requests/s, {args.cps:g} characters/s")
+    print(f"{'scope':<10} {'time':>8} {'requests/s':>11} {'chars/s':>10}")
+    excess = 0.0
+    with tempfile.TemporaryDirectory() as state_dir:
+        for scope, path in (("process", None), ("host", os.path.join(state_dir, "rate_limit.sqlite3"))):
+            elapsed, request_rate, char_rate = measure(path, args)
+            print(f"{scope:<10} {elapsed:>7.2f}s {request_rate:>11.1f} {char_rate:>10.0f}")
+    # The buckets start full, so one second worth of tokens is sent at once
+    if args.rps > 0:
+        excess = max(excess, (total_requests - args.rps) / elapsed / args.rps - 1)
+    if args.cps > 0:
+        excess = max(excess, (total_requests * args.chars - args.cps) / elapsed / args.cps - 1)
+    if excess > args.tolerance:
+        sys.exit(f"host-wide rate exceeds the limit by {excess:.0%}, above the tolerance of {args.tolerance:.0%}")
+
+if __name__ == "__main__":
+    main()
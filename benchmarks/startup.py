@@ -0,0 +1,97 @@
+"""Measure CLI startup and check that heavy dependencies are not imported before they are needed.
+
+Each scenario runs pdf_translator.py with ``-X importtime`` in a fresh process.
+The run fails if a heavy module is imported by a command that exits before
+extraction or translation, or if the total import time exceeds the budget.
+
+Usage:
+    python -m benchmarks.startup [--repeat 5] [--budget-ms 250]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pdf_translator.py")
+HEAVY_MODULES = ("pymupdf", "fitz", "deep_translator", "requests", "bs4", "langdetect")
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Parse the report written by ``-X importtime``.
+
+    Args:
+        stderr: Standard error of the process
+
+    Returns:
+        Cumulative import time in microseconds by module name, nested imports indented by two spaces per level
+
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.rstrip()[1:]] = int(cumulative)
+    return modules
+
+def run_scenario(arguments: list[str], repeat: int) -> tuple[float, float, list[str]]:
+    """Run the CLI with import timing several times.
+
+    Args:
+        arguments: Command line arguments for pdf_translator.py
+        repeat: Number of runs
+
+    Returns:
+        Tuple of (median wall time in seconds, median import time in seconds, heavy packages imported)
+
+    """
+    walls, imports = [], []
+    heavy: set[str] = set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-X", "importtime", SCRIPT, *arguments],  # noqa: S603
+                                   capture_output=True, text=True, stdin=subprocess.DEVNULL, check=False)
+        walls.append(time.perf_counter() - start)
+        modules = parse_importtime(completed.stderr)
+        imports.append(sum(us for name, us in modules.items() if not name.startswith(" ")) / 1e6)
+        heavy.update(package for name in modules if (package := name.strip().split(".")[0]) in HEAVY_MODULES)
+    return statistics.median(walls), statistics.median(imports), sorted(heavy)
+
+def main() -> None:
+    """Time startup for commands that exit before any extraction and report heavy imports."""
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup and guard against eager heavy imports.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario. Default: 5")
+    parser.add_argument("--budget-ms", type=float, default=250.0,
+                        help="Maximum median import time per scenario in milliseconds. Default: 250")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        existing_pdf = os.path.join(directory, "input.pdf")
+        open(existing_pdf, "wb").close()
+        common = ["-s", "de", "-t", "en", "-c", "--no-cache"]
+        scenarios = {
+            "help": ["--help"],
+            "invalid-argument": ["--workers", "many"],
+            "missing-file": [os.path.join(directory, "missing.pdf"), *common, "-e", "txt"],
+            "invalid-format": [existing_pdf, *common, "-e", "docx"],
+        }
+
+        failed = False
+        print(f"{'scenario':<18} {'wall':>9} {'imports':>9}  heavy packages")
+        for name, arguments in scenarios.items():
+            wall, imports, heavy = run_scenario(arguments, args.repeat)
+            over_budget = imports * 1000 > args.budget_ms
+            failed = failed or over_budget or bool(heavy)
+            print(f"{name:<18} {wall * 1000:>7.0f}ms {imports * 1000:>7.0f}ms  "
+                  f"{', '.join(heavy) or '-'}{'  (over budget)' if over_budget else ''}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
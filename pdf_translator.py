@@ -1,89 +1,254 @@
 """Translate PDF files."""
 
+import contextlib
 import os
+import signal
+import sqlite3
+import sys
+import time
 from argparse import Namespace
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 
 from colorama import Fore, init
 
+from src.backends import TranslatorBackend, get_backend
+from src.batch import BatchOptions, expand_pdf_paths, is_batch_input, report_batch_results, run_batch
 from src.core import (
+    PdfSource,
+    TranslationScheduler,
+    clean_pages,
     detect_language,
-    extract_text_from_pdf,
     generate_output_filename,
+    iter_pdf_pages,
     options_parser,
-    process_output_file,
-    translate_text,
+    peek_pages,
+    process_output_stream,
+    read_pdf_source,
+    run_translation_job,
+    sample_pdf_text,
+    split_option_list,
+    tee_pages,
 )
-from src.utils.io import handle_file_path_conflict, normalize_path_input, validate_file_exists
+from src.document import Page
+from src.utils.cache import TranslationMemory
+from src.utils.checkpoint import language_page_index_path, manifest_path_for
+from src.utils.io import STDIO_PATH, handle_file_path_conflict, normalize_path_input, validate_file_exists
 from src.utils.language_map import normalize_language_code
+from src.utils.metrics import METRICS
+from src.utils.passthrough import PASSTHROUGH_KINDS, PASSTHROUGH_LABELS
+from src.utils.rate_limit import create_rate_limiter
 from src.utils.transformation import clean_extracted_text
 
 init(autoreset=True)
 
-def extract_and_process_pdf(pdf_path: str, should_clean: bool = False) -> str | None:
-    """Extract text from PDF and optionally clean it.
+def extract_and_process_pdf(pdf_path: PdfSource, *, should_clean: bool = False, repeated_blocks: str = "keep",
+                            extract_workers: int = 1) -> tuple[str, Iterator[Page]] | None:
+    """Extract text from PDF page by page and optionally clean it.
+
+    Only the first pages are read eagerly, to check that the PDF contains
+    text. The remaining pages are extracted lazily as the returned stream is
+    consumed. The language detection sample is read from a bounded number of
+    pages spread over the whole document.
 
     Args:
-        pdf_path: Path to the PDF file
+        pdf_path: Path to the PDF file, or its content
         should_clean: Whether to clean the extracted text
+        repeated_blocks: How to handle running headers and footers: "keep", "strip" or "once"
+        extract_workers: Number of extraction processes for large documents
 
     Returns:
-        Processed text or None if extraction failed
+        Tuple of (text sample, stream of processed pages) or None if extraction failed
 
     """
     try:
-        text = extract_text_from_pdf(pdf_path)
-        if not text.strip():
+        pdf_path = read_pdf_source(pdf_path)
+        pages = iter_pdf_pages(pdf_path, repeated_blocks, extract_workers)
+        if should_clean:
+            pages = clean_pages(pages)
+
+        head, pages = peek_pages(pages, 1)
+        if not head.strip():
             print(Fore.RED + "Error: No text found in the PDF.")
             return None
 
-        return clean_extracted_text(text) if should_clean else text
+        sample = sample_pdf_text(pdf_path)
+        if should_clean:
+            sample = clean_extracted_text(sample)
 
     except Exception as e:
         print(Fore.RED + f"Failed to extract or clean text: {e}")
         return None
+    else:
+        return sample, pages
 
-def get_normalized_languages(src_lang: str | None, tgt_lang: str, text: str) -> tuple[str | None, str]:
+def get_normalized_languages(src_lang: str | None, tgt_langs: list[str],
+                             text: str) -> tuple[str | None, list[str]]:
     """Get normalized language codes, detecting source language if needed.
 
     Args:
         src_lang: Source language code or None for auto-detection
-        tgt_lang: Target language code
+        tgt_langs: Target language codes
         text: Text to use for language detection if needed
 
     Returns:
-        Tuple of (normalized source language, normalized target language)
+        Tuple of (normalized source language, distinct normalized target languages)
 
     """
     norm_src_lang = normalize_language_code(src_lang) if src_lang else None
-    norm_tgt_lang = normalize_language_code(tgt_lang)
+    norm_tgt_langs = list(dict.fromkeys(normalize_language_code(tgt_lang) for tgt_lang in tgt_langs))
 
     if not norm_src_lang:
         print(Fore.YELLOW + "No source language provided. Detecting...")
         detected = detect_language(text)
         if not detected:
             print(Fore.RED + "Failed to detect source language. Exiting.")
-            return None, norm_tgt_lang
+            return None, norm_tgt_langs
         norm_src_lang = normalize_language_code(detected)
         print(Fore.GREEN + f"Detected source language: {norm_src_lang}")
 
-    return norm_src_lang, norm_tgt_lang
+    return norm_src_lang, norm_tgt_langs
 
-def validate_output_format(output_format: str) -> bool:
-    """Validate that the output format is supported.
+def validate_output_format(output_formats: list[str]) -> bool:
+    """Validate that every requested output format is supported.
 
     Args:
-        output_format: Output format to validate
+        output_formats: Output formats to validate
 
     Returns:
-        True if the format is supported, False otherwise
+        True if at least one format was given and all are supported, False otherwise
 
     """
     supported_exts = {"txt", "html", "md"}
-    if output_format not in supported_exts:
-        print(Fore.RED + f"Error: Unsupported output format '{output_format}'. Supported: txt, html, md.")
+    unsupported = [output_format for output_format in output_formats if output_format not in supported_exts]
+    if unsupported or not output_formats:
+        formats = ", ".join(f"'{output_format}'" for output_format in unsupported) or "''"
+        print(Fore.RED + f"Error: Unsupported output format {formats}. Supported: txt, html, md.")
         return False
     return True
 
+def open_translation_memory(args: Namespace) -> TranslationMemory | None:
+    """Open the translation memory selected by the command line options.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Open translation memory, or None if it is bypassed
+
+    """
+    if args.no_cache and not args.clear_cache:
+        return None
+
+    try:
+        cache = TranslationMemory(args.cache_path, max_bytes=args.cache_size * 1024 * 1024)
+    except (OSError, sqlite3.Error) as e:
+        print(Fore.YELLOW + f"Translation memory unavailable, continuing without it: {e}")
+        return None
+
+    if args.clear_cache:
+        cache.clear()
+        print(Fore.YELLOW + f"Translation memory cleared: {args.cache_path}")
+    if args.no_cache:
+        cache.close()
+        return None
+    return cache
+
+def create_backend(args: Namespace) -> TranslatorBackend:
+    """Create the translator backend selected by the command line options.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Translator backend instance
+
+    """
+    if args.backend == "offline":
+        return get_backend(args.backend, mode=args.offline_mode, latency=args.offline_latency)
+    return get_backend(args.backend, pool_size=args.workers)
+
+def create_scheduler(args: Namespace, backend: TranslatorBackend,
+                     cache: TranslationMemory | None = None) -> TranslationScheduler:
+    """Create the translation scheduler with the limits selected by the command line options.
+
+    Args:
+        args: Parsed command line arguments
+        backend: Translator backend
+        cache: Optional translation memory consulted before sending requests
+
+    Returns:
+        Running translation scheduler
+
+    """
+    rate_limiter = create_rate_limiter(args.rps, args.cps, shared_rate_limit_path(args))
+    return TranslationScheduler(args.workers, cache=cache, backend=backend, rate_limiter=rate_limiter,
+                                passthrough=not args.no_passthrough)
+
+def shared_rate_limit_path(args: Namespace) -> str | None:
+    """Get the database file of the host-wide rate limits, if the limits are shared.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Path of the shared rate limit database, or None for limits of this process
+
+    """
+    return args.rate_limit_path if args.rate_limit_scope == "host" else None
+
+def write_metrics(args: Namespace) -> None:
+    """Write the run metrics to the files requested on the command line.
+
+    Args:
+        args: Parsed command line arguments
+
+    """
+    try:
+        if args.metrics_json:
+            METRICS.write_json(args.metrics_json)
+        if args.metrics_prom:
+            METRICS.write_prometheus(args.metrics_prom)
+    except OSError as e:
+        print(Fore.RED + f"Failed to write metrics: {e}")
+
+def report_cache_stats(cache: TranslationMemory) -> None:
+    """Print translation memory hit/miss statistics.
+
+    Args:
+        cache: Translation memory used for the run
+
+    """
+    stats = cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+    print(Fore.CYAN + f"Translation memory: {stats['hits']} hits, {stats['misses']} misses ({hit_rate:.0f}% hit rate), "
+          f"{stats['entries']} entries, {stats['bytes'] / (1024 * 1024):.1f} MB")
+
+def report_passthrough_stats() -> None:
+    """Print how many characters were passed through without translation, by kind of segment."""
+    counters = METRICS.to_dict()["counters"]
+    skipped = counters.get("passthrough_chars", 0)
+    if not skipped:
+        return
+    total = counters.get("translation_text_chars", 0)
+    share = skipped / total * 100 if total else 0.0
+    kinds = ", ".join(f"{counters[f'passthrough_{kind}_chars']:.0f} {PASSTHROUGH_LABELS[kind]}"
+                      for kind in PASSTHROUGH_KINDS if counters.get(f"passthrough_{kind}_chars"))
+    print(Fore.CYAN + f"Passed through untranslated: {skipped:.0f} characters ({share:.0f}% of the text): {kinds}")
+
+def report_page_counts(counts: dict[str, int]) -> None:
+    """Print how many pages were translated and how many were reused.
+
+    Args:
+        counts: Page counts returned by run_translation_job
+
+    """
+    message = f"Pages: {counts['translated']} translated, {counts['reused']} reused from the previous revision"
+    if counts["resumed"]:
+        message += f", {counts['resumed']} resumed"
+    print(Fore.CYAN + message)
+
 def prompt_for_missing_options(args: Namespace) -> None:
     """Prompt user for missing command line options.
 
@@ -100,7 +265,7 @@ def prompt_for_missing_options(args: Namespace) -> None:
         args.src = src_input or None
 
     if not args.tgt:
-        tgt_input = input("\nOptional: Enter target language (default: en): ").strip()
+        tgt_input = input("\nOptional: Enter target languages, separated by commas (default: en): ").strip()
         args.tgt = tgt_input or "en"
 
     if not args.clean:
@@ -109,48 +274,312 @@ def prompt_for_missing_options(args: Namespace) -> None:
         args.clean = use_clean_input == "y"
 
     if not args.ext:
-        ext_input = input("\nOptional: Enter output format (txt, html, md). Default: txt: ").strip().lower()
+        ext_input = input(
+            "\nOptional: Enter output formats (txt, html, md), separated by commas. Default: txt: ").strip().lower()
         args.ext = ext_input or "txt"
 
-def main() -> None:
-    """Initialize the script and handle command line arguments."""
-    parser = options_parser()
-    args = parser.parse_args()
+def translate_to_language(args: Namespace, scheduler: TranslationScheduler, pages: Iterable[Page],  # noqa: PLR0913
+                          src_lang: str, tgt_lang: str, *, output_formats: list[str], interactive: bool = True,
+                          output_base_path: str | None = None, page_index_path: str | None = None) -> bool:
+    """Translate the pages of the PDF into one target language and save the output.
+
+    Args:
+        args: Parsed command line arguments
+        scheduler: Translation scheduler shared by every target language
+        pages: Stream of processed pages
+        src_lang: Normalized source language code
+        tgt_lang: Normalized target language code
+        output_formats: Output file formats
+        interactive: Whether to ask the user before picking a new output file name
+        output_base_path: Output file path without extension, defaults to a name next to the PDF
+        page_index_path: Page index of the previous revision, or None to translate every page
+
+    Returns:
+        True if the outputs were saved, False otherwise
+
+    """
+    output_base_path = output_base_path or generate_output_filename(args.pdf_path, src_lang, tgt_lang)
+    settings = {"src": src_lang, "tgt": tgt_lang, "clean": args.clean, "backend": scheduler.backend.name,
+                "detect_per_page": args.detect_per_page, "repeated_blocks": args.repeated_blocks,
+                "passthrough": scheduler.passthrough}
+
+    def translate(missing_pages: Iterable[str]) -> Iterator[str]:
+        return scheduler.translate_pages(missing_pages, src_lang, tgt_lang, detect_per_page=args.detect_per_page)
 
-    prompt_for_missing_options(args)
+    try:
+        title = f"Translation of {os.path.basename(args.pdf_path)} from {src_lang} to {tgt_lang}"
+        saved_paths, counts = run_translation_job(
+            args.pdf_path, pages, translate, output_base_path, output_formats, title=title, settings=settings,
+            page_index_path=page_index_path,
+            resume=args.resume, overwrite=args.overwrite, interactive=interactive)
+        print(Fore.GREEN + f"\nTranslation from {src_lang} to {tgt_lang} completed. Output saved to: "
+              f"{', '.join(saved_paths.values())}")
+        report_page_counts(counts)
+    except Exception as e:  # noqa: BLE001
+        print(Fore.RED + f"Translation to {tgt_lang} failed: {e}")
+        if os.path.exists(manifest_path_for(output_base_path)):
+            print(Fore.YELLOW + "Progress was saved. Run the same command with --resume to continue.")
+        return False
+    return True
+
+def stream_translation(args: Namespace, scheduler: TranslationScheduler, pages: Iterable[Page],  # noqa: PLR0913
+                       src_lang: str, tgt_lang: str, *, output_path: str, output_format: str) -> bool:
+    """Translate the pages of the PDF into one language, writing each page to the output as it completes.
+
+    Used for standard input and output, which a job manifest cannot refer to,
+    so --resume and the page index do not apply.
+
+    Args:
+        args: Parsed command line arguments
+        scheduler: Translation scheduler
+        pages: Stream of processed pages
+        src_lang: Normalized source language code
+        tgt_lang: Normalized target language code
+        output_path: Output file path, or - for standard output
+        output_format: Output file format
 
+    Returns:
+        True if the output was written, False otherwise
+
+    """
+    if output_path != STDIO_PATH:
+        output_path = handle_file_path_conflict(output_path, overwrite=args.overwrite, interactive=False)
+    name = "standard input" if args.pdf_path == STDIO_PATH else os.path.basename(args.pdf_path)
+    title = f"Translation of {name} from {src_lang} to {tgt_lang}"
+    try:
+        translated = scheduler.translate_pages((page.text for page in pages), src_lang, tgt_lang,
+                                               detect_per_page=args.detect_per_page)
+        process_output_stream(output_path, translated, output_format, title)
+    except Exception as e:  # noqa: BLE001
+        print(Fore.RED + f"Translation to {tgt_lang} failed: {e}")
+        return False
+    destination = "standard output" if output_path == STDIO_PATH else output_path
+    print(Fore.GREEN + f"\nTranslation from {src_lang} to {tgt_lang} completed. Output written to: {destination}")
+    return True
+
+def resolve_document_outputs(args: Namespace) -> tuple[str | None, list[str], list[str]] | None:
+    """Check the PDF file and resolve the output path, output formats and target languages of a single document.
+
+    A PDF read from standard input is written to standard output unless an output file is given.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Tuple of (output path or None for names next to the PDF, output formats, target languages), or None if
+        the options are invalid
+
+    """
     if not validate_file_exists(args.pdf_path, "PDF file"):
-        return
+        return None
 
-    processed_text = extract_and_process_pdf(args.pdf_path, should_clean=args.clean)
-    if processed_text is None:
-        return
+    output_path = args.output or (STDIO_PATH if args.pdf_path == STDIO_PATH else None)
+    output_formats = split_option_list(args.ext.lower())
+    if output_path and output_path != STDIO_PATH:
+        output_formats = [os.path.splitext(output_path)[1].lstrip(".").lower()]
+    if not validate_output_format(output_formats):
+        return None
+    tgt_langs = split_option_list(args.tgt) or ["en"]
+    if output_path and (len(tgt_langs) > 1 or len(output_formats) > 1):
+        print(Fore.RED + "Error: A single output takes one target language and one output format.")
+        return None
+    return output_path, output_formats, tgt_langs
 
-    src_lang, tgt_lang = get_normalized_languages(args.src, args.tgt, processed_text)
+def translate_document(args: Namespace, backend: TranslatorBackend, cache: TranslationMemory | None = None) -> bool:
+    """Translate the PDF described by the command line options into every target language.
+
+    The PDF is extracted, cleaned and its language detected once. Its pages
+    are then translated into all target languages concurrently, sharing one
+    scheduler and therefore one budget of concurrent requests.
+
+    Args:
+        args: Parsed command line arguments
+        backend: Translator backend
+        cache: Optional translation memory consulted before sending requests
+
+    Returns:
+        True if every output was saved, False otherwise
+
+    """
+    reading_stdin = args.pdf_path == STDIO_PATH
+    if not reading_stdin:
+        # Standard input carries the PDF, so options cannot be asked for
+        prompt_for_missing_options(args)
+
+    outputs = resolve_document_outputs(args)
+    if outputs is None:
+        return False
+    output_path, output_formats, tgt_langs = outputs
+
+    source = read_pdf_source(sys.stdin.buffer) if reading_stdin else args.pdf_path
+    extracted = extract_and_process_pdf(source, should_clean=args.clean, repeated_blocks=args.repeated_blocks,
+                                        extract_workers=args.extract_workers)
+    if extracted is None:
+        return False
+    sample_text, pages = extracted
+
+    src_lang, tgt_langs = get_normalized_languages(args.src, tgt_langs, sample_text)
     if src_lang is None:
-        return
+        return False
 
-    output_ext = args.ext.lower()
-    if not validate_output_format(output_ext):
-        return
+    # Each language keeps its own index, however many languages a run translates into
+    page_index_paths = {tgt_lang: language_page_index_path(args.page_index, tgt_lang)
+                        for tgt_lang in tgt_langs} if args.page_index else {}
+    with ThreadPoolExecutor(max_workers=len(tgt_langs), thread_name_prefix="language") as language_pool, \
+            create_scheduler(args, backend, cache) as scheduler:
+        if reading_stdin or output_path == STDIO_PATH:
+            return stream_translation(args, scheduler, pages, src_lang, tgt_langs[0], output_path=output_path,
+                                      output_format=output_formats[0])
+        if output_path or len(tgt_langs) == 1:
+            return translate_to_language(args, scheduler, pages, src_lang, tgt_langs[0], output_formats=output_formats,
+                                         output_base_path=output_path and os.path.splitext(output_path)[0],
+                                         page_index_path=page_index_paths.get(tgt_langs[0]))
+        # The scheduler closes first on an interrupt, which cancels the requests the language threads wait for.
+        futures = [language_pool.submit(translate_to_language, args, scheduler, language_pages, src_lang, tgt_lang,
+                                        output_formats=output_formats, interactive=False,
+                                        page_index_path=page_index_paths.get(tgt_lang))
+                   for tgt_lang, language_pages in zip(tgt_langs, tee_pages(pages, len(tgt_langs)), strict=True)]
+        results = [future.result() for future in futures]
+    return all(results)
+
+def translate_batch(args: Namespace, backend: TranslatorBackend, cache: TranslationMemory | None = None) -> bool:
+    """Translate every PDF matched by the command line inputs without prompting.
+
+    Args:
+        args: Parsed command line arguments
+        backend: Translator backend
+        cache: Optional translation memory consulted before sending requests
 
+    Returns:
+        True if every file was translated, False otherwise
+
+    """
+    if args.output or STDIO_PATH in args.pdf_path:
+        print(Fore.RED + "Error: Standard input and --output take a single PDF file.")
+        return False
+
+    output_formats = split_option_list(args.ext.lower())
+    if not validate_output_format(output_formats):
+        return False
+
+    pdf_paths = expand_pdf_paths(args.pdf_path)
+    if not pdf_paths:
+        print(Fore.RED + "Error: No PDF files matched the given paths.")
+        return False
+
+    tgt_langs = list(dict.fromkeys(normalize_language_code(tgt_lang)
+                                   for tgt_lang in split_option_list(args.tgt) or ["en"]))
+    options = BatchOptions(args.src, tgt_langs, output_formats, clean=args.clean, overwrite=args.overwrite,
+                           detect_per_page=args.detect_per_page, resume=args.resume,
+                           repeated_blocks=args.repeated_blocks, page_index_dir=args.page_index)
+    total = len(pdf_paths) * len(tgt_langs)
+    print(Fore.YELLOW + f"Translating {len(pdf_paths)} PDF files into {', '.join(tgt_langs)}...")
+    results = []
+    with create_scheduler(args, backend, cache) as scheduler:
+        for result in run_batch(pdf_paths, scheduler, options, document_jobs=args.jobs,
+                                extract_workers=args.extract_workers):
+            status = Fore.GREEN + "done" if result.succeeded else Fore.RED + "failed"
+            print(f"[{len(results) + 1}/{total}] {result.pdf_path} ({result.tgt_lang}): {status}")
+            results.append(result)
+
+    report_batch_results(results)
+    return all(result.succeeded for result in results)
+
+def serve(args: Namespace, backend: TranslatorBackend, cache: TranslationMemory | None = None) -> bool:
+    """Run the resident translation service until interrupted.
+
+    The options given with --serve become the defaults of every job.
+
+    Args:
+        args: Parsed command line arguments
+        backend: Translator backend
+        cache: Optional translation memory consulted before sending requests
+
+    Returns:
+        True if the service stopped normally, False if it could not start
+
+    """
+    from src.service import ServiceHTTPServer, TranslationService, parse_service_address
+
+    output_formats = split_option_list(args.ext.lower())
+    if not validate_output_format(output_formats):
+        return False
     try:
-        translated_text = translate_text(processed_text, src_lang, tgt_lang)
-    except Exception as e:
-        print(Fore.RED + f"Translation failed: {e}")
-        return
+        address = parse_service_address(args.serve)
+    except ValueError:
+        print(Fore.RED + f"Error: Invalid service address: {args.serve}. Expected HOST:PORT.")
+        return False
+
+    defaults = {"src": args.src, "tgt": args.tgt, "format": ",".join(output_formats), "clean": args.clean,
+                "repeated_blocks": args.repeated_blocks, "detect_per_page": args.detect_per_page}
+    with TranslationService(create_scheduler(args, backend, cache), document_jobs=args.jobs,
+                            extract_workers=args.extract_workers, overwrite=args.overwrite,
+                            defaults=defaults) as service:
+        start = time.perf_counter()
+        service.warm_up()
+        try:
+            server = ServiceHTTPServer(address, service)
+        except OSError as e:
+            print(Fore.RED + f"Error: Cannot listen on {args.serve}: {e}")
+            return False
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        host, port = server.server_address[:2]
+        print(Fore.CYAN + f"Warmed up in {time.perf_counter() - start:.2f}s. "
+              f"Serving on http://{host}:{port} (Ctrl+C to stop)", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(Fore.YELLOW + "\nStopping the service...")
+        finally:
+            server.server_close()
+    return True
+
+def main() -> None:
+    """Initialize the script and handle command line arguments."""
+    parser = options_parser()
+    args = parser.parse_args()
+    METRICS.reset()
 
-    output_base_path = generate_output_filename(args.pdf_path, src_lang, tgt_lang)
-    output_full_path = os.path.splitext(output_base_path)[0] + f".{output_ext}"
-    output_full_path = handle_file_path_conflict(output_full_path, args.overwrite)
+    # Messages go to standard error while standard output carries the translation
+    messages = contextlib.nullcontext()
+    if args.output == STDIO_PATH or args.pdf_path == [STDIO_PATH]:
+        messages = contextlib.redirect_stdout(sys.stderr)
+    with messages:
+        succeeded = run(args)
+    if not succeeded:
+        sys.exit(1)
 
+def run(args: Namespace) -> bool:
+    """Run the mode selected by the command line arguments.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        True if the run succeeded, False otherwise
+
+    """
+    cache = open_translation_memory(args)
+    if args.clear_cache and not args.pdf_path and not args.serve:
+        if cache:
+            cache.close()
+        return True
+
+    backend = create_backend(args)
     try:
-        title = f"Translation of {os.path.basename(args.pdf_path)} from {src_lang} to {tgt_lang}"
-        process_output_file(output_full_path, translated_text, output_ext, title)
-        print(Fore.GREEN + f"\nTranslation from {src_lang} to {tgt_lang} completed. Output saved to: {output_full_path}")
-    except Exception as e:
-        print(Fore.RED + f"Program failed: {e}")
-        return
+        if args.serve:
+            return serve(args, backend, cache)
+        if is_batch_input(args.pdf_path):
+            return translate_batch(args, backend, cache)
+        args.pdf_path = args.pdf_path[0] if args.pdf_path else None
+        return translate_document(args, backend, cache)
+    finally:
+        backend.close()
+        if cache:
+            report_cache_stats(cache)
+            cache.close()
+        report_passthrough_stats()
+        write_metrics(args)
 
 if __name__ == "__main__":
     main()
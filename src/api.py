@@ -0,0 +1,366 @@
+"""Library API: translate PDFs from Python code without printing or prompting.
+
+Errors are raised as subclasses of TranslationError.
+
+Example:
+    from src.api import Translator
+
+    with Translator(backend="google", cache="translation_memory.sqlite3") as translator:
+        for page in translator.iter_pages("manual.pdf", tgt_lang="en"):
+            print(page.number, page.text)
+        result = translator.translate(pdf_bytes, tgt_lang="fr", src_lang="de")
+        result.save("manual_de_fr.html")
+
+"""
+
+import os
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Self
+
+from src.backends import GoogleBackend, TranslatorBackend, get_backend
+from src.core import (
+    DEFAULT_BACKEND,
+    DEFAULT_MAX_WORKERS,
+    REPEATED_BLOCK_MODES,
+    PdfSource,
+    TranslationScheduler,
+    clean_pages,
+    iter_pdf_pages,
+    peek_pages,
+    read_pdf_source,
+    sample_pdf_text,
+    write_formatted_output,
+)
+from src.document import Page
+from src.utils.cache import TranslationMemory
+from src.utils.detection import DETECTION_SAMPLE_CHARS, detect_text_language
+from src.utils.formatting import STREAM_FORMATTERS, StreamFormatter, get_stream_formatter
+from src.utils.language_map import normalize_language_code
+from src.utils.rate_limit import create_rate_limiter
+from src.utils.transformation import clean_extracted_text
+
+
+class TranslationError(Exception):
+    """Base class of the errors raised by the library API."""
+
+class ExtractionError(TranslationError):
+    """The PDF cannot be opened or its text cannot be extracted."""
+
+class EmptyDocumentError(ExtractionError):
+    """The PDF contains no text."""
+
+class LanguageDetectionError(TranslationError):
+    """The source language cannot be detected, pass src_lang instead."""
+
+class UnsupportedFormatError(TranslationError, ValueError):
+    """The output format is not supported."""
+
+class BackendError(TranslationError):
+    """The translator backend failed, after retries; the original error is the cause."""
+
+@dataclass(frozen=True)
+class TranslatedPage:
+    """A translated page.
+
+    Attributes:
+        number: Zero-based page number
+        text: Translated text
+        source: Extracted (and cleaned, if enabled) page with its blocks
+        src_lang: Source language code
+        tgt_lang: Target language code
+
+    """
+
+    number: int
+    text: str
+    source: Page
+    src_lang: str
+    tgt_lang: str
+
+@dataclass(frozen=True)
+class TranslationResult:
+    """A translated document.
+
+    Attributes:
+        src_lang: Source language code
+        tgt_lang: Target language code
+        pages: Translated pages, in page order
+
+    """
+
+    src_lang: str
+    tgt_lang: str
+    pages: list[TranslatedPage]
+
+    @property
+    def text(self) -> str:
+        """Translated text of the whole document."""
+        return "".join(page.text for page in self.pages)
+
+    def render(self, output_format: str = "txt", title: str | None = None) -> str:
+        """Render the translation in an output format.
+
+        Args:
+            output_format: txt, html or md
+            title: Optional title for formatted output
+
+        Returns:
+            Formatted document
+
+        Raises:
+            UnsupportedFormatError: If the format is not supported
+
+        """
+        return _formatter(output_format, title).format(self.text)
+
+    def save(self, output_path: str, output_format: str | None = None, title: str | None = None) -> str:
+        """Write the translation to a file, replacing an existing file.
+
+        Args:
+            output_path: Path of the output file
+            output_format: txt, html or md, defaults to the extension of output_path
+            title: Optional title for formatted output
+
+        Returns:
+            Path of the written file
+
+        Raises:
+            UnsupportedFormatError: If the format is not supported
+
+        """
+        output_format = output_format or os.path.splitext(output_path)[1].lstrip(".") or "txt"
+        write_formatted_output(output_path, (page.text for page in self.pages), _formatter(output_format, title))
+        return output_path
+
+class Translator:
+    """Reusable translator holding the backend, translation memory and request scheduler.
+
+    Create one translator and use it for many documents, from any number of
+    threads; the scheduler's request budget is shared between them. Nothing is
+    printed and no input is requested.
+    """
+
+    def __init__(self, backend: str | TranslatorBackend = DEFAULT_BACKEND, *,  # noqa: PLR0913
+                 cache: TranslationMemory | str | None = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                 requests_per_second: float = 0.0, clean: bool = False, repeated_blocks: str = "keep",
+                 detect_per_page: bool = False, extract_workers: int = 1, chars_per_second: float = 0.0,
+                 rate_limit_path: str | None = None, passthrough: bool = True, **backend_options: object) -> None:
+        """Create the translator.
+
+        Args:
+            backend: Backend name ("google", "offline") or backend instance, which the caller keeps ownership of
+            cache: Translation memory, or the path of its database file, or None to translate without one
+            max_workers: Maximum number of concurrent translation requests
+            requests_per_second: Maximum request rate, 0 for no limit
+            clean: Whether to clean the extracted text before translation
+            repeated_blocks: Running headers and footers: "keep", "strip" or "once"
+            detect_per_page: Whether to detect the source language of every page
+            extract_workers: Extraction processes for large documents given by path
+            chars_per_second: Maximum rate of characters sent to the backend, 0 for no limit
+            rate_limit_path: Database file of rate limits shared with other processes (the CLI uses
+                src.utils.rate_limit.DEFAULT_RATE_LIMIT_PATH), or None for limits of this translator
+            passthrough: Whether to return numbers, URLs, code and text already in the target language unchanged
+            **backend_options: Options of a backend created by name, e.g. mode for the offline backend
+
+        Raises:
+            ValueError: If the backend or repeated_blocks mode is unknown
+
+        """
+        if repeated_blocks not in REPEATED_BLOCK_MODES:
+            msg = f"Unsupported repeated_blocks mode '{repeated_blocks}'. Supported: {', '.join(REPEATED_BLOCK_MODES)}."
+            raise ValueError(msg)
+        self.clean = clean
+        self.repeated_blocks = repeated_blocks
+        self.detect_per_page = detect_per_page
+        self.extract_workers = extract_workers
+        self._owns_backend = isinstance(backend, str)
+        if isinstance(backend, str):
+            if backend.lower() == GoogleBackend.name:
+                backend_options.setdefault("pool_size", max_workers)
+            backend = get_backend(backend, **backend_options)
+        self.backend = backend
+        self._owns_cache = isinstance(cache, str)
+        self.cache = TranslationMemory(cache) if isinstance(cache, str) else cache
+        rate_limiter = create_rate_limiter(requests_per_second, chars_per_second, rate_limit_path)
+        self.scheduler = TranslationScheduler(max_workers, cache=self.cache, backend=self.backend,
+                                              rate_limiter=rate_limiter, passthrough=passthrough)
+
+    def detect_language(self, source: PdfSource) -> str:
+        """Detect the language of a document from a sample of its pages.
+
+        Args:
+            source: Path of the PDF, its content (bytes, bytearray, memoryview), or a binary file object
+
+        Returns:
+            Normalized language code
+
+        Raises:
+            ExtractionError: If the PDF cannot be read
+            LanguageDetectionError: If the language cannot be detected
+
+        """
+        return self._detect_document_language(_read_input(source))
+
+    def iter_pages(self, source: PdfSource, tgt_lang: str = "en",
+                   src_lang: str | None = None) -> Iterator[TranslatedPage]:
+        """Translate a document, yielding each page as soon as it and the pages before it are translated.
+
+        The document is opened and its language detected before this method
+        returns; pages are extracted and translated while they are consumed.
+
+        Args:
+            source: Path of the PDF, its content (bytes, bytearray, memoryview), or a binary file object
+            tgt_lang: Target language code
+            src_lang: Source language code, detected if not given
+
+        Returns:
+            Iterator of translated pages, in page order
+
+        Raises:
+            ExtractionError: If the PDF cannot be read, also while iterating
+            EmptyDocumentError: If the PDF contains no text
+            LanguageDetectionError: If src_lang is not given and cannot be detected
+            BackendError: While iterating, if a translation request fails
+
+        """
+        document = _read_input(source)
+        head, pages = peek_pages(self._extract(document), 1)
+        if not head.strip():
+            msg = "No text found in the PDF."
+            raise EmptyDocumentError(msg)
+        src_lang = normalize_language_code(src_lang) if src_lang else self._detect_document_language(document)
+        return self._translate_pages(pages, src_lang, normalize_language_code(tgt_lang))
+
+    def translate(self, source: PdfSource, tgt_lang: str = "en", src_lang: str | None = None) -> TranslationResult:
+        """Translate a whole document.
+
+        Args:
+            source: Path of the PDF, its content (bytes, bytearray, memoryview), or a binary file object
+            tgt_lang: Target language code
+            src_lang: Source language code, detected if not given
+
+        Returns:
+            Translated document
+
+        Raises:
+            ExtractionError: If the PDF cannot be read
+            EmptyDocumentError: If the PDF contains no text
+            LanguageDetectionError: If src_lang is not given and cannot be detected
+            BackendError: If a translation request fails
+
+        """
+        pages = list(self.iter_pages(source, tgt_lang, src_lang))
+        return TranslationResult(pages[0].src_lang, pages[0].tgt_lang, pages)
+
+    def translate_text(self, text: str, tgt_lang: str = "en", src_lang: str | None = None) -> str:
+        """Translate plain text.
+
+        Args:
+            text: Text to translate
+            tgt_lang: Target language code
+            src_lang: Source language code, detected if not given
+
+        Returns:
+            Translated text
+
+        Raises:
+            LanguageDetectionError: If src_lang is not given and cannot be detected
+            BackendError: If a translation request fails
+
+        """
+        src_lang = normalize_language_code(src_lang) if src_lang else _detect_text(text)
+        try:
+            return self.scheduler.translate_text(text, src_lang, normalize_language_code(tgt_lang))
+        except Exception as e:
+            raise BackendError(str(e) or type(e).__name__) from e
+
+    def _extract(self, document: str | bytes | memoryview) -> Iterator[Page]:
+        """Extract and optionally clean the pages of a document, raising ExtractionError on failure."""
+        try:
+            pages = iter_pdf_pages(document, self.repeated_blocks, self.extract_workers)
+            if self.clean:
+                pages = clean_pages(pages)
+            yield from pages
+        except Exception as e:
+            msg = f"Cannot extract the PDF: {e}"
+            raise ExtractionError(msg) from e
+
+    def _detect_document_language(self, document: str | bytes | memoryview) -> str:
+        """Detect the language of a document from a bounded sample of its pages."""
+        try:
+            sample = sample_pdf_text(document)
+        except Exception as e:
+            msg = f"Cannot extract the PDF: {e}"
+            raise ExtractionError(msg) from e
+        return _detect_text(clean_extracted_text(sample) if self.clean else sample)
+
+    def _translate_pages(self, pages: Iterator[Page], src_lang: str, tgt_lang: str) -> Iterator[TranslatedPage]:
+        """Translate extracted pages, pairing each translation with its source page."""
+        pending: deque[Page] = deque()
+
+        def texts() -> Iterator[str]:
+            for page in pages:
+                pending.append(page)
+                yield page.text
+
+        try:
+            for text in self.scheduler.translate_pages(texts(), src_lang, tgt_lang,
+                                                       detect_per_page=self.detect_per_page):
+                page = pending.popleft()
+                yield TranslatedPage(page.number, text, page, src_lang, tgt_lang)
+        except TranslationError:
+            raise
+        except Exception as e:
+            raise BackendError(str(e) or type(e).__name__) from e
+
+    def close(self) -> None:
+        """Stop the scheduler and release the backend and translation memory if the translator created them."""
+        self.scheduler.close()
+        if self._owns_backend:
+            self.backend.close()
+        if self._owns_cache and self.cache:
+            self.cache.close()
+
+    def __enter__(self) -> Self:
+        """Use the translator as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the translator on exit."""
+        self.close()
+
+def _read_input(source: PdfSource) -> str | bytes | memoryview:
+    """Get the path or the content of a PDF given in any supported form, without copying content in memory.
+
+    Raises:
+        ExtractionError: If the file does not exist or cannot be read
+
+    """
+    try:
+        document = read_pdf_source(source)
+    except OSError as e:
+        msg = f"Cannot read the PDF: {e}"
+        raise ExtractionError(msg) from e
+    if isinstance(document, str) and not os.path.isfile(document):
+        msg = f"PDF file not found: {document}"
+        raise ExtractionError(msg)
+    return document
+
+def _detect_text(text: str) -> str:
+    """Detect the language of text, raising LanguageDetectionError on failure."""
+    from langdetect.lang_detect_exception import LangDetectException
+
+    try:
+        return normalize_language_code(detect_text_language(text, DETECTION_SAMPLE_CHARS))
+    except LangDetectException as e:
+        msg = f"Failed to detect the source language: {e}"
+        raise LanguageDetectionError(msg) from e
+
+def _formatter(output_format: str, title: str | None) -> StreamFormatter:
+    """Get the formatter of a supported output format."""
+    if output_format.lower() not in STREAM_FORMATTERS:
+        msg = f"Unsupported output format '{output_format}'. Supported: {', '.join(STREAM_FORMATTERS)}."
+        raise UnsupportedFormatError(msg)
+    return get_stream_formatter(output_format, title)
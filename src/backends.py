@@ -0,0 +1,270 @@
+"""Translator backends used by the translation scheduler."""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from src.utils.metrics import METRICS
+
+if TYPE_CHECKING:
+    import requests
+
+GOOGLE_TRANSLATE_URL = "https://translate.google.com/m"
+DEFAULT_POOL_SIZE = 10
+REQUEST_TIMEOUT = 30.0
+HTTP_TOO_MANY_REQUESTS = 429
+OFFLINE_MAX_BATCH_TEXTS = 64
+
+PSEUDO_ACCENTS = str.maketrans(
+    "AaCcDEeGgHhIiJjKkLlNnOoRrSsTtUuWwYyZz",
+    "ÅåÇçÐÉéĜĝĤĥÎîĴĵĶķĻļÑñÖöŔŕŠšŢţÛûŴŵÝýŽž",
+)
+
+
+class TranslatorBackend(ABC):
+    """Interface of a translation provider.
+
+    Implementations must be safe to call from several threads at once. The
+    scheduler groups short texts into batches of up to max_batch_texts texts.
+    """
+
+    name: str = ""
+    retryable_errors: tuple[type[Exception], ...] = ()
+    max_batch_texts: int = 1
+
+    @abstractmethod
+    def translate_batch(self, texts: list[str], src_lang: str, tgt_lang: str) -> list[str]:
+        """Translate several texts.
+
+        Args:
+            texts: Texts no longer than the provider payload limit, without surrounding whitespace
+            src_lang: Source language code
+            tgt_lang: Target language code
+
+        Returns:
+            Translated texts, in the same order
+
+        """
+
+    def translate(self, text: str, src_lang: str, tgt_lang: str) -> str:
+        """Translate a single text.
+
+        Args:
+            text: Text no longer than the provider payload limit, without surrounding whitespace
+            src_lang: Source language code
+            tgt_lang: Target language code
+
+        Returns:
+            Translated text
+
+        """
+        return self.translate_batch([text], src_lang, tgt_lang)[0]
+
+    def warm_up(self) -> None:  # noqa: B027
+        """Load the libraries and open the connections used by the first request ahead of time."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release resources held by the backend."""
+
+class GoogleBackend(TranslatorBackend):
+    """Google Translate's mobile page, requested through one pooled keep-alive session.
+
+    deep_translator validates the language pair and provides the error types.
+    The page is requested directly, with the same URL, parameters and headers
+    as deep_translator, so that every thread shares the session's connections
+    instead of opening a new one per chunk. A page whose translation cannot be
+    found is requested again through deep_translator itself. requests,
+    BeautifulSoup and deep_translator are imported on the first request.
+    """
+
+    name = "google"
+    max_batch_texts = 1
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, base_url: str = GOOGLE_TRANSLATE_URL,
+                 timeout: float = REQUEST_TIMEOUT) -> None:
+        """Create the backend without opening any connection.
+
+        Args:
+            pool_size: Connections kept open, should match the number of concurrent requests
+            base_url: Address of the translation page
+            timeout: Seconds to wait for a connection or a response
+
+        """
+        self.pool_size = pool_size
+        self.base_url = base_url
+        self.timeout = timeout
+        self._session = None
+        self._languages: dict[tuple[str, str], tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def retryable_errors(self) -> tuple[type[Exception], ...]:
+        """Errors worth retrying: rate limiting, failed requests, dropped connections and timeouts."""
+        from deep_translator.exceptions import RequestError, TooManyRequests
+        from requests import ConnectionError, Timeout  # noqa: A004
+
+        return TooManyRequests, RequestError, ConnectionError, Timeout
+
+    def _get_session(self) -> "requests.Session":
+        """Get the shared session, creating it on first use."""
+        with self._lock:
+            if self._session is None:
+                from src.utils.http import create_session
+
+                self._session = create_session(self.pool_size)
+            return self._session
+
+    def _language_codes(self, src_lang: str, tgt_lang: str) -> tuple[str, str]:
+        """Validate a language pair and map it to Google's codes, once per pair."""
+        pair = (src_lang, tgt_lang)
+        if pair not in self._languages:
+            from deep_translator import GoogleTranslator
+
+            translator = GoogleTranslator(source=src_lang, target=tgt_lang)
+            self._languages[pair] = (translator.source, translator.target)
+        return self._languages[pair]
+
+    def _request(self, text: str, source: str, target: str) -> str:
+        """Translate one text with a single request.
+
+        Args:
+            text: Text no longer than the provider payload limit
+            source: Google source language code
+            target: Google target language code
+
+        Returns:
+            Translated text
+
+        Raises:
+            TooManyRequests: If Google throttles the request
+            RequestError: If the request fails
+            TranslationNotFound: If the page contains no translation
+
+        """
+        from bs4 import BeautifulSoup
+        from deep_translator.exceptions import RequestError, TooManyRequests, TranslationNotFound
+
+        METRICS.increment("http_requests")
+        with self._get_session().get(self.base_url, params={"sl": source, "tl": target, "q": text},
+                                     timeout=self.timeout) as response:
+            if response.status_code == HTTP_TOO_MANY_REQUESTS:
+                raise TooManyRequests
+            if not response.ok:
+                raise RequestError
+            soup = BeautifulSoup(response.text, "html.parser")
+        element = soup.find("div", {"class": "t0"}) or soup.find("div", {"class": "result-container"})
+        if not element:
+            raise TranslationNotFound(text)
+        return element.get_text(strip=True)
+
+    def warm_up(self) -> None:
+        """Import requests, BeautifulSoup and deep_translator and create the session."""
+        import bs4  # noqa: F401
+        import deep_translator  # noqa: F401
+
+        _ = self.retryable_errors
+        self._get_session()
+
+    def translate_batch(self, texts: list[str], src_lang: str, tgt_lang: str) -> list[str]:
+        """Translate several texts with one request each.
+
+        Args:
+            texts: Texts no longer than the provider payload limit, without surrounding whitespace
+            src_lang: Source language code
+            tgt_lang: Target language code
+
+        Returns:
+            Translated texts, in the same order
+
+        """
+        source, target = self._language_codes(src_lang, tgt_lang)
+        if source == target:
+            return list(texts)
+        return [self._translate_text(text, source, target) if text else "" for text in texts]
+
+    def _translate_text(self, text: str, source: str, target: str) -> str:
+        """Translate one text through the session, falling back to deep_translator if the page cannot be parsed."""
+        from deep_translator import GoogleTranslator
+        from deep_translator.exceptions import TranslationNotFound
+
+        try:
+            return self._request(text, source, target)
+        except TranslationNotFound:
+            METRICS.increment("http_fallbacks")
+            return GoogleTranslator(source=source, target=target).translate(text) or ""
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+class OfflineBackend(TranslatorBackend):
+    """Deterministic backend that needs no network access.
+
+    In identity mode texts are returned unchanged. In pseudo mode letters are
+    replaced by accented look-alikes and each text is wrapped in brackets, which
+    makes untranslated or truncated output easy to spot. A simulated latency is
+    slept once per batch to model a provider round trip.
+    """
+
+    MODES = ("identity", "pseudo")
+    max_batch_texts = OFFLINE_MAX_BATCH_TEXTS
+
+    def __init__(self, mode: str = "identity", latency: float = 0.0) -> None:
+        """Create the backend.
+
+        Args:
+            mode: Either "identity" or "pseudo"
+            latency: Seconds to sleep per batch
+
+        """
+        if mode not in self.MODES:
+            msg = f"Unsupported offline mode '{mode}'. Supported: {', '.join(self.MODES)}."
+            raise ValueError(msg)
+        self.mode = mode
+        self.latency = latency
+        self.name = f"offline-{mode}"
+
+    def translate_batch(self, texts: list[str], src_lang: str, tgt_lang: str) -> list[str]:  # noqa: ARG002
+        """Transform several texts locally.
+
+        Args:
+            texts: Texts to transform
+            src_lang: Source language code, not used
+            tgt_lang: Target language code, not used
+
+        Returns:
+            Transformed texts, in the same order
+
+        """
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if self.mode == "identity":
+            return list(texts)
+        return [f"[{text.translate(PSEUDO_ACCENTS)}]" for text in texts]
+
+BACKENDS: dict[str, type[TranslatorBackend]] = {
+    "google": GoogleBackend,
+    "offline": OfflineBackend,
+}
+
+def get_backend(name: str, **options: object) -> TranslatorBackend:
+    """Create the translator backend registered under a name.
+
+    Args:
+        name: Registered backend name
+        **options: Keyword arguments passed to the backend constructor
+
+    Returns:
+        Backend instance
+
+    """
+    try:
+        backend_class = BACKENDS[name.lower()]
+    except KeyError:
+        msg = f"Unsupported translator backend '{name}'. Supported: {', '.join(BACKENDS)}."
+        raise ValueError(msg) from None
+    return backend_class(**options)
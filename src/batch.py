@@ -0,0 +1,252 @@
+"""Batch translation of many PDF files in a single process."""
+
+import glob
+import multiprocessing
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from colorama import Fore
+
+from src.core import (
+    DEFAULT_DOCUMENT_JOBS,
+    TranslationScheduler,
+    clean_pages,
+    detect_language,
+    generate_output_filename,
+    iter_pdf_pages,
+    run_translation_job,
+)
+from src.document import Page
+from src.utils.checkpoint import page_index_path_in
+from src.utils.detection import sample_page_indices, sample_text
+from src.utils.language_map import normalize_language_code
+from src.utils.metrics import METRICS
+
+GLOB_CHARACTERS = ("*", "?", "[")
+
+
+@dataclass
+class BatchOptions:
+    """Translation options shared by every document of a batch."""
+
+    src_lang: str | None
+    tgt_langs: list[str]
+    output_formats: list[str]
+    clean: bool = False
+    overwrite: bool = False
+    detect_per_page: bool = False
+    resume: bool = False
+    repeated_blocks: str = "keep"
+    page_index_dir: str | None = None
+
+@dataclass
+class BatchResult:
+    """Outcome of translating one file into one target language in a batch."""
+
+    pdf_path: str
+    tgt_lang: str | None = None
+    output_paths: list[str] = field(default_factory=list)
+    error: str | None = None
+    pages_translated: int = 0
+    pages_reused: int = 0
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the file was translated and saved."""
+        return self.error is None and bool(self.output_paths)
+
+def is_batch_input(inputs: list[str]) -> bool:
+    """Check whether the given inputs require batch mode.
+
+    Args:
+        inputs: PDF paths, directories or glob patterns from the command line
+
+    Returns:
+        True if there are several inputs or any input is a directory or glob pattern
+
+    """
+    return len(inputs) > 1 or any(os.path.isdir(path) or any(c in path for c in GLOB_CHARACTERS) for path in inputs)
+
+def expand_pdf_paths(inputs: Iterable[str]) -> list[str]:
+    """Expand directories and glob patterns into a list of PDF files.
+
+    Directories are searched recursively for files with a .pdf extension.
+
+    Args:
+        inputs: PDF paths, directories or glob patterns
+
+    Returns:
+        Sorted, de-duplicated list of matching file paths, in input order
+
+    """
+    paths: dict[str, None] = {}
+    for path in inputs:
+        if os.path.isdir(path):
+            pattern = os.path.join(glob.escape(path), "**", "*.[pP][dD][fF]")
+            matches = sorted(glob.glob(pattern, recursive=True))
+        elif any(c in path for c in GLOB_CHARACTERS):
+            matches = sorted(match for match in glob.glob(path, recursive=True) if os.path.isfile(match))
+        else:
+            matches = [path]
+        paths.update(dict.fromkeys(os.path.normpath(match) for match in matches))
+    return list(paths)
+
+def extract_pages(pdf_path: str, *, should_clean: bool = False,
+                  repeated_blocks: str = "keep") -> tuple[list[Page], dict]:
+    """Extract and optionally clean the pages of a PDF in a worker process.
+
+    Args:
+        pdf_path: Path to the PDF file
+        should_clean: Whether to clean the extracted text
+        repeated_blocks: How to handle running headers and footers: "keep", "strip" or "once"
+
+    Returns:
+        Tuple of (each processed page, metrics recorded by the worker)
+
+    """
+    METRICS.reset()
+    pages = iter_pdf_pages(pdf_path, repeated_blocks)
+    if should_clean:
+        pages = clean_pages(pages)
+    return list(pages), METRICS.to_dict()
+
+def translate_extracted_document(scheduler: TranslationScheduler, pdf_path: str, pages: list[Page],
+                                 options: BatchOptions) -> list[BatchResult]:
+    """Translate the extracted pages of one document into every target language without prompting.
+
+    The source language is detected once, then the target languages are
+    translated concurrently. With a page index directory, pages unchanged since
+    the previous revision of the document reuse their earlier translation.
+
+    Args:
+        scheduler: Translation scheduler shared by every document in the batch
+        pdf_path: Path to the source PDF file
+        pages: Extracted pages
+        options: Translation options of the batch
+
+    Returns:
+        Result of each target language, with the saved output paths and page counts
+
+    """
+    if not any(page.text.strip() for page in pages):
+        msg = "No text found in the PDF."
+        raise ValueError(msg)
+
+    if options.src_lang:
+        norm_src_lang = normalize_language_code(options.src_lang)
+    else:
+        detected = detect_language(sample_text([pages[index].text for index in sample_page_indices(len(pages))]))
+        if not detected:
+            msg = "Failed to detect source language."
+            raise ValueError(msg)
+        norm_src_lang = normalize_language_code(detected)
+
+    def translate_to(tgt_lang: str) -> BatchResult:
+        output_base_path = generate_output_filename(pdf_path, norm_src_lang, tgt_lang)
+        settings = {"src": norm_src_lang, "tgt": tgt_lang, "clean": options.clean, "backend": scheduler.backend.name,
+                    "detect_per_page": options.detect_per_page, "repeated_blocks": options.repeated_blocks,
+                    "passthrough": scheduler.passthrough}
+        page_index_path = options.page_index_dir and page_index_path_in(options.page_index_dir, output_base_path)
+
+        def translate(missing_pages: Iterable[str]) -> Iterator[str]:
+            return scheduler.translate_pages(missing_pages, norm_src_lang, tgt_lang,
+                                             detect_per_page=options.detect_per_page)
+
+        title = f"Translation of {os.path.basename(pdf_path)} from {norm_src_lang} to {tgt_lang}"
+        try:
+            output_paths, counts = run_translation_job(
+                pdf_path, pages, translate, output_base_path, options.output_formats, title=title, settings=settings,
+                page_index_path=page_index_path, resume=options.resume, overwrite=options.overwrite, interactive=False)
+        except Exception as e:  # noqa: BLE001
+            return BatchResult(pdf_path, tgt_lang, error=str(e))
+        return BatchResult(pdf_path, tgt_lang, list(output_paths.values()), pages_translated=counts["translated"],
+                           pages_reused=counts["reused"])
+
+    norm_tgt_langs = list(dict.fromkeys(normalize_language_code(tgt_lang) for tgt_lang in options.tgt_langs))
+    if len(norm_tgt_langs) == 1:
+        return [translate_to(norm_tgt_langs[0])]
+    with ThreadPoolExecutor(max_workers=len(norm_tgt_langs), thread_name_prefix="language") as language_pool:
+        return list(language_pool.map(translate_to, norm_tgt_langs))
+
+def run_batch(pdf_paths: list[str], scheduler: TranslationScheduler, options: BatchOptions, *,
+              document_jobs: int = DEFAULT_DOCUMENT_JOBS, extract_workers: int | None = None) -> Iterator[BatchResult]:
+    """Translate many PDF files, extracting them in a process pool.
+
+    Extraction runs in a process pool sized to the CPU count by default.
+    Extracted documents are translated concurrently, up to document_jobs at a
+    time, through the shared scheduler. The number of documents held in memory
+    is bounded by the sizes of both pools.
+
+    Args:
+        pdf_paths: PDF files to translate
+        scheduler: Translation scheduler shared by every document
+        options: Translation options applied to every document, each translated into all target languages
+        document_jobs: Maximum number of documents translated concurrently
+        extract_workers: Number of extraction processes, defaults to the CPU count
+
+    Yields:
+        Result of each file and target language, in completion order of the files
+
+    """
+    extract_workers = extract_workers or os.cpu_count() or 1
+    if options.page_index_dir:
+        os.makedirs(options.page_index_dir, exist_ok=True)
+    max_in_flight = extract_workers + 2 * document_jobs
+    remaining = iter(pdf_paths)
+    spawn_context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=extract_workers, mp_context=spawn_context) as extract_pool, \
+            ThreadPoolExecutor(max_workers=max(1, document_jobs), thread_name_prefix="document") as document_pool:
+        extracting: dict[Future[tuple[list[Page], dict]], str] = {}
+        translating: dict[Future[list[BatchResult]], str] = {}
+
+        def fill() -> None:
+            while len(extracting) + len(translating) < max_in_flight:
+                pdf_path = next(remaining, None)
+                if pdf_path is None:
+                    return
+                extracting[extract_pool.submit(extract_pages, pdf_path, should_clean=options.clean,
+                                               repeated_blocks=options.repeated_blocks)] = pdf_path
+
+        fill()
+        while extracting or translating:
+            done, _ = wait([*extracting, *translating], return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in extracting:
+                    pdf_path = extracting.pop(future)
+                    try:
+                        pages, worker_metrics = future.result()
+                    except Exception as e:  # noqa: BLE001
+                        yield from (BatchResult(pdf_path, tgt_lang, error=f"Extraction failed: {e}")
+                                    for tgt_lang in options.tgt_langs)
+                        continue
+                    METRICS.merge(worker_metrics)
+                    translating[document_pool.submit(
+                        translate_extracted_document, scheduler, pdf_path, pages, options)] = pdf_path
+                else:
+                    pdf_path = translating.pop(future)
+                    try:
+                        yield from future.result()
+                    except Exception as e:  # noqa: BLE001
+                        yield from (BatchResult(pdf_path, tgt_lang, error=str(e)) for tgt_lang in options.tgt_langs)
+            fill()
+
+def report_batch_results(results: list[BatchResult]) -> None:
+    """Print a per-file summary of a batch run.
+
+    Args:
+        results: Results of every file in the batch
+
+    """
+    succeeded = [result for result in results if result.succeeded]
+    failed = [result for result in results if not result.succeeded]
+
+    print(Fore.CYAN + f"\nBatch complete: {len(succeeded)} succeeded, {len(failed)} failed.")
+    for result in succeeded:
+        print(Fore.GREEN + f"  OK    {result.pdf_path} -> {', '.join(result.output_paths)} "
+                           f"({result.pages_translated} pages translated, {result.pages_reused} reused)")
+    for result in failed:
+        language = f" ({result.tgt_lang})" if result.tgt_lang else ""
+        print(Fore.RED + f"  FAIL  {result.pdf_path}{language}: {result.error}")
@@ -1,37 +1,387 @@
 """Core functionality for PDF translation."""
 
 import argparse
+import asyncio
+import io
+import itertools
+import multiprocessing
 import os
-from typing import Optional
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, BinaryIO, Optional, Self, TextIO
 
-import pymupdf
 from colorama import Fore
-from deep_translator import GoogleTranslator
-from langdetect import detect
 
-from src.utils.formatting import get_formatter
-from src.utils.io import ensure_directory_exists
+from src.backends import BACKENDS, OfflineBackend, TranslatorBackend, get_backend
+from src.document import BODY, FOOTER, HEADER, Page
+from src.utils.cache import DEFAULT_CACHE_MAX_MB, DEFAULT_CACHE_PATH, TranslationMemory
+from src.utils.checkpoint import (
+    JobManifest,
+    describe_job,
+    load_page_index,
+    manifest_path_for,
+    page_fingerprint,
+    save_page_index,
+)
+from src.utils.chunking import MAX_CHUNK_CHARS, SEGMENT_SEPARATOR, chunk_text, split_surrounding_whitespace
+from src.utils.detection import (
+    DETECTION_SAMPLE_CHARS,
+    DETECTION_SAMPLE_PAGES,
+    PAGE_DETECTION_CHARS,
+    detect_text_language,
+    sample_page_indices,
+    sample_text,
+)
+from src.utils.formatting import StreamFormatter, get_stream_formatter
+from src.utils.io import STDIO_PATH, ensure_directory_exists, handle_file_path_conflict
+from src.utils.language_map import normalize_language_code
+from src.utils.layout import find_repeated_blocks, split_repeated_blocks
+from src.utils.metrics import METRICS
+from src.utils.passthrough import TEXT, split_passthrough
+from src.utils.rate_limit import (
+    DEFAULT_RATE_LIMIT_PATH,
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    SharedRateLimiter,
+    backoff_delay,
+)
+from src.utils.transformation import DEFAULT_CLEANER, PageStreamCleaner
 
+if TYPE_CHECKING:
+    import pymupdf
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from PDF.
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_IN_FLIGHT_PAGES = 16
+DEFAULT_DOCUMENT_JOBS = 4
+DEFAULT_BACKEND = "google"
+MAX_RETRIES = 4
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+REPEATED_BLOCK_MODES = ("keep", "strip", "once")
+RATE_LIMIT_SCOPES = ("host", "process")
+REPEATED_BLOCK_SAMPLE_PAGES = 16
+DEDUPLICATED_CHUNK_CHARS = 500
+MAX_DEDUPLICATED_CHUNKS = 1024
+DEFAULT_EXTRACT_WORKERS = os.cpu_count() or 1
+PARALLEL_EXTRACTION_MIN_PAGES = 200
+EXTRACTION_RANGE_PAGES = 50
+OUTPUT_BUFFER_SIZE = 64 * 1024
+DEFAULT_SERVICE_ADDRESS = "127.0.0.1:8765"
+
+PdfSource = str | os.PathLike[str] | bytes | bytearray | memoryview | BinaryIO
+
+
+def _find_document_repeated_blocks(doc: "pymupdf.Document", repeated_blocks: str) -> set[tuple[str, str]]:
+    """Find the running headers and footers of a document from a sample of its pages.
+
+    Args:
+        doc: Open PDF document
+        repeated_blocks: "keep", "strip" or "once"; nothing is searched for "keep"
+
+    Returns:
+        Recurring (margin, template) pairs
+
+    """
+    if repeated_blocks == "keep":
+        return set()
+    with METRICS.stage("layout"):
+        sample = [(doc[index].get_text("blocks"), doc[index].rect.height)
+                  for index in sample_page_indices(doc.page_count, REPEATED_BLOCK_SAMPLE_PAGES)]
+        return find_repeated_blocks(sample)
+
+def _extract_page(page: "pymupdf.Page", repeated_blocks: str, repeated: set[tuple[str, str]]) -> Page:
+    """Extract the text blocks of one page, handling running headers and footers.
+
+    Args:
+        page: PDF page
+        repeated_blocks: "keep", "strip" or "once"
+        repeated: Recurring (margin, template) pairs of the document
+
+    Returns:
+        Extracted page
+
+    """
+    start = time.perf_counter()
+    blocks = page.get_text("blocks")
+    if repeated:
+        headers, body, footers = split_repeated_blocks(blocks, page.rect.height, repeated)
+        METRICS.increment("repeated_block_chars", sum(len(block) for block in headers + footers))
+        if repeated_blocks == "strip":
+            headers, footers = [], []
+        extracted = Page.from_blocks(page.number, [*((HEADER, text) for text in headers),
+                                                   *((BODY, text) for text in body),
+                                                   *((FOOTER, text) for text in footers)])
+    else:
+        extracted = Page.from_blocks(page.number, ((BODY, block[4]) for block in blocks if block[6] == 0))
+    METRICS.add_stage_time("extract", time.perf_counter() - start)
+    METRICS.increment("pages_extracted")
+    METRICS.increment("chars_extracted", len(extracted.text))
+    return extracted
+
+def read_pdf_source(source: PdfSource) -> str | bytes | memoryview:
+    """Get the path or the content of a PDF, without copying content already in memory.
+
+    File objects can only be read once. Read them with this function before
+    opening the document several times, e.g. to extract it and detect its
+    language.
+
+    Args:
+        source: Path to the PDF file, its content, or a binary file object
+
+    Returns:
+        Path, or content that PyMuPDF can open in place
+
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, (bytes, memoryview)):
+        return source
+    if isinstance(source, bytearray):
+        return memoryview(source)
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer()
+    return source.read()
+
+def open_pdf(source: PdfSource) -> "pymupdf.Document":
+    """Open a PDF from its path or its content.
+
+    Args:
+        source: Path to the PDF file, its content, or a binary file object
+
+    Returns:
+        Open document
+
+    """
+    import pymupdf
+
+    source = read_pdf_source(source)
+    if isinstance(source, str):
+        return pymupdf.open(source)
+    return pymupdf.open(stream=source, filetype="pdf")
+
+def extract_page_range(pdf_path: str, start: int, stop: int, repeated_blocks: str = "keep",
+                       repeated: set[tuple[str, str]] | None = None) -> tuple[list[Page], dict]:
+    """Extract a range of pages in a worker process, which opens the document itself.
 
     Args:
         pdf_path: Path to the PDF file
+        start: First page number
+        stop: Page number after the last page
+        repeated_blocks: "keep", "strip" or "once"
+        repeated: Recurring (margin, template) pairs of the document
+
+    Returns:
+        Tuple of (each page in the range, metrics recorded by the worker)
+
+    """
+    METRICS.reset()
+    with open_pdf(pdf_path) as doc:
+        pages = [_extract_page(doc[number], repeated_blocks, repeated or set()) for number in range(start, stop)]
+    return pages, METRICS.to_dict()
+
+def iter_pdf_pages(pdf_path: PdfSource, repeated_blocks: str = "keep", workers: int = 1,
+                   min_parallel_pages: int = PARALLEL_EXTRACTION_MIN_PAGES) -> Iterator[Page]:
+    """Extract the text blocks of a PDF one page at a time.
+
+    Running headers and footers are found by comparing the text blocks in the
+    page margins of a sample of pages. They can be kept as they are, stripped,
+    or kept as separate segments so that each distinct one is translated once.
+
+    Documents with at least min_parallel_pages pages are split into page
+    ranges extracted by a pool of worker processes, each opening the document
+    itself. Smaller documents, and documents given by their content, are
+    extracted in this process, where starting the pool would cost more than it
+    saves.
+
+    Args:
+        pdf_path: Path to the PDF file, its content, or a binary file object
+        repeated_blocks: "keep", "strip" or "once"
+        workers: Number of extraction processes, 1 to always extract in this process
+        min_parallel_pages: Smallest document extracted by the process pool
+
+    Yields:
+        Each extracted page, in page order
+
+    """
+    with open_pdf(pdf_path) as doc:
+        page_count = doc.page_count
+        repeated = _find_document_repeated_blocks(doc, repeated_blocks)
+        if workers <= 1 or page_count < min_parallel_pages or not isinstance(pdf_path, (str, os.PathLike)):
+            for page in doc:
+                yield _extract_page(page, repeated_blocks, repeated)
+            return
+
+    ranges = ((start, min(start + EXTRACTION_RANGE_PAGES, page_count))
+              for start in range(0, page_count, EXTRACTION_RANGE_PAGES))
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    pending: deque[Future[tuple[list[Page], dict]]] = deque()
+    try:
+        for start, stop in ranges:
+            pending.append(pool.submit(extract_page_range, pdf_path, start, stop, repeated_blocks, repeated))
+            if len(pending) >= 2 * workers:
+                yield from _collect_page_range(pending.popleft())
+        while pending:
+            yield from _collect_page_range(pending.popleft())
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def _collect_page_range(future: Future[tuple[list[Page], dict]]) -> list[Page]:
+    """Wait for a page range extracted by a worker and merge the worker's metrics.
+
+    Args:
+        future: Future of extract_page_range
+
+    Returns:
+        Each page in the range
+
+    """
+    pages, worker_metrics = future.result()
+    METRICS.merge(worker_metrics)
+    return pages
+
+def clean_pages(pages: Iterable[Page]) -> Iterator[Page]:
+    """Clean a stream of pages block by block.
+
+    Body blocks are cleaned as one stream, so a word hyphenated at the end of
+    a block is joined at the start of the next body block, also across a page
+    break. Running headers and footers are cleaned on their own.
+
+    Args:
+        pages: Stream of pages
+
+    Yields:
+        Each cleaned page, with the same blocks
+
+    """
+    stream = PageStreamCleaner(DEFAULT_CLEANER)
+    waiting: deque[tuple[Page, list[str | None]]] = deque()
+    slots: deque[tuple[list[str | None], int]] = deque()
+
+    def fill(cleaned: list[str]) -> None:
+        for text in cleaned:
+            texts, index = slots.popleft()
+            texts[index] = text
+
+    def completed() -> Iterator[Page]:
+        while waiting and None not in waiting[0][1]:
+            page, texts = waiting.popleft()
+            yield page.with_block_texts(texts)
+
+    for page in pages:
+        texts: list[str | None] = [None] * len(page.blocks)
+        waiting.append((page, texts))
+        with METRICS.stage("clean"):
+            for index, block in enumerate(page.blocks):
+                if block.kind == BODY:
+                    slots.append((texts, index))
+                    fill(stream.feed(block.text))
+                else:
+                    texts[index] = DEFAULT_CLEANER.clean(block.text)
+        yield from completed()
+    with METRICS.stage("clean"):
+        fill(stream.finish())
+    yield from completed()
+
+def extract_text_from_pdf(pdf_path: PdfSource) -> str:
+    """Extract text from PDF.
+
+    Args:
+        pdf_path: Path to the PDF file, its content, or a binary file object
 
     Returns:
         Extracted text from the PDF
 
     """
-    doc = pymupdf.open(pdf_path)
-    text = ""
-    for page in doc:
-        text += page.get_text()
-    return text
+    return "".join(page.text for page in iter_pdf_pages(pdf_path))
+
+def peek_pages(pages: Iterable[Page], min_chars: int) -> tuple[str, Iterator[Page]]:
+    """Read ahead from a page stream until enough non-blank text has been seen.
+
+    Args:
+        pages: Stream of pages
+        min_chars: Number of characters to read ahead
+
+    Returns:
+        Tuple of (text read ahead, stream yielding every page including those read ahead)
+
+    """
+    pages = iter(pages)
+    buffered: list[Page] = []
+    buffered_chars = 0
+    for page in pages:
+        buffered.append(page)
+        buffered_chars += len(page.text.strip())
+        if buffered_chars >= min_chars:
+            break
+    return "".join(page.text for page in buffered), itertools.chain(buffered, pages)
+
+def tee_pages(pages: Iterable[Page], consumers: int) -> list[Iterator[Page]]:
+    """Share one stream of pages between consumers running in different threads.
+
+    Pages are extracted once and kept only until every consumer has read them.
+
+    Args:
+        pages: Stream of pages
+        consumers: Number of independent streams to create
+
+    Returns:
+        One stream per consumer, each yielding every page in order
+
+    """
+    lock = threading.Lock()
+
+    def guarded(stream: Iterator[Page]) -> Iterator[Page]:
+        while True:
+            with lock:
+                page = next(stream, None)
+            if page is None:
+                return
+            yield page
+
+    return [guarded(stream) for stream in itertools.tee(pages, consumers)]
+
+def split_option_list(value: str) -> list[str]:
+    """Split a comma-separated command line value into distinct items.
+
+    Args:
+        value: Value such as "de,fr, es"
+
+    Returns:
+        Non-empty items in their original order, without duplicates
+
+    """
+    return list(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
+
+def sample_pdf_text(pdf_path: PdfSource, max_chars: int = DETECTION_SAMPLE_CHARS,
+                    max_pages: int = DETECTION_SAMPLE_PAGES) -> str:
+    """Extract a bounded language detection sample from pages spread over a PDF.
+
+    Only the sampled pages are read, so the cost does not depend on the page count.
+
+    Args:
+        pdf_path: Path to the PDF file, its content, or a binary file object
+        max_chars: Maximum length of the sample
+        max_pages: Maximum number of pages to sample
+
+    Returns:
+        Sample text
+
+    """
+    with METRICS.stage("detect"), open_pdf(pdf_path) as doc:
+        pages = [doc[index].get_text() for index in sample_page_indices(doc.page_count, max_pages)]
+    return sample_text(pages, max_chars)
 
 def detect_language(text: str) -> str | None:
     """Auto-detect language if source language is not specified.
 
+    At most DETECTION_SAMPLE_CHARS characters are analyzed. Detection is
+    seeded, so the same text always yields the same language.
+
     Args:
         text: Text to detect language from
 
@@ -40,26 +390,548 @@ def detect_language(text: str) -> str | None:
 
     """
     try:
-        lang = detect(text)
+        with METRICS.stage("detect"):
+            lang = detect_text_language(text, DETECTION_SAMPLE_CHARS)
         return lang
     except Exception as e:
         print(Fore.RED + f"Language detection failed: {e}")
         return None
 
-def translate_text(text: str, src_lang: str, tgt_lang: str) -> str:
-    """Translate text using Google Translator.
+def detect_page_language(page: str, default: str) -> str:
+    """Detect the language of a single page, quietly falling back to a default.
+
+    Args:
+        page: Page text
+        default: Normalized language code returned when the page has no detectable text
+
+    Returns:
+        Normalized language code
+
+    """
+    from langdetect.lang_detect_exception import LangDetectException
+
+    with METRICS.stage("detect"):
+        try:
+            return normalize_language_code(detect_text_language(sample_text([page], PAGE_DETECTION_CHARS)))
+        except LangDetectException:
+            return default
+
+def _join_chunks(futures: Iterable[Future[str]]) -> str:
+    """Wait for translated chunks and join them, dropping segment separators.
+
+    Args:
+        futures: Futures of the translated chunks, in text order
+
+    Returns:
+        Translated text
+
+    """
+    return "".join(future.result() for future in futures).replace(SEGMENT_SEPARATOR, "")
+
+async def _cancel_pending_tasks() -> None:
+    """Cancel every task of the running event loop except the current one."""
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+class _ChunkBatch:
+    """Chunks to translate, collected until they are sent together with one backend call."""
+
+    def __init__(self) -> None:
+        """Create an empty batch."""
+        self.languages: tuple[str, str] | None = None
+        self.chunks: list[tuple[str, str, str, Future[str]]] = []
+        self.chars = 0
+
+    def take(self) -> list[tuple[str, str, str, Future[str]]]:
+        """Remove and return the collected chunks.
+
+        Returns:
+            Leading whitespace, body, trailing whitespace and future of each chunk
+
+        """
+        chunks, self.chunks, self.chars = self.chunks, [], 0
+        return chunks
+
+    def holds(self, futures: Iterable[Future[str]]) -> bool:
+        """Tell whether any of the futures belongs to a chunk of the batch.
+
+        Args:
+            futures: Futures of translated chunks
+
+        Returns:
+            True if one of the futures is resolved only once the batch is sent
+
+        """
+        collected = {id(future) for _, _, _, future in self.chunks}
+        return any(id(future) in collected for future in futures)
+
+class TranslationScheduler:
+    """Dispatch translation chunks through an asyncio event loop.
+
+    The loop runs in a background thread and keeps up to max_workers requests
+    in flight, within the request and character rates of its rate limiter,
+    which is either local to the process or shared by every process on the
+    host using the same file. With passthrough, segments that need no translation
+    (numbers, URLs, code, text already in the target language) are returned
+    unchanged without a request. Short chunks are grouped into batches of up to
+    MAX_CHUNK_CHARS characters for backends that translate several texts per
+    request. Concurrency is halved when the
+    backend throttles or fails and recovers gradually on success. A single
+    scheduler can be shared by several documents, and by several threads.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, *, cache: TranslationMemory | None = None,
+                 backend: TranslatorBackend | None = None, rate_limiter: RateLimiter | SharedRateLimiter | None = None,
+                 passthrough: bool = True) -> None:
+        """Create the scheduler and start its event loop.
+
+        Args:
+            max_workers: Maximum number of concurrent translation requests
+            cache: Optional translation memory consulted before sending a request
+            backend: Translator backend, defaults to Google Translate
+            rate_limiter: Request and character rate limits, created by create_rate_limiter and closed with the
+                scheduler, defaults to no limit
+            passthrough: Whether to return segments that need no translation unchanged
+
+        """
+        self._owns_backend = backend is None
+        self.backend = backend or get_backend(DEFAULT_BACKEND, pool_size=max(1, max_workers))
+        self.cache = cache
+        self.passthrough = passthrough
+        self.retries = 0
+        self._concurrency = AdaptiveConcurrencyLimiter(max_workers)
+        self._rate = rate_limiter or RateLimiter()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="translate")
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(self._executor)
+        self._thread = threading.Thread(target=self._loop.run_forever, name="translate-loop", daemon=True)
+        self._thread.start()
+
+    async def _translate_batch(self, bodies: list[str], src_lang: str, tgt_lang: str) -> list[str]:
+        """Translate a batch of chunk bodies with one backend call, retrying throttled requests.
+
+        Args:
+            bodies: Chunks without surrounding whitespace, at most MAX_CHUNK_CHARS in total
+            src_lang: Source language code
+            tgt_lang: Target language code
+
+        Returns:
+            Translated bodies, in the same order
+
+        """
+        chars = sum(len(body) for body in bodies)
+        for attempt in range(MAX_RETRIES + 1):
+            async with self._concurrency:
+                await self._rate.acquire(chars)
+                start = time.perf_counter()
+                try:
+                    translated = await self._loop.run_in_executor(
+                        None, self.backend.translate_batch, bodies, src_lang, tgt_lang)
+                except self.backend.retryable_errors:
+                    self._concurrency.on_throttle()
+                    METRICS.increment("translation_throttled")
+                    if attempt == MAX_RETRIES:
+                        METRICS.increment("translation_failures")
+                        raise
+                else:
+                    self._concurrency.on_success()
+                    break
+                finally:
+                    elapsed = time.perf_counter() - start
+                    METRICS.add_stage_time("translate", elapsed)
+                    METRICS.observe("translation_request_seconds", elapsed)
+                    METRICS.increment("translation_requests")
+                    METRICS.increment("translation_request_chars", chars)
+                    METRICS.increment("translation_request_texts", len(bodies))
+            self.retries += 1
+            METRICS.increment("translation_retries")
+            await asyncio.sleep(backoff_delay(attempt, RETRY_BASE_DELAY, RETRY_MAX_DELAY))
+
+        if self.cache:
+            for body, text in zip(bodies, translated, strict=True):
+                await self._loop.run_in_executor(
+                    None, self.cache.put, body, src_lang, tgt_lang, self.backend.name, text)
+        return translated
+
+    def submit_text(self, text: str, src_lang: str, tgt_lang: str,
+                    recent: OrderedDict[tuple[str, str, str], Future[str]] | None = None,
+                    batch: _ChunkBatch | None = None) -> list[Future[str]]:
+        """Split text into chunks and submit their translation.
+
+        Chunks found in the translation memory and, with passthrough, segments
+        that need no translation complete immediately without a request.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language code
+            tgt_lang: Target language code
+            recent: Futures of the most recently used short chunks, to translate repeated chunks only once
+            batch: Batch collecting the chunks to translate across several texts, which the caller must flush;
+                without it, the chunks of this text are sent before returning
+
+        Returns:
+            Futures of the translated chunks, in text order
+
+        """
+        METRICS.increment("translation_text_chars", len(text))
+        own_batch = batch is None
+        batch = batch or _ChunkBatch()
+        if not self.passthrough:
+            futures = self._submit_chunks(chunk_text(text, MAX_CHUNK_CHARS), src_lang, tgt_lang, recent, batch)
+        else:
+            with METRICS.stage("passthrough"):
+                runs = split_passthrough(text, tgt_lang)
+            futures = []
+            for kind, run in runs:
+                if kind == TEXT:
+                    futures.extend(self._submit_chunks(chunk_text(run, MAX_CHUNK_CHARS), src_lang, tgt_lang,
+                                                       recent, batch))
+                    continue
+                METRICS.increment("passthrough_chars", len(run))
+                METRICS.increment(f"passthrough_{kind}_chars", len(run))
+                unchanged: Future[str] = Future()
+                unchanged.set_result(run)
+                futures.append(unchanged)
+        if own_batch:
+            self._flush_batch(batch)
+        return futures
+
+    def _submit_chunks(self, chunks: Iterable[str], src_lang: str, tgt_lang: str,
+                       recent: OrderedDict[tuple[str, str, str], Future[str]] | None,
+                       batch: _ChunkBatch) -> list[Future[str]]:
+        """Add chunks that are neither in the translation memory nor submitted recently to a batch.
+
+        The batch is sent first when the chunk would take it past
+        MAX_CHUNK_CHARS characters or the backend's max_batch_texts texts, or
+        when its language pair differs.
+
+        Args:
+            chunks: Chunks of text
+            src_lang: Source language code
+            tgt_lang: Target language code
+            recent: Futures of the most recently used short chunks, to translate repeated chunks only once,
+                holding at most MAX_DEDUPLICATED_CHUNKS entries
+            batch: Batch collecting the chunks to translate
+
+        Returns:
+            Futures of the translated chunks, in chunk order
+
+        """
+        futures: list[Future[str]] = []
+        for chunk in chunks:
+            key = (chunk, src_lang, tgt_lang)
+            if recent is not None and key in recent:
+                METRICS.increment("translation_deduplicated")
+                recent.move_to_end(key)
+                futures.append(recent[key])
+                continue
+            leading, body, trailing = split_surrounding_whitespace(chunk)
+            cached = self.cache.get(body, src_lang, tgt_lang, self.backend.name) if body and self.cache else None
+            if body and self.cache:
+                METRICS.increment("cache_hits" if cached is not None else "cache_misses")
+            future: Future[str] = Future()
+            if body and cached is None:
+                if batch.chunks and (batch.languages != (src_lang, tgt_lang)
+                                     or batch.chars + len(body) > MAX_CHUNK_CHARS
+                                     or len(batch.chunks) >= self.backend.max_batch_texts):
+                    self._flush_batch(batch)
+                batch.languages = (src_lang, tgt_lang)
+                batch.chunks.append((leading, body, trailing, future))
+                batch.chars += len(body)
+                if recent is not None and len(chunk) <= DEDUPLICATED_CHUNK_CHARS:
+                    recent[key] = future
+                    if len(recent) > MAX_DEDUPLICATED_CHUNKS:
+                        recent.popitem(last=False)
+            else:
+                future.set_result(f"{leading}{cached}{trailing}" if body else chunk)
+            futures.append(future)
+        return futures
+
+    def _flush_batch(self, batch: _ChunkBatch) -> None:
+        """Send the chunks of a batch with one backend call and resolve the future of each chunk when it completes.
+
+        Args:
+            batch: Batch collecting the chunks to translate, emptied
+
+        """
+        if not batch.chunks:
+            return
+        src_lang, tgt_lang = batch.languages
+        chunks = batch.take()
+        coroutine = self._translate_batch([body for _, body, _, _ in chunks], src_lang, tgt_lang)
+
+        def resolve(done: Future[list[str]]) -> None:
+            for index, (leading, _, trailing, future) in enumerate(chunks):
+                if done.cancelled():
+                    future.cancel()
+                elif not future.set_running_or_notify_cancel():
+                    continue
+                elif done.exception() is not None:
+                    future.set_exception(done.exception())
+                else:
+                    future.set_result(f"{leading}{done.result()[index]}{trailing}")
+
+        asyncio.run_coroutine_threadsafe(coroutine, self._loop).add_done_callback(resolve)
+
+    def translate_text(self, text: str, src_lang: str, tgt_lang: str) -> str:
+        """Translate text, waiting for every chunk to complete.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language code
+            tgt_lang: Target language code
+
+        Returns:
+            Translated text
+
+        """
+        return _join_chunks(self.submit_text(text, src_lang, tgt_lang))
+
+    def translate_pages(self, pages: Iterable[str], src_lang: str, tgt_lang: str, *,
+                        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT_PAGES,
+                        detect_per_page: bool = False) -> Iterator[str]:
+        """Translate a stream of pages, yielding translated pages in order as they complete.
+
+        At most max_in_flight pages are read ahead of the page being yielded, so
+        memory stays bounded regardless of the document length. Short chunks
+        repeated within the stream, such as running headers, are translated
+        once while they are among the MAX_DEDUPLICATED_CHUNKS most recently
+        used. Chunks of consecutive pages are grouped into batches sent with one
+        backend call, once full or before waiting for one of their pages. With
+        detect_per_page, each page is translated from its own detected language
+        and pages already in the target language are passed through unchanged.
+
+        Args:
+            pages: Stream of page texts
+            src_lang: Source language code, used for pages whose language cannot be detected
+            tgt_lang: Target language code
+            max_in_flight: Maximum number of pages submitted but not yet yielded
+            detect_per_page: Whether to detect the source language of every page
+
+        Yields:
+            Translated text of each page, in page order
+
+        """
+        pending: deque[list[Future[str]]] = deque()
+        recent: OrderedDict[tuple[str, str, str], Future[str]] = OrderedDict()
+        batch = _ChunkBatch()
+        try:
+            for page in pages:
+                page_lang = detect_page_language(page, src_lang) if detect_per_page else src_lang
+                if detect_per_page and page_lang == tgt_lang:
+                    METRICS.increment("pages_in_target_language")
+                    unchanged: Future[str] = Future()
+                    unchanged.set_result(page)
+                    pending.append([unchanged])
+                else:
+                    if page_lang != src_lang:
+                        METRICS.increment("pages_in_other_language")
+                    pending.append(self.submit_text(page, page_lang, tgt_lang, recent, batch))
+                if len(pending) >= max_in_flight:
+                    if batch.holds(pending[0]):
+                        self._flush_batch(batch)
+                    yield _join_chunks(pending.popleft())
+            self._flush_batch(batch)
+            while pending:
+                yield _join_chunks(pending.popleft())
+        finally:
+            for futures in pending:
+                for future in futures:
+                    future.cancel()
+
+    def stats(self) -> dict[str, int]:
+        """Get request scheduling statistics.
+
+        Returns:
+            Dictionary with the current and maximum concurrency, throttled requests and retries
+
+        """
+        return {
+            "concurrency": self._concurrency.limit,
+            "max_concurrency": self._concurrency.maximum,
+            "throttled": self._concurrency.throttled,
+            "retries": self.retries,
+        }
+
+    def close(self) -> None:
+        """Cancel outstanding requests, stop the event loop and release the worker pool.
+
+        The backend is closed only if the scheduler created it.
+        """
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(_cancel_pending_tasks(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._rate.close()
+        if self._owns_backend:
+            self.backend.close()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Shut the scheduler down when leaving the runtime context."""
+        self.close()
+
+def translate_text(text: str, src_lang: str, tgt_lang: str, **scheduler_options: object) -> str:
+    """Translate text, using Google Translator unless another backend is given.
+
+    The text is split into chunks below the provider payload limit, the
+    chunks are translated concurrently and reassembled in their original order.
 
     Args:
         text: Text to translate
         src_lang: Source language code
         tgt_lang: Target language code
+        **scheduler_options: Keyword arguments of TranslationScheduler, such as max_workers, cache or backend
 
     Returns:
         Translated text
 
     """
-    translator = GoogleTranslator(source=src_lang, target=tgt_lang)
-    return translator.translate(text)
+    with TranslationScheduler(**scheduler_options) as scheduler:
+        return scheduler.translate_text(text, src_lang, tgt_lang)
+
+def translate_pages(pages: Iterable[str], src_lang: str, tgt_lang: str, *,
+                    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT_PAGES, detect_per_page: bool = False,
+                    **scheduler_options: object) -> Iterator[str]:
+    """Translate a stream of pages with a dedicated scheduler.
+
+    Args:
+        pages: Stream of page texts
+        src_lang: Source language code
+        tgt_lang: Target language code
+        max_in_flight: Maximum number of pages submitted but not yet yielded
+        detect_per_page: Whether to detect the source language of every page
+        **scheduler_options: Keyword arguments of TranslationScheduler, such as max_workers, cache or backend
+
+    Yields:
+        Translated text of each page, in page order
+
+    """
+    with TranslationScheduler(**scheduler_options) as scheduler:
+        yield from scheduler.translate_pages(pages, src_lang, tgt_lang, max_in_flight=max_in_flight,
+                                             detect_per_page=detect_per_page)
+
+def translate_missing_pages(pages: Iterable[Page], manifest: JobManifest,
+                            translate: Callable[[Iterable[str]], Iterable[str]], counts: dict[str, int],
+                            previous: dict[str, str] | None = None) -> Iterator[str]:
+    """Translate the pages a job manifest has not recorded yet, recording each one as it completes.
+
+    Pages recorded by an earlier run are yielded again from the manifest, and
+    pages whose fingerprint matches a page of the previous revision reuse its
+    translation, in page order with the translated pages. Every page is still
+    read from the stream, so that cleaning stays identical to an uninterrupted
+    run.
+
+    Args:
+        pages: Stream of pages
+        manifest: Open manifest of the job
+        translate: Function translating a stream of page texts, yielding them in order
+        counts: Receives the number of pages resumed from the manifest, reused from the previous revision
+            and translated
+        previous: Translated page text by fingerprint, from the previous revision
+
+    Yields:
+        Translated text of each page, in page order
+
+    """
+    counts.update(resumed=0, reused=0, translated=0)
+    # Pages read from the stream and not yielded yet, as [number, fingerprint, text, already recorded];
+    # the text is None until the page is translated
+    pending: deque[list] = deque()
+
+    def missing() -> Iterator[str]:
+        for page in pages:
+            if page.number in manifest.completed:
+                pending.append([page.number, None, manifest.completed.pop(page.number), True])
+                counts["resumed"] += 1
+                continue
+            fingerprint = page_fingerprint(page.text)
+            if previous and fingerprint in previous:
+                pending.append([page.number, fingerprint, previous[fingerprint], False])
+                counts["reused"] += 1
+                continue
+            pending.append([page.number, fingerprint, None, False])
+            yield page.text
+
+    def ready() -> Iterator[str]:
+        while pending and pending[0][2] is not None:
+            number, fingerprint, text, recorded = pending.popleft()
+            if not recorded:
+                manifest.record(number, text, fingerprint)
+            yield text
+
+    for translated in translate(missing()):
+        yield from ready()
+        pending[0][2] = translated
+        counts["translated"] += 1
+        yield from ready()
+    yield from ready()
+
+    for name, count in counts.items():
+        METRICS.increment(f"pages_{name}", count)
+
+def run_translation_job(pdf_path: str, pages: Iterable[Page],  # noqa: PLR0913
+                        translate: Callable[[Iterable[str]], Iterable[str]], output_base_path: str,
+                        output_formats: list[str], *, title: str, settings: dict[str, object],
+                        page_index_path: str | None = None, resume: bool = False, overwrite: bool = False,
+                        interactive: bool = True) -> tuple[dict[str, str], dict[str, int]]:
+    """Translate a document through a job manifest, streaming every page into the output of each format.
+
+    Completed pages are recorded in a manifest next to the outputs so that an
+    interrupted job can resume: the outputs are then written again from the
+    recorded pages before translation continues. Once every page is done, the
+    page fingerprints and translations are kept in the page index for the next
+    revision, and the manifest is deleted.
+
+    Args:
+        pdf_path: Path to the source PDF file
+        pages: Stream of pages
+        translate: Function translating a stream of page texts, yielding them in order
+        output_base_path: Output file path without extension
+        output_formats: Formats to save the output as (txt, html, md)
+        title: Title for formatted output
+        settings: Options that change the translated pages, e.g. languages and cleaning
+        page_index_path: Page index of the previous revision, updated on success, or None to skip reuse
+        resume: Whether to continue from the manifest of an interrupted run
+        overwrite: Whether to overwrite existing output files
+        interactive: Whether to ask the user before picking new output file names
+
+    Returns:
+        Tuple of (saved output path of each format, page counts from translate_missing_pages)
+
+    """
+    manifest = JobManifest(manifest_path_for(output_base_path), describe_job(pdf_path, settings))
+    output_paths: dict[str, str] = {}
+    if resume and manifest.load():
+        output_paths = {fmt: path for fmt, path in manifest.output_paths.items() if fmt in output_formats}
+        print(Fore.YELLOW + f"Resuming {os.path.basename(pdf_path)}: {len(manifest.completed)} pages already translated.")
+    elif manifest.exists():
+        print(Fore.YELLOW + f"Discarding the progress of an earlier run of {os.path.basename(pdf_path)}. "
+              f"Use --resume to continue it instead.")
+    for fmt in output_formats:
+        if fmt not in output_paths:
+            output_paths[fmt] = handle_file_path_conflict(f"{output_base_path}.{fmt}", overwrite=overwrite,
+                                                        interactive=interactive)
+
+    previous = load_page_index(page_index_path, settings) if page_index_path else {}
+    counts: dict[str, int] = {}
+    with manifest:
+        manifest.start(output_paths)
+        process_output_streams(output_paths, translate_missing_pages(pages, manifest, translate, counts, previous),
+                               title)
+    if page_index_path:
+        save_page_index(page_index_path, settings,
+                        ((fingerprint, text) for _, fingerprint, text in manifest.iter_pages()))
+    manifest.remove()
+    return output_paths, counts
 
 def generate_output_filename(original_filename: str, src_lang: str, tgt_lang: str) -> str:
     """Generate output filename in the same directory as source PDF.
@@ -87,12 +959,68 @@ def options_parser() -> argparse.ArgumentParser:
     """
     parser = argparse.ArgumentParser(description="Translate a PDF file.")
     parser.add_argument("-s", "--src", "--src_lang", type=str, help="Source language code (optional)")
-    parser.add_argument("-t", "--tgt", "--tgt_lang", type=str, default="en", help="Target language code (default: en)")
+    parser.add_argument("-t", "--tgt", "--tgt_lang", type=str, default="en",
+                        help="Target language code, or several separated by commas, e.g. de,fr,es (default: en)")
     parser.add_argument("-f", "--overwrite", action="store_true", help="Overwrite existing files if output exists")
     parser.add_argument("-c", "--clean", action="store_true", help="Clean text before translation")
     parser.add_argument("-e", "--ext", type=str, default="txt",
-                        help="Desired output file format (txt, html, md). Default: txt")
-    parser.add_argument("pdf_path", type=str, nargs="?", help="Path to the input PDF file (optional)")
+                        help="Output file format (txt, html, md), or several separated by commas, e.g. html,md. "
+                             "Default: txt")
+    parser.add_argument("-o", "--output", type=str,
+                        help="Output file, its extension selects the format, or - for standard output. Only with one "
+                             "target language and format. Default: next to the PDF, standard output for stdin input")
+    parser.add_argument("--detect-per-page", action="store_true",
+                        help="Detect the source language of every page instead of once per document")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from its job manifest instead of starting over")
+    parser.add_argument("--page-index", type=str,
+                        help="Page index file reusing the translations of unchanged pages between revisions of a "
+                             "document, one per target language named after it (a directory of page indexes in "
+                             "batch mode). Default: none")
+    parser.add_argument("--repeated-blocks", type=str, default="keep", choices=REPEATED_BLOCK_MODES,
+                        help="Running headers and footers: keep them, strip them, or translate each distinct one once. "
+                             "Default: keep")
+    parser.add_argument("--extract-workers", type=int, default=DEFAULT_EXTRACT_WORKERS,
+                        help=f"Extraction processes for documents of {PARALLEL_EXTRACTION_MIN_PAGES} pages or more "
+                             f"(1 to always extract in one process). Default: {DEFAULT_EXTRACT_WORKERS}")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"Maximum number of concurrent translation requests. Default: {DEFAULT_MAX_WORKERS}")
+    parser.add_argument("-b", "--backend", type=str, default=DEFAULT_BACKEND, choices=sorted(BACKENDS),
+                        help=f"Translator backend. Default: {DEFAULT_BACKEND}")
+    parser.add_argument("--offline-mode", type=str, default="identity", choices=OfflineBackend.MODES,
+                        help="Offline backend: return text unchanged (identity) or pseudo-localized. Default: identity")
+    parser.add_argument("--offline-latency", type=float, default=0.0,
+                        help="Offline backend: simulated seconds of latency per request. Default: 0")
+    parser.add_argument("--rps", type=float, default=0.0,
+                        help="Maximum translation requests per second (0 for no limit). Default: 0")
+    parser.add_argument("--cps", type=float, default=0.0,
+                        help="Maximum characters sent for translation per second (0 for no limit). Default: 0")
+    parser.add_argument("--rate-limit-scope", type=str, default="host", choices=RATE_LIMIT_SCOPES,
+                        help="Apply --rps and --cps to all processes on the host sharing --rate-limit-path, "
+                             "or to this process only. Default: host")
+    parser.add_argument("--rate-limit-path", type=str, default=DEFAULT_RATE_LIMIT_PATH,
+                        help=f"Database file of the host-wide rate limits. Default: {DEFAULT_RATE_LIMIT_PATH}")
+    parser.add_argument("--no-passthrough", action="store_true",
+                        help="Send every segment to the translator, including numbers, URLs, code and text already in "
+                             "the target language")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the persistent translation memory")
+    parser.add_argument("--clear-cache", action="store_true", help="Clear the translation memory before running")
+    parser.add_argument("--cache-path", type=str, default=DEFAULT_CACHE_PATH,
+                        help=f"Translation memory database file. Default: {DEFAULT_CACHE_PATH}")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_MAX_MB,
+                        help=f"Maximum translation memory size in MB. Default: {DEFAULT_CACHE_MAX_MB}")
+    parser.add_argument("--metrics-json", type=str, help="Write run metrics (stage timings, latencies) to a JSON file")
+    parser.add_argument("--metrics-prom", type=str,
+                        help="Write run metrics to a Prometheus text file, e.g. for the node exporter")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_DOCUMENT_JOBS,
+                        help=f"Batch mode: maximum number of documents translated concurrently. "
+                             f"Default: {DEFAULT_DOCUMENT_JOBS}")
+    parser.add_argument("--serve", type=str, nargs="?", const=DEFAULT_SERVICE_ADDRESS, metavar="HOST:PORT",
+                        help=f"Run as a resident service with an HTTP job API instead of translating a file. "
+                             f"Default address: {DEFAULT_SERVICE_ADDRESS}")
+    parser.add_argument("pdf_path", type=str, nargs="*",
+                        help="Path to the input PDF file (optional), or - to read it from standard input. Several "
+                             "files, directories or glob patterns run in non-interactive batch mode")
     return parser
 
 def process_output_file(output_path: str, translated_text: str, output_format: str, title: Optional[str] = None) -> None:
@@ -106,12 +1034,90 @@ def process_output_file(output_path: str, translated_text: str, output_format: s
 
     """
     try:
-        formatter = get_formatter(output_format)
-        formatted_text = formatter(translated_text, title)
-
-        ensure_directory_exists(output_path)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(formatted_text)
+        write_formatted_output(output_path, [translated_text], get_stream_formatter(output_format, title))
     except Exception as e:
         print(Fore.RED + f"Failed to save the output file: {e}")
         raise
+
+def process_output_streams(output_paths: dict[str, str], translated_pages: Iterable[str],
+                           title: str | None = None) -> None:
+    """Write translated pages into several formats at once as they become available.
+
+    Errors raised while producing the pages propagate to the caller.
+
+    Args:
+        output_paths: Path to save the output of each format (txt, html, md) to
+        translated_pages: Stream of translated page texts
+        title: Optional title for formatted output
+
+    """
+    write_formatted_outputs({output_path: get_stream_formatter(output_format, title)
+                             for output_format, output_path in output_paths.items()}, translated_pages)
+
+def process_output_stream(output_path: str, translated_pages: Iterable[str], output_format: str,
+                          title: str | None = None) -> None:
+    """Write translated pages to file in the specified format as they become available.
+
+    Errors raised while producing the pages propagate to the caller.
+
+    Args:
+        output_path: Path to save the output file
+        translated_pages: Stream of translated page texts
+        output_format: Format to save the output as (txt, html, md)
+        title: Optional title for formatted output
+
+    """
+    write_formatted_output(output_path, translated_pages, get_stream_formatter(output_format, title))
+
+def write_formatted_output(output_path: str, chunks: Iterable[str], formatter: StreamFormatter) -> None:
+    """Format and write a document chunk by chunk through a buffered file handle.
+
+    The file is flushed after every chunk, so finished pages reach the disk
+    while later pages are still being translated.
+
+    Args:
+        output_path: Path to save the output file, or - for standard output
+        chunks: Stream of body texts, e.g. translated pages
+        formatter: Formatter of the output format
+
+    """
+    write_formatted_outputs({output_path: formatter}, chunks)
+
+def write_formatted_outputs(outputs: dict[str, StreamFormatter], chunks: Iterable[str]) -> None:
+    """Format and write a document into several files chunk by chunk, reading the chunks once.
+
+    Every file is flushed after every chunk, so finished pages reach the disk
+    while later pages are still being translated. The files are written in
+    turn from the calling thread rather than by a writer thread each:
+    formatting holds the GIL and the writes are buffered, so threads only add
+    queue hand-offs, and writing 2000 pages into txt, html and md took about
+    30% longer with one thread per format.
+
+    Args:
+        outputs: Formatter of each output path, a path of - being standard output
+        chunks: Stream of body texts, e.g. translated pages
+
+    """
+    with ExitStack() as stack:
+        files = [(stack.enter_context(_open_output(output_path)), formatter)
+                 for output_path, formatter in outputs.items()]
+        for f, formatter in files:
+            f.write(formatter.header())
+        for chunk in chunks:
+            with METRICS.stage("write"):
+                for f, formatter in files:
+                    f.write(formatter.format_chunk(chunk))
+                    f.flush()
+            METRICS.increment("chars_written", len(chunk))
+        for f, formatter in files:
+            f.write(formatter.footer())
+
+def _open_output(output_path: str) -> TextIO:
+    """Open an output file, or standard output for -, for buffered writing."""
+    if output_path == STDIO_PATH:
+        # Messages may be redirected away from sys.stdout while it carries the output
+        sys.__stdout__.flush()
+        return open(sys.__stdout__.fileno(), "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE,
+                    closefd=False)
+    ensure_directory_exists(output_path)
+    return open(output_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE)
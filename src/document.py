@@ -0,0 +1,212 @@
+"""Compact document model: pages made of text blocks made of lines.
+
+A page keeps its text in a single string. Blocks and lines are spans of that
+string, so the model costs little more memory than the text itself. Lines are
+computed when they are asked for and not stored. Every segment has an ID that
+depends only on its position, e.g. "p3.b2.l0" for the first line of the third
+block of the fourth page, so IDs are stable between runs on the same PDF.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import Self
+
+from src.utils.chunking import SEGMENT_SEPARATOR
+
+BODY = "body"
+HEADER = "header"
+FOOTER = "footer"
+BLOCK_KINDS = (BODY, HEADER, FOOTER)
+
+
+class Line:
+    """A line of a block, without its line break."""
+
+    __slots__ = ("block", "end", "index", "start")
+
+    def __init__(self, block: "Block", index: int, start: int, end: int) -> None:
+        """Create the line.
+
+        Args:
+            block: Block containing the line
+            index: Zero-based position of the line in the block
+            start: Offset of the first character in the page text
+            end: Offset after the last character in the page text
+
+        """
+        self.block = block
+        self.index = index
+        self.start = start
+        self.end = end
+
+    @property
+    def id(self) -> str:
+        """Stable segment ID of the line."""
+        return f"{self.block.id}.l{self.index}"
+
+    @property
+    def text(self) -> str:
+        """Text of the line."""
+        return self.block.page.text[self.start:self.end]
+
+    def __repr__(self) -> str:
+        """Show the ID and offsets of the line."""
+        return f"Line({self.id}, {self.start}:{self.end})"
+
+class Block:
+    """A text block of a page: a paragraph, heading, running header or footer."""
+
+    __slots__ = ("end", "index", "kind", "page", "start")
+
+    def __init__(self, page: "Page", index: int, start: int, end: int, kind: str = BODY) -> None:
+        """Create the block.
+
+        Args:
+            page: Page containing the block
+            index: Zero-based position of the block in the page
+            start: Offset of the first character in the page text
+            end: Offset after the last character in the page text
+            kind: BODY, HEADER or FOOTER
+
+        """
+        self.page = page
+        self.index = index
+        self.start = start
+        self.end = end
+        self.kind = kind
+
+    @property
+    def id(self) -> str:
+        """Stable segment ID of the block."""
+        return f"{self.page.id}.b{self.index}"
+
+    @property
+    def text(self) -> str:
+        """Text of the block, including its line breaks."""
+        return self.page.text[self.start:self.end]
+
+    def lines(self) -> Iterator[Line]:
+        """Split the block into lines.
+
+        Yields:
+            Each line of the block, a trailing line break does not start an empty line
+
+        """
+        text = self.page.text
+        start = self.start
+        index = 0
+        while start < self.end:
+            newline = text.find("\n", start, self.end)
+            end = self.end if newline == -1 else newline
+            yield Line(self, index, start, end)
+            index += 1
+            start = end + 1
+
+    def __repr__(self) -> str:
+        """Show the ID, kind and offsets of the block."""
+        return f"Block({self.id}, {self.kind}, {self.start}:{self.end})"
+
+class Page:
+    """A page of a document.
+
+    The page text is the text of its blocks in order. A segment separator is
+    placed between blocks unless both are body blocks, so running headers and
+    footers are translated as segments of their own.
+    """
+
+    __slots__ = ("blocks", "number", "text")
+
+    def __init__(self, number: int, text: str = "", blocks: tuple[Block, ...] = ()) -> None:
+        """Create a page, usually through from_blocks or from_text.
+
+        Args:
+            number: Zero-based page number
+            text: Page text
+            blocks: Blocks of the page, spans of text
+
+        """
+        self.number = number
+        self.text = text
+        self.blocks = blocks
+
+    @classmethod
+    def from_blocks(cls, number: int, blocks: Iterable[tuple[str, str]]) -> Self:
+        """Build a page from the kind and text of each block.
+
+        Args:
+            number: Zero-based page number
+            blocks: (kind, text) of each block, in reading order
+
+        Returns:
+            Page
+
+        """
+        page = cls(number)
+        parts: list[str] = []
+        spans: list[Block] = []
+        offset = 0
+        previous_kind = None
+        for index, (kind, text) in enumerate(blocks):
+            if previous_kind is not None and (kind != BODY or previous_kind != BODY):
+                parts.append(SEGMENT_SEPARATOR)
+                offset += len(SEGMENT_SEPARATOR)
+            spans.append(Block(page, index, offset, offset + len(text), kind))
+            parts.append(text)
+            offset += len(text)
+            previous_kind = kind
+        page.text = "".join(parts)
+        page.blocks = tuple(spans)
+        return page
+
+    @classmethod
+    def from_text(cls, number: int, text: str) -> Self:
+        """Build a page holding text as a single body block.
+
+        Args:
+            number: Zero-based page number
+            text: Page text
+
+        Returns:
+            Page
+
+        """
+        return cls.from_blocks(number, [(BODY, text)] if text else [])
+
+    def with_block_texts(self, texts: Iterable[str]) -> Self:
+        """Create a copy of the page with new text for each block, e.g. after cleaning.
+
+        Args:
+            texts: New text of each block, in block order
+
+        Returns:
+            Page with the same number and block kinds
+
+        """
+        return type(self).from_blocks(self.number, zip((block.kind for block in self.blocks), texts, strict=True))
+
+    @property
+    def id(self) -> str:
+        """Stable segment ID of the page."""
+        return f"p{self.number}"
+
+    def lines(self) -> Iterator[Line]:
+        """Iterate over the lines of every block.
+
+        Yields:
+            Each line of the page, in block order
+
+        """
+        for block in self.blocks:
+            yield from block.lines()
+
+    def __getstate__(self) -> tuple[int, str, tuple[tuple[int, int, str], ...]]:
+        """Get a compact picklable state, without the back references of the blocks."""
+        return self.number, self.text, tuple((block.start, block.end, block.kind) for block in self.blocks)
+
+    def __setstate__(self, state: tuple[int, str, tuple[tuple[int, int, str], ...]]) -> None:
+        """Restore the page from its pickled state."""
+        self.number, self.text, spans = state
+        self.blocks = tuple(Block(self, index, start, end, kind) for index, (start, end, kind) in enumerate(spans))
+
+    def __repr__(self) -> str:
+        """Show the ID and size of the page."""
+        return f"Page({self.id}, {len(self.blocks)} blocks, {len(self.text)} chars)"
@@ -0,0 +1,604 @@
+"""Resident translation service with a local HTTP job API.
+
+The service keeps PyMuPDF, the language profiles, the translator backend and
+the translation memory loaded, so a request only pays for the work on its
+document. Jobs are queued and run on a pool of document workers that share
+one translation scheduler.
+
+Endpoints:
+    POST /jobs                  Upload a PDF (body) or submit a path (JSON body {"path": ...})
+    GET  /jobs                  List jobs
+    GET  /jobs/<id>             Job status and progress
+    GET  /jobs/<id>/pages       Translated pages as JSON lines, streamed while the job runs
+    GET  /jobs/<id>/result      Output file, once the job is done (?format=txt&lang=en)
+    GET  /health                Service status
+    GET  /metrics               Run metrics in Prometheus text format
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+from urllib.parse import parse_qs, urlsplit
+
+from src.core import (
+    DEFAULT_DOCUMENT_JOBS,
+    DEFAULT_SERVICE_ADDRESS,
+    REPEATED_BLOCK_MODES,
+    TranslationScheduler,
+    clean_pages,
+    detect_language,
+    generate_output_filename,
+    iter_pdf_pages,
+    open_pdf,
+    peek_pages,
+    run_translation_job,
+    sample_pdf_text,
+    split_option_list,
+    tee_pages,
+)
+from src.document import Page
+from src.utils.detection import get_detector_factory
+from src.utils.formatting import STREAM_FORMATTERS, get_stream_formatter
+from src.utils.language_map import normalize_language_code
+from src.utils.metrics import METRICS
+from src.utils.transformation import clean_extracted_text
+
+MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+MAX_FINISHED_JOBS = 100
+UPLOAD_CHUNK_BYTES = 64 * 1024
+CONTENT_TYPES = {"txt": "text/plain", "html": "text/html", "md": "text/markdown"}
+TRUE_VALUES = ("1", "true", "yes", "y", "on")
+STRING_OPTIONS = ("src", "tgt", "format", "repeated_blocks")
+BOOLEAN_OPTIONS = ("clean", "detect_per_page")
+UNSAFE_FILENAME_PATTERN = re.compile(r"[^A-Za-z0-9._-]+")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobError(ValueError):
+    """Invalid job request, reported to the client as 400 Bad Request."""
+
+@dataclass
+class JobOptions:
+    """Translation options of a job."""
+
+    src_lang: str | None
+    tgt_langs: list[str]
+    output_formats: list[str]
+    clean: bool = False
+    repeated_blocks: str = "keep"
+    detect_per_page: bool = False
+
+    @classmethod
+    def from_values(cls, values: dict[str, object], defaults: dict[str, object]) -> Self:
+        """Read job options from a request, falling back to the service defaults.
+
+        Args:
+            values: Options of the request: src, tgt, format, clean, repeated_blocks, detect_per_page
+            defaults: Options given on the command line that started the service
+
+        Returns:
+            Validated options
+
+        Raises:
+            JobError: If an option is invalid
+
+        """
+        for key, value in values.items():
+            if key in STRING_OPTIONS and value is not None and not isinstance(value, str):
+                msg = f"Option {key} must be a string"
+                raise JobError(msg)
+            if key in BOOLEAN_OPTIONS and value is not None and not isinstance(value, str | bool):
+                msg = f"Option {key} must be a boolean or a string"
+                raise JobError(msg)
+        merged = {**defaults, **{key: value for key, value in values.items() if value not in (None, "")}}
+        tgt_langs = list(dict.fromkeys(normalize_language_code(tgt_lang)
+                                       for tgt_lang in split_option_list(str(merged.get("tgt") or "en"))))
+        output_formats = split_option_list(str(merged.get("format") or "txt").lower())
+        unsupported = [fmt for fmt in output_formats if fmt not in STREAM_FORMATTERS]
+        if unsupported:
+            msg = f"Unsupported output format: {', '.join(unsupported)}"
+            raise JobError(msg)
+        repeated_blocks = str(merged.get("repeated_blocks") or "keep")
+        if repeated_blocks not in REPEATED_BLOCK_MODES:
+            msg = f"Unsupported repeated_blocks mode: {repeated_blocks}"
+            raise JobError(msg)
+        src_lang = merged.get("src")
+        return cls(normalize_language_code(str(src_lang)) if src_lang else None, tgt_langs, output_formats,
+                   _parse_bool(merged.get("clean")), repeated_blocks, _parse_bool(merged.get("detect_per_page")))
+
+@dataclass
+class ServiceJob:
+    """A queued, running or finished translation job.
+
+    Translated pages are appended as they are produced; clients streaming the
+    job wait on the condition for new pages. An uploaded PDF is kept in memory
+    until the job finishes, and its outputs are rendered from the pages.
+    """
+
+    id: str
+    pdf_path: str
+    options: JobOptions
+    content: bytes | None = field(default=None, repr=False)
+    uploaded: bool = False
+    status: str = QUEUED
+    error: str | None = None
+    src_lang: str | None = None
+    page_count: int | None = None
+    output_paths: dict[str, dict[str, str | None]] = field(default_factory=dict)
+    pages: list[tuple[str, int, str]] = field(default_factory=list)
+    created: float = field(default_factory=time.time)
+    started: float | None = None
+    finished: float | None = None
+    changed: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job is done or failed."""
+        return self.status in (DONE, FAILED)
+
+    def add_page(self, tgt_lang: str, index: int, text: str) -> None:
+        """Record a translated page and wake up streaming clients.
+
+        Args:
+            tgt_lang: Target language of the page
+            index: Zero-based position of the page among the pages translated into tgt_lang
+            text: Translated page text
+
+        """
+        with self.changed:
+            self.pages.append((tgt_lang, index, text))
+            self.changed.notify_all()
+
+    def set_status(self, status: str, error: str | None = None) -> None:
+        """Update the job status and wake up streaming clients.
+
+        Args:
+            status: New status
+            error: Error message of a failed job
+
+        """
+        with self.changed:
+            self.status = status
+            self.error = error
+            if status == RUNNING:
+                self.started = time.time()
+            elif self.is_finished:
+                self.finished = time.time()
+            self.changed.notify_all()
+
+    def to_dict(self) -> dict[str, object]:
+        """Describe the job for the API.
+
+        Returns:
+            JSON-serializable job status
+
+        """
+        translated: dict[str, int] = dict.fromkeys(self.options.tgt_langs, 0)
+        for tgt_lang, _, _ in self.pages:
+            translated[tgt_lang] += 1
+        return {
+            "id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "pdf": os.path.basename(self.pdf_path),
+            "src": self.src_lang or self.options.src_lang,
+            "tgt": self.options.tgt_langs,
+            "formats": self.options.output_formats,
+            "pages": self.page_count,
+            "pages_translated": translated,
+            "outputs": {tgt_lang: {fmt: f"/jobs/{self.id}/result?lang={tgt_lang}&format={fmt}" for fmt in paths}
+                        for tgt_lang, paths in self.output_paths.items()},
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+class TranslationService:
+    """Queue of translation jobs run by a pool of document workers sharing one warm scheduler."""
+
+    def __init__(self, scheduler: TranslationScheduler, *, document_jobs: int = DEFAULT_DOCUMENT_JOBS,
+                 extract_workers: int = 1, overwrite: bool = False, defaults: dict[str, object] | None = None) -> None:
+        """Create the service and its worker pool.
+
+        Args:
+            scheduler: Translation scheduler shared by the jobs, closed with the service
+            document_jobs: Maximum number of jobs run concurrently
+            extract_workers: Extraction processes for large documents
+            overwrite: Whether jobs given by path overwrite existing outputs
+            defaults: Default job options: src, tgt, format, clean, repeated_blocks, detect_per_page
+
+        """
+        self.scheduler = scheduler
+        self.backend = scheduler.backend
+        self.extract_workers = extract_workers
+        self.overwrite = overwrite
+        self.defaults = defaults or {}
+        self._pool = ThreadPoolExecutor(max_workers=max(1, document_jobs), thread_name_prefix="job")
+        self._jobs: dict[str, ServiceJob] = {}
+        self._finished: deque[str] = deque()
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Load PyMuPDF, the language profiles and the translator stack before the first job."""
+        import pymupdf  # noqa: F401
+
+        get_detector_factory()
+        self.backend.warm_up()
+
+    def submit_path(self, pdf_path: str, values: dict[str, object]) -> ServiceJob:
+        """Queue a job for a PDF file readable by the service, writing the outputs next to it.
+
+        Args:
+            pdf_path: Path to the PDF file
+            values: Job options of the request
+
+        Returns:
+            Queued job
+
+        Raises:
+            JobError: If the file does not exist or an option is invalid
+
+        """
+        if not os.path.isfile(pdf_path):
+            msg = f"PDF file not found: {pdf_path}"
+            raise JobError(msg)
+        return self._submit(ServiceJob(uuid.uuid4().hex, os.path.abspath(pdf_path),
+                                       JobOptions.from_values(values, self.defaults)))
+
+    def submit_upload(self, filename: str, content: bytes, values: dict[str, object]) -> ServiceJob:
+        """Queue a job for an uploaded PDF, which is read from memory and never written to disk.
+
+        Args:
+            filename: Name of the uploaded file, used for the output names
+            content: Content of the file
+            values: Job options of the request
+
+        Returns:
+            Queued job
+
+        Raises:
+            JobError: If an option is invalid
+
+        """
+        options = JobOptions.from_values(values, self.defaults)
+        name = safe_filename(filename) or "document.pdf"
+        name = name if name.lower().endswith(".pdf") else f"{name}.pdf"
+        return self._submit(ServiceJob(uuid.uuid4().hex, name, options, content, uploaded=True))
+
+    def _submit(self, job: ServiceJob) -> ServiceJob:
+        """Register a job and queue it on the worker pool."""
+        with self._lock:
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> ServiceJob | None:
+        """Find a job by ID.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job, or None if it does not exist or was forgotten
+
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[ServiceJob]:
+        """List the known jobs, oldest first.
+
+        Returns:
+            Jobs
+
+        """
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _run(self, job: ServiceJob) -> None:
+        """Extract, translate and save one job, recording its outcome."""
+        job.set_status(RUNNING)
+        options = job.options
+        source = job.content if job.uploaded else job.pdf_path
+        try:
+            with open_pdf(source) as doc:
+                job.page_count = doc.page_count
+            pages = iter_pdf_pages(source, options.repeated_blocks, self.extract_workers)
+            if options.clean:
+                pages = clean_pages(pages)
+            head, pages = peek_pages(pages, 1)
+            if not head.strip():
+                msg = "No text found in the PDF."
+                raise ValueError(msg)
+            job.src_lang = options.src_lang or self._detect_language(source, clean=options.clean)
+
+            if len(options.tgt_langs) == 1:
+                self._translate_to(job, pages, options.tgt_langs[0])
+            else:
+                with ThreadPoolExecutor(max_workers=len(options.tgt_langs), thread_name_prefix="language") as pool:
+                    futures = [pool.submit(self._translate_to, job, language_pages, tgt_lang)
+                               for tgt_lang, language_pages in zip(options.tgt_langs,
+                                                                   tee_pages(pages, len(options.tgt_langs)),
+                                                                   strict=True)]
+                    for future in futures:
+                        future.result()
+        except Exception as e:  # noqa: BLE001
+            job.set_status(FAILED, str(e) or type(e).__name__)
+        else:
+            job.set_status(DONE)
+        finally:
+            job.content = None
+        self._forget_old_jobs(job)
+
+    @staticmethod
+    def _detect_language(source: str | bytes, *, clean: bool) -> str:
+        """Detect the source language of a document from a sample of its pages."""
+        sample = sample_pdf_text(source)
+        detected = detect_language(clean_extracted_text(sample) if clean else sample)
+        if not detected:
+            msg = "Failed to detect source language."
+            raise ValueError(msg)
+        return normalize_language_code(detected)
+
+    def _translate_to(self, job: ServiceJob, pages: Iterable[Page], tgt_lang: str) -> None:
+        """Translate the pages of a job into one language and save the outputs."""
+        options = job.options
+        src_lang = job.src_lang
+
+        def translate(missing_pages: Iterable[str]) -> Iterator[str]:
+            translated = self.scheduler.translate_pages(missing_pages, src_lang, tgt_lang,
+                                                        detect_per_page=options.detect_per_page)
+            for index, text in enumerate(translated):
+                job.add_page(tgt_lang, index, text)
+                yield text
+
+        if job.uploaded:
+            # Rendered from the recorded pages when requested
+            for _ in translate(page.text for page in pages):
+                pass
+            job.output_paths[tgt_lang] = dict.fromkeys(options.output_formats)
+            return
+
+        output_base_path = generate_output_filename(job.pdf_path, src_lang, tgt_lang)
+        settings = {"src": src_lang, "tgt": tgt_lang, "clean": options.clean, "backend": self.backend.name,
+                    "detect_per_page": options.detect_per_page, "repeated_blocks": options.repeated_blocks,
+                    "passthrough": self.scheduler.passthrough}
+        title = f"Translation of {os.path.basename(job.pdf_path)} from {src_lang} to {tgt_lang}"
+        output_paths, _ = run_translation_job(job.pdf_path, pages, translate, output_base_path,
+                                              options.output_formats, title=title, settings=settings,
+                                              overwrite=self.overwrite, interactive=False)
+        job.output_paths[tgt_lang] = output_paths
+
+    def _forget_old_jobs(self, job: ServiceJob) -> None:
+        """Keep at most MAX_FINISHED_JOBS finished jobs, with the translated pages of each."""
+        with self._lock:
+            self._finished.append(job.id)
+            while len(self._finished) > MAX_FINISHED_JOBS:
+                self._jobs.pop(self._finished.popleft(), None)
+
+    def close(self) -> None:
+        """Stop the service: cancel running translations and drop queued jobs."""
+        self.scheduler.close()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> Self:
+        """Use the service as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the service on exit."""
+        self.close()
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a TranslationService."""
+
+    server: "ServiceHTTPServer"
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Serve job status, page streams, results, health and metrics."""
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        service = self.server.service
+
+        if parts == ["health"]:
+            jobs = service.jobs()
+            self._send_json(HTTPStatus.OK, {"status": "ok", "jobs": {
+                status: sum(job.status == status for job in jobs) for status in (QUEUED, RUNNING, DONE, FAILED)}})
+        elif parts == ["metrics"]:
+            self._send_body(HTTPStatus.OK, METRICS.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        elif parts == ["jobs"]:
+            self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in service.jobs()]})
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            job_id, *resource = parts[1:]
+            job = service.get(job_id)
+            if job is None:
+                self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job: {job_id}")
+            elif not resource:
+                self._send_json(HTTPStatus.OK, job.to_dict())
+            elif resource == ["pages"]:
+                self._stream_pages(job)
+            elif resource == ["result"]:
+                self._send_result(job, query)
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path: {url.path}")
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path: {url.path}")
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Queue a job for an uploaded PDF or a PDF path."""
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path: {url.path}")
+            return
+        query: dict[str, object] = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length header")
+            return
+        if length > MAX_UPLOAD_BYTES:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Uploads are limited to {MAX_UPLOAD_BYTES} bytes")
+            return
+        content_type = self.headers.get_content_type()
+        try:
+            if content_type == "application/json":
+                values = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(values, dict) or not isinstance(values.get("path"), str) or not values["path"]:
+                    msg = 'Expected a JSON object with a "path"'
+                    raise JobError(msg)
+                job = self.server.service.submit_path(values.pop("path"), {**query, **values})
+            elif length:
+                filename = str(query.pop("filename", None) or "document.pdf")
+                content = self.rfile.read(length)
+                if len(content) < length:
+                    msg = f"Incomplete upload: {len(content)} of {length} bytes received"
+                    raise JobError(msg)
+                job = self.server.service.submit_upload(filename, content, query)
+            else:
+                msg = "Send a PDF as the request body or a JSON object with a path"
+                raise JobError(msg)
+        except (JobError, json.JSONDecodeError) as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+    def _stream_pages(self, job: ServiceJob) -> None:
+        """Send translated pages as JSON lines while they are produced, ending with the final status."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.end_headers()
+        sent = 0
+        while True:
+            with job.changed:
+                while len(job.pages) == sent and not job.is_finished:
+                    job.changed.wait()
+                pages = job.pages[sent:]
+                finished = job.is_finished
+            for tgt_lang, index, text in pages:
+                self._write_line({"lang": tgt_lang, "page": index, "text": text})
+            sent += len(pages)
+            if finished and sent == len(job.pages):
+                self._write_line({"status": job.status, "error": job.error})
+                return
+
+    def _write_line(self, record: dict[str, object]) -> None:
+        """Send one JSON line and flush it to the client."""
+        self.wfile.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def _send_result(self, job: ServiceJob, query: dict[str, str]) -> None:
+        """Send an output file of a finished job."""
+        if job.status != DONE:
+            self._send_error(HTTPStatus.CONFLICT, f"Job is {job.status}" + (f": {job.error}" if job.error else ""))
+            return
+        tgt_lang = normalize_language_code(query["lang"]) if "lang" in query else job.options.tgt_langs[0]
+        output_format = query.get("format", job.options.output_formats[0]).lower()
+        outputs = job.output_paths.get(tgt_lang, {})
+        if output_format not in outputs:
+            self._send_error(HTTPStatus.NOT_FOUND, f"No {output_format} output in {tgt_lang} for this job")
+            return
+        content_type = f"{CONTENT_TYPES.get(output_format, 'text/plain')}; charset=utf-8"
+        output_path = outputs[output_format]
+        if output_path is None:
+            name = generate_output_filename(job.pdf_path, job.src_lang, tgt_lang)
+            headers = {"Content-Disposition": f'attachment; filename="{safe_filename(f"{name}.{output_format}")}"'}
+            title = f"Translation of {job.pdf_path} from {job.src_lang} to {tgt_lang}"
+            text = "".join(text for lang, _, text in job.pages if lang == tgt_lang)
+            body = get_stream_formatter(output_format, title).format(text).encode("utf-8")
+            self._send_body(HTTPStatus.OK, body, content_type, headers)
+            return
+        with open(output_path, "rb") as file:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(os.fstat(file.fileno()).st_size))
+            self.send_header("Content-Disposition", f'attachment; filename="{safe_filename(output_path)}"')
+            self.end_headers()
+            shutil.copyfileobj(file, self.wfile, UPLOAD_CHUNK_BYTES)
+
+    def _send_json(self, status: HTTPStatus, data: object, headers: dict[str, str] | None = None) -> None:
+        """Send a JSON response."""
+        self._send_body(status, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json", headers)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        """Send an error as a JSON response."""
+        self._send_json(status, {"error": message})
+
+    def _send_body(self, status: HTTPStatus, body: bytes, content_type: str,
+                   headers: dict[str, str] | None = None) -> None:
+        """Send a complete response."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server handing requests to a TranslationService."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: TranslationService) -> None:
+        """Bind the server.
+
+        Args:
+            address: Host and port to listen on, port 0 picks a free port
+            service: Service running the jobs
+
+        """
+        super().__init__(address, ServiceRequestHandler)
+        self.service = service
+
+def parse_service_address(value: str) -> tuple[str, int]:
+    """Split a HOST:PORT service address.
+
+    Args:
+        value: Address such as 127.0.0.1:8765, :8765 or 8765
+
+    Returns:
+        Tuple of (host, port), the host defaults to 127.0.0.1
+
+    Raises:
+        ValueError: If the port is not a number
+
+    """
+    host, _, port = value.rpartition(":")
+    return host or DEFAULT_SERVICE_ADDRESS.rpartition(":")[0], int(port)
+
+def safe_filename(name: str) -> str:
+    """Reduce a client-supplied file name to a basename that is safe in paths and HTTP headers.
+
+    Args:
+        name: File name or path
+
+    Returns:
+        Basename with every run of characters other than ASCII letters, digits, dots, underscores and hyphens
+        replaced by an underscore, without leading dots; empty if nothing is left
+
+    """
+    return UNSAFE_FILENAME_PATTERN.sub("_", os.path.basename(name.replace("\\", "/"))).lstrip(".")
+
+def _parse_bool(value: object) -> bool:
+    """Read a boolean option given as a JSON value or a query string."""
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_VALUES
+    return bool(value)
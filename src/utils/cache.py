@@ -0,0 +1,219 @@
+"""Persistent translation memory backed by SQLite."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Self
+
+DEFAULT_CACHE_MAX_MB = 256
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "pdf-translator",
+)
+DEFAULT_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, "translation_memory.sqlite3")
+EVICTION_TARGET_RATIO = 0.9
+CACHE_TIMEOUT = 30.0
+# Cache hits are written back in batches of this many last-used times
+LAST_USED_FLUSH_ENTRIES = 256
+
+
+def normalize_segment(text: str) -> str:
+    """Collapse whitespace so that layout-only differences share a cache entry.
+
+    Args:
+        text: Source segment
+
+    Returns:
+        Normalized segment
+
+    """
+    return " ".join(text.split())
+
+def segment_key(text: str, src_lang: str, tgt_lang: str, backend: str) -> str:
+    """Build the cache key for a source segment.
+
+    Args:
+        text: Source segment
+        src_lang: Source language code
+        tgt_lang: Target language code
+        backend: Name of the translation backend
+
+    Returns:
+        Hex digest identifying the segment and language pair
+
+    """
+    digest = hashlib.sha256()
+    for part in (normalize_segment(text), src_lang, tgt_lang, backend):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+class TranslationMemory:
+    """On-disk cache of translated segments with size-based LRU eviction.
+
+    The memory is safe to share between threads, and between processes using
+    the same file. Entries are evicted least recently used first once the
+    stored text exceeds max_bytes. The stored size is kept in the database, so
+    every process sees the entries added by the others. Cache hits only record
+    their last-used time in memory, and the times are written back in batches,
+    before every write and when the memory is closed.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024) -> None:
+        """Open or create the translation memory.
+
+        Args:
+            path: Path to the SQLite database file
+            max_bytes: Maximum size of the stored source and translated text
+
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._last_used: dict[str, float] = {}
+        self._conn = sqlite3.connect(path, timeout=CACHE_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._write():
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                "key TEXT PRIMARY KEY, translation TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS segments_last_used ON segments (last_used)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS totals (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._conn.execute("INSERT OR IGNORE INTO totals (name, value) "
+                               "SELECT 'bytes', COALESCE(SUM(size), 0) FROM segments")
+
+    @contextmanager
+    def _write(self) -> Iterator[None]:
+        """Run statements in one write transaction, waiting up to CACHE_TIMEOUT for other writers."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.rollback()
+            raise
+        self._conn.commit()
+
+    def get(self, text: str, src_lang: str, tgt_lang: str, backend: str) -> str | None:
+        """Look up the translation of a segment.
+
+        Args:
+            text: Source segment
+            src_lang: Source language code
+            tgt_lang: Target language code
+            backend: Name of the translation backend
+
+        Returns:
+            Cached translation or None if the segment is not in the memory
+
+        """
+        key = segment_key(text, src_lang, tgt_lang, backend)
+        with self._lock:
+            row = self._conn.execute("SELECT translation FROM segments WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._last_used[key] = time.time()
+            if len(self._last_used) >= LAST_USED_FLUSH_ENTRIES:
+                with self._write():
+                    self._write_last_used()
+            return row[0]
+
+    def _write_last_used(self) -> None:
+        """Write the last-used times of the cache hits since the previous write."""
+        if self._last_used:
+            self._conn.executemany("UPDATE segments SET last_used = ? WHERE key = ?",
+                                   [(used, key) for key, used in self._last_used.items()])
+            self._last_used.clear()
+
+    def put(self, text: str, src_lang: str, tgt_lang: str, backend: str, translation: str) -> None:
+        """Store the translation of a segment, evicting old entries if the memory is full.
+
+        Args:
+            text: Source segment
+            src_lang: Source language code
+            tgt_lang: Target language code
+            backend: Name of the translation backend
+            translation: Translated segment
+
+        """
+        key = segment_key(text, src_lang, tgt_lang, backend)
+        size = len(text.encode("utf-8")) + len(translation.encode("utf-8"))
+        with self._lock, self._write():
+            self._write_last_used()
+            previous = self._conn.execute("SELECT size FROM segments WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO segments (key, translation, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, translation, size, time.time()))
+            total_bytes = self._add_bytes(size - (previous[0] if previous else 0))
+            if total_bytes > self.max_bytes:
+                self._evict(total_bytes, int(self.max_bytes * EVICTION_TARGET_RATIO))
+
+    def _add_bytes(self, delta: int) -> int:
+        """Update the stored size shared by every process and get the new size."""
+        self._conn.execute("UPDATE totals SET value = value + ? WHERE name = 'bytes'", (delta,))
+        return self._conn.execute("SELECT value FROM totals WHERE name = 'bytes'").fetchone()[0]
+
+    def _evict(self, total_bytes: int, target_bytes: int) -> None:
+        """Delete least recently used entries until the stored size is below target_bytes.
+
+        Args:
+            total_bytes: Current stored size
+            target_bytes: Stored size to shrink to
+
+        """
+        rows = self._conn.execute("SELECT key, size FROM segments ORDER BY last_used")
+        evicted: list[tuple[str]] = []
+        freed = 0
+        for key, size in rows:
+            if total_bytes - freed <= target_bytes:
+                break
+            evicted.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM segments WHERE key = ?", evicted)
+        self._add_bytes(-freed)
+
+    def clear(self) -> None:
+        """Remove every entry from the memory."""
+        with self._lock:
+            with self._write():
+                self._conn.execute("DELETE FROM segments")
+                self._conn.execute("UPDATE totals SET value = 0 WHERE name = 'bytes'")
+            self._last_used.clear()
+            self._conn.execute("VACUUM")
+
+    def stats(self) -> dict[str, int]:
+        """Get hit/miss counters and storage statistics.
+
+        Returns:
+            Dictionary with hits, misses, entries and bytes
+
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+            stored = self._conn.execute("SELECT value FROM totals WHERE name = 'bytes'").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": stored}
+
+    def close(self) -> None:
+        """Write the pending last-used times and close the underlying database connection."""
+        with self._lock:
+            if self._last_used:
+                with self._write():
+                    self._write_last_used()
+            self._conn.close()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the memory when leaving the runtime context."""
+        self.close()
@@ -0,0 +1,253 @@
+"""Job manifests and page indexes that let runs reuse pages translated earlier."""
+
+import hashlib
+import json
+import os
+from collections.abc import Iterable, Iterator
+from typing import IO, Self
+
+MANIFEST_SUFFIX = ".job.jsonl"
+MANIFEST_VERSION = 3
+PAGE_INDEX_SUFFIX = ".pages.json"
+PAGE_INDEX_VERSION = 1
+# Hex digits of the output path hash in the page index names of a batch
+PAGE_INDEX_KEY_CHARS = 12
+
+
+def manifest_path_for(output_base_path: str) -> str:
+    """Get the manifest path kept alongside the outputs of a translation job.
+
+    Args:
+        output_base_path: Output file path without extension
+
+    Returns:
+        Manifest file path
+
+    """
+    return f"{output_base_path}{MANIFEST_SUFFIX}"
+
+def language_page_index_path(path: str, tgt_lang: str) -> str:
+    """Get the page index of one target language of a document.
+
+    The language is inserted even for a single target language, so a run
+    into one language and a run into several find each other's indexes.
+
+    Args:
+        path: Page index file path given for the document
+        tgt_lang: Target language code
+
+    Returns:
+        Page index file path with the language inserted before the extension, e.g. manual.pages.fr.json
+
+    """
+    base, ext = os.path.splitext(path)
+    return f"{base}.{tgt_lang}{ext}"
+
+def page_index_path_in(directory: str, output_base_path: str) -> str:
+    """Get the page index path of a document in a directory of page indexes.
+
+    The file is named after the output and a short hash of its full path, so
+    documents of the same name in different directories keep separate indexes.
+
+    Args:
+        directory: Directory holding the page indexes of a batch
+        output_base_path: Output file path without extension
+
+    Returns:
+        Page index file path
+
+    """
+    key = hashlib.sha256(os.path.normcase(os.path.abspath(output_base_path)).encode("utf-8")).hexdigest()
+    return os.path.join(directory,
+                        f"{os.path.basename(output_base_path)}.{key[:PAGE_INDEX_KEY_CHARS]}{PAGE_INDEX_SUFFIX}")
+
+def page_fingerprint(text: str) -> str:
+    """Fingerprint the content of a page.
+
+    Args:
+        text: Page text
+
+    Returns:
+        Hex digest of the text
+
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def describe_job(pdf_path: str, settings: dict[str, object]) -> dict[str, object]:
+    """Describe a translation job so that a manifest is only reused for the same work.
+
+    Args:
+        pdf_path: Path to the source PDF file
+        settings: Options that change the translated pages, e.g. languages and cleaning
+
+    Returns:
+        JSON-serializable job description
+
+    """
+    stat = os.stat(pdf_path)
+    return {"pdf": os.path.abspath(pdf_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+            "settings": settings}
+
+def load_page_index(path: str, settings: dict[str, object]) -> dict[str, str]:
+    """Load the translations recorded by the last completed run of a document.
+
+    Args:
+        path: Page index file path
+        settings: Options of the current run, the index is ignored if they differ
+
+    Returns:
+        Translated page text by page fingerprint, empty if there is no usable index
+
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != PAGE_INDEX_VERSION or index.get("settings") != settings:
+            return {}
+        return {page["fingerprint"]: page["text"] for page in index["pages"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+def save_page_index(path: str, settings: dict[str, object], pages: Iterable[tuple[str, str]]) -> None:
+    """Save the page fingerprints and translations of a completed run.
+
+    Args:
+        path: Page index file path
+        settings: Options of the run
+        pages: Stream of (fingerprint, translated text) pairs, in page order
+
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(f'{{"version": {PAGE_INDEX_VERSION}, "settings": {json.dumps(settings)}, "pages": [')
+        f.writelines(("" if index == 0 else ", ") + json.dumps({"fingerprint": fingerprint, "text": text},
+                                                               ensure_ascii=False)
+                     for index, (fingerprint, text) in enumerate(pages))
+        f.write("]}")
+    os.replace(temp_path, path)
+
+class JobManifest:
+    """Append-only JSON Lines record of the pages translated so far.
+
+    The first line describes the job and the chosen output files, every further
+    line holds one translated page and the fingerprint of its source text.
+    Each line is flushed as soon as it is written, so at most the page being
+    written is lost when the process dies. Only the pages loaded from an
+    earlier run are held in memory, pages recorded by this run stay on disk.
+    """
+
+    def __init__(self, path: str, job: dict[str, object]) -> None:
+        """Create a manifest handle without touching the file.
+
+        Args:
+            path: Manifest file path
+            job: Job description from describe_job
+
+        """
+        self.path = path
+        self.job = job
+        self.output_paths: dict[str, str] = {}
+        self.completed: dict[int, str] = {}
+        self.fingerprints: dict[int, str] = {}
+        self._file: IO[str] | None = None
+
+    def exists(self) -> bool:
+        """Whether a manifest file is present."""
+        return os.path.exists(self.path)
+
+    def load(self) -> bool:
+        """Read the pages recorded by an earlier run of the same job.
+
+        A truncated last line, left by a crash during a write, is ignored.
+
+        Returns:
+            True if the manifest belongs to this job, False if it is missing, unreadable or for other work
+
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header.get("version") != MANIFEST_VERSION or header.get("job") != self.job:
+                    return False
+                completed, fingerprints = {}, {}
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    completed[record["page"]] = record["text"]
+                    fingerprints[record["page"]] = record["fingerprint"]
+        except (OSError, ValueError, KeyError):
+            return False
+        self.output_paths = header["output_paths"]
+        self.completed = completed
+        self.fingerprints = fingerprints
+        return True
+
+    def start(self, output_paths: dict[str, str]) -> None:
+        """Rewrite the manifest with the pages recorded so far and open it for appending.
+
+        Args:
+            output_paths: Output file of each format
+
+        """
+        self.output_paths = output_paths
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": MANIFEST_VERSION, "job": self.job, "output_paths": output_paths}) + "\n")
+            f.writelines(self._format_record(page, text, self.fingerprints[page])
+                         for page, text in sorted(self.completed.items()))
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+
+    @staticmethod
+    def _format_record(page: int, text: str, fingerprint: str) -> str:
+        """Format one page record as a JSON line."""
+        return json.dumps({"page": page, "fingerprint": fingerprint, "text": text}, ensure_ascii=False) + "\n"
+
+    def record(self, page: int, text: str, fingerprint: str) -> None:
+        """Record a translated page.
+
+        Args:
+            page: Zero-based page number
+            text: Translated page text
+            fingerprint: Fingerprint of the source page text
+
+        """
+        self.fingerprints[page] = fingerprint
+        if self._file:
+            self._file.write(self._format_record(page, text, fingerprint))
+            self._file.flush()
+
+    def iter_pages(self) -> Iterator[tuple[int, str, str]]:
+        """Read back every page recorded in the manifest file, without holding them in memory.
+
+        Yields:
+            Tuple of (page number, fingerprint, translated text), in the order the pages were recorded
+
+        """
+        with open(self.path, encoding="utf-8") as f:
+            f.readline()
+            for line in f:
+                record = json.loads(line)
+                yield record["page"], record["fingerprint"], record["text"]
+
+    def close(self) -> None:
+        """Close the manifest file, keeping it on disk."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Close and delete the manifest once the job is complete."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the manifest when leaving the runtime context."""
+        self.close()
@@ -0,0 +1,143 @@
+"""Split text into translation-sized chunks on natural boundaries."""
+
+import re
+
+MAX_CHUNK_CHARS = 4800
+# Marks a boundary that chunks never span, e.g. around a running header. It is
+# whitespace to str.strip(), so it is never sent to the translator.
+SEGMENT_SEPARATOR = "\x1e"
+
+SEGMENT_PATTERN = re.compile(f"({SEGMENT_SEPARATOR})")
+PARAGRAPH_PATTERN = re.compile(r"(\n[ \t]*\n\s*)")
+SENTENCE_PATTERN = re.compile(r"((?<=[.!?;:\u3002\uff01\uff1f])\s+)")
+WHITESPACE_PATTERN = re.compile(r"(\s+)")
+
+
+def _split_keeping_separators(text: str, pattern: re.Pattern[str]) -> list[str]:
+    """Split text on a pattern, attaching each separator to the preceding piece.
+
+    Args:
+        text: Text to split
+        pattern: Compiled pattern with a single capturing group for the separator
+
+    Returns:
+        List of pieces whose concatenation equals the input text
+
+    """
+    parts = pattern.split(text)
+    pieces = ["".join(parts[i:i + 2]) for i in range(0, len(parts), 2)]
+    return [piece for piece in pieces if piece]
+
+def _split_on_words(text: str, max_chars: int) -> list[str]:
+    """Split text on whitespace, hard-cutting words longer than max_chars.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum segment length
+
+    Returns:
+        List of segments whose concatenation equals the input text
+
+    """
+    segments: list[str] = []
+    for word in _split_keeping_separators(text, WHITESPACE_PATTERN):
+        segments.extend(word[i:i + max_chars] for i in range(0, len(word), max_chars))
+    return pack_segments(segments, max_chars)
+
+def split_into_segments(text: str, max_chars: int = MAX_CHUNK_CHARS) -> list[str]:
+    """Split text into segments no longer than max_chars.
+
+    Paragraph boundaries are preferred, then sentence boundaries, then
+    whitespace. Only text without any usable boundary is cut mid-word.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum segment length
+
+    Returns:
+        List of segments whose concatenation equals the input text
+
+    """
+    segments: list[str] = []
+    for paragraph in _split_keeping_separators(text, PARAGRAPH_PATTERN):
+        if len(paragraph) <= max_chars:
+            segments.append(paragraph)
+            continue
+        for sentence in _split_keeping_separators(paragraph, SENTENCE_PATTERN):
+            if len(sentence) <= max_chars:
+                segments.append(sentence)
+                continue
+            segments.extend(_split_on_words(sentence, max_chars))
+    return segments
+
+def pack_segments(segments: list[str], max_chars: int = MAX_CHUNK_CHARS) -> list[str]:
+    """Greedily merge consecutive segments into chunks close to max_chars.
+
+    Args:
+        segments: Segments no longer than max_chars each
+        max_chars: Maximum chunk length
+
+    Returns:
+        List of chunks whose concatenation equals the concatenated segments
+
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    current_len = 0
+    for segment in segments:
+        if current and current_len + len(segment) > max_chars:
+            chunks.append("".join(current))
+            current, current_len = [], 0
+        current.append(segment)
+        current_len += len(segment)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+def _chunk_segment(text: str, max_chars: int) -> list[str]:
+    """Split text without segment separators into as few chunks as possible.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum chunk length
+
+    Returns:
+        List of chunks whose concatenation equals the input text
+
+    """
+    if len(text) <= max_chars:
+        return [text] if text else []
+    return pack_segments(split_into_segments(text, max_chars), max_chars)
+
+def chunk_text(text: str, max_chars: int = MAX_CHUNK_CHARS) -> list[str]:
+    """Split text into as few chunks as possible, each at most max_chars long.
+
+    Text separated by SEGMENT_SEPARATOR is never packed into the same chunk.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum chunk length
+
+    Returns:
+        List of chunks whose concatenation equals the input text
+
+    """
+    if SEGMENT_SEPARATOR not in text:
+        return _chunk_segment(text, max_chars)
+    return [chunk for part in _split_keeping_separators(text, SEGMENT_PATTERN) for chunk in _chunk_segment(part, max_chars)]
+
+def split_surrounding_whitespace(chunk: str) -> tuple[str, str, str]:
+    """Separate leading and trailing whitespace from a chunk.
+
+    Args:
+        chunk: Chunk of text
+
+    Returns:
+        Tuple of (leading whitespace, stripped body, trailing whitespace)
+
+    """
+    body = chunk.strip()
+    if not body:
+        return chunk, "", ""
+    start = chunk.index(body)
+    return chunk[:start], body, chunk[start + len(body):]
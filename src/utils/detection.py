@@ -0,0 +1,90 @@
+"""Bounded, deterministic language detection."""
+
+import functools
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langdetect.detector_factory import DetectorFactory
+
+DETECTION_SEED = 0
+DETECTION_SAMPLE_CHARS = 5000
+DETECTION_SAMPLE_PAGES = 8
+PAGE_DETECTION_CHARS = 1000
+
+
+@functools.cache
+def get_detector_factory() -> "DetectorFactory":
+    """Get the shared detector factory, loading langdetect and its language profiles on first use.
+
+    The factory is seeded, so the same text always yields the same language.
+
+    Returns:
+        Detector factory
+
+    """
+    from langdetect.detector_factory import PROFILES_DIRECTORY, DetectorFactory
+
+    factory = DetectorFactory()
+    factory.load_profile(PROFILES_DIRECTORY)
+    factory.set_seed(DETECTION_SEED)
+    return factory
+
+def sample_page_indices(page_count: int, max_pages: int = DETECTION_SAMPLE_PAGES) -> list[int]:
+    """Pick pages spread evenly over a document.
+
+    Args:
+        page_count: Number of pages in the document
+        max_pages: Maximum number of pages to pick
+
+    Returns:
+        Sorted, distinct page indices
+
+    """
+    if page_count <= max_pages:
+        return list(range(page_count))
+    step = page_count / max_pages
+    return sorted({int(step * i + step / 2) for i in range(max_pages)})
+
+def sample_text(pages: Sequence[str], max_chars: int = DETECTION_SAMPLE_CHARS) -> str:
+    """Build a bounded detection sample from the middle of each page.
+
+    Page edges are skipped where possible because they tend to hold headers,
+    footers and page numbers rather than running text.
+
+    Args:
+        pages: Texts of the sampled pages
+        max_chars: Maximum length of the sample
+
+    Returns:
+        Sample text of at most max_chars characters
+
+    """
+    pages = [page.strip() for page in pages if page.strip()]
+    if not pages:
+        return ""
+    budget = max_chars // len(pages)
+    parts = []
+    for page in pages:
+        start = max(0, (len(page) - budget) // 2)
+        parts.append(page[start:start + budget])
+    return "\n\n".join(parts)
+
+def detect_text_language(text: str, max_chars: int = DETECTION_SAMPLE_CHARS) -> str:
+    """Detect the language of text using at most max_chars characters.
+
+    Args:
+        text: Text to detect language from
+        max_chars: Maximum number of characters to analyze
+
+    Returns:
+        Detected language code, as reported by langdetect
+
+    Raises:
+        LangDetectException: If the text contains no detectable features
+
+    """
+    detector = get_detector_factory().create()
+    detector.set_max_text_length(max_chars)
+    detector.append(text)
+    return detector.detect()
@@ -1,34 +1,83 @@
 """Utility functions for output formatting."""
 
+import html
 from collections.abc import Callable
 
 
-def format_as_text(content: str, title: str | None = None) -> str:
-    """Format content as plain text.
+class StreamFormatter:
+    """Render a document incrementally as a header, body chunks and a footer.
 
-    Args:
-        content: Content to format
-        title: Not used in this format
+    Each body chunk is formatted on its own, so a document can be written as
+    its pages are translated without holding the whole text in memory. The
+    base class renders plain text.
+    """
 
-    Returns:
-        Formatted text
+    def __init__(self, title: str | None = None) -> None:
+        """Create the formatter.
 
-    """
-    return content
+        Args:
+            title: Optional title for formatted output
 
-def format_as_html(content: str, title: str | None = None) -> str:
-    """Format content as HTML.
+        """
+        self.title = title
 
-    Args:
-        content: Content to format
-        title: Optional title for the HTML document
+    def header(self) -> str:
+        """Get the text written before the first chunk.
 
-    Returns:
-        Formatted HTML
+        Returns:
+            Document header
 
-    """
-    title_tag = f"<title>{title}</title>" if title else ""
-    return f"""<!DOCTYPE html>
+        """
+        return ""
+
+    def format_chunk(self, chunk: str) -> str:
+        """Format a piece of the document body.
+
+        Args:
+            chunk: Body text, e.g. one translated page
+
+        Returns:
+            Formatted chunk
+
+        """
+        return chunk
+
+    def footer(self) -> str:
+        """Get the text written after the last chunk.
+
+        Returns:
+            Document footer
+
+        """
+        return ""
+
+    def format(self, content: str) -> str:
+        """Format a whole document at once.
+
+        Args:
+            content: Complete body text
+
+        Returns:
+            Formatted document
+
+        """
+        return f"{self.header()}{self.format_chunk(content)}{self.footer()}"
+
+class TextFormatter(StreamFormatter):
+    """Plain text output, the title is not used."""
+
+class HtmlFormatter(StreamFormatter):
+    """HTML page with the body in a preformatted block."""
+
+    def header(self) -> str:
+        """Get the HTML document head and the opening of the body.
+
+        Returns:
+            Document header
+
+        """
+        title_tag = f"<title>{html.escape(self.title)}</title>" if self.title else ""
+        return f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -49,10 +98,100 @@ def format_as_html(content: str, title: str | None = None) -> str:
     </style>
 </head>
 <body>
-    <pre>{content}</pre>
+    <pre>"""
+
+    def format_chunk(self, chunk: str) -> str:
+        """Escape a piece of the body for HTML.
+
+        Escaping is per character, so chunks can be split anywhere.
+
+        Args:
+            chunk: Body text
+
+        Returns:
+            Escaped chunk
+
+        """
+        return html.escape(chunk, quote=False)
+
+    def footer(self) -> str:
+        """Get the closing of the HTML document.
+
+        Returns:
+            Document footer
+
+        """
+        return """</pre>
 </body>
 </html>"""
 
+class MarkdownFormatter(StreamFormatter):
+    """Markdown document with the body in a fenced code block."""
+
+    def header(self) -> str:
+        """Get the title heading and the opening fence.
+
+        Returns:
+            Document header
+
+        """
+        title_section = f"# {self.title}\n\n" if self.title else ""
+        return f"{title_section}```\n"
+
+    def footer(self) -> str:
+        """Get the closing fence.
+
+        Returns:
+            Document footer
+
+        """
+        return "\n```"
+
+STREAM_FORMATTERS: dict[str, type[StreamFormatter]] = {
+    "txt": TextFormatter,
+    "html": HtmlFormatter,
+    "md": MarkdownFormatter,
+}
+
+def get_stream_formatter(format_type: str, title: str | None = None) -> StreamFormatter:
+    """Get the streaming formatter for the specified format.
+
+    Args:
+        format_type: Format type (txt, html, md)
+        title: Optional title for formatted output
+
+    Returns:
+        Formatter instance, plain text for unknown formats
+
+    """
+    return STREAM_FORMATTERS.get(format_type.lower(), TextFormatter)(title)
+
+def format_as_text(content: str, title: str | None = None) -> str:
+    """Format content as plain text.
+
+    Args:
+        content: Content to format
+        title: Not used in this format
+
+    Returns:
+        Formatted text
+
+    """
+    return TextFormatter(title).format(content)
+
+def format_as_html(content: str, title: str | None = None) -> str:
+    """Format content as HTML.
+
+    Args:
+        content: Content to format
+        title: Optional title for the HTML document
+
+    Returns:
+        Formatted HTML
+
+    """
+    return HtmlFormatter(title).format(content)
+
 def format_as_markdown(content: str, title: str | None = None) -> str:
     """Format content as Markdown.
 
@@ -64,8 +203,7 @@ def format_as_markdown(content: str, title: str | None = None) -> str:
         Formatted Markdown
 
     """
-    title_section = f"# {title}\n\n" if title else ""
-    return f"{title_section}```\n{content}\n```"
+    return MarkdownFormatter(title).format(content)
 
 FormatterType = Callable[[str, str | None], str]
 
@@ -0,0 +1,59 @@
+"""Pooled HTTP sessions shared by translator backends."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from src.utils.metrics import METRICS
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    """HTTP connection pool that counts the connections it opens."""
+
+    def _new_conn(self) -> object:
+        """Open a connection and count it."""
+        METRICS.increment("http_connections_opened")
+        return super()._new_conn()
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS connection pool that counts the connections it opens."""
+
+    def _new_conn(self) -> object:
+        """Open a connection and count it."""
+        METRICS.increment("http_connections_opened")
+        return super()._new_conn()
+
+class PooledAdapter(HTTPAdapter):
+    """Transport adapter whose pools report opened connections to the metrics.
+
+    Together with the http_requests counter this shows how many requests
+    reused a kept-alive connection.
+    """
+
+    def init_poolmanager(self, *args: object, **kwargs: object) -> None:
+        """Create the pool manager with counting connection pools."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+def create_session(pool_size: int) -> requests.Session:
+    """Create a keep-alive session whose connection pool fits the translation concurrency.
+
+    Requests beyond pool_size wait for a free connection instead of opening
+    connections that would be discarded afterwards. The session sends the same
+    default headers as a plain requests.get.
+
+    Args:
+        pool_size: Maximum number of connections kept open per host
+
+    Returns:
+        HTTP session, safe to share between threads for simple requests
+
+    """
+    session = requests.Session()
+    adapter = PooledAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -4,6 +4,8 @@ import os
 
 from colorama import Fore
 
+STDIO_PATH = "-"
+
 
 def ensure_directory_exists(output_path: str | None) -> None:
     """Create directory if not exists.
@@ -34,24 +36,25 @@ def validate_file_exists(file_path: str, file_type: str = "File") -> bool:
     """Validate that a file exists.
 
     Args:
-        file_path: Path to the file
+        file_path: Path to the file, or - for standard input
         file_type: Type of file for error message
 
     Returns:
-        True if the file exists, False otherwise
+        True if the file exists or is standard input, False otherwise
 
     """
-    if not os.path.exists(file_path):
+    if file_path != STDIO_PATH and not os.path.exists(file_path):
         print(Fore.RED + f"Error: {file_type} {file_path} does not exist.")
         return False
     return True
 
-def handle_file_path_conflict(output_path: str, overwrite: bool = False) -> str:
+def handle_file_path_conflict(output_path: str, *, overwrite: bool = False, interactive: bool = True) -> str:
     """Handle conflict when output file already exists.
 
     Args:
         output_path: Original output path
         overwrite: Whether to overwrite existing file
+        interactive: Whether to ask the user before picking a new file name
 
     Returns:
         Final output path to use
@@ -60,10 +63,11 @@ def handle_file_path_conflict(output_path: str, overwrite: bool = False) -> str:
     if not os.path.exists(output_path) or overwrite:
         return output_path
 
-    overwrite_choice = input(
-        f"\nOutput file already exists:\n{output_path}\n\nOverwrite it? [y/N]: ").strip().lower()
-    if overwrite_choice == "y":
-        return output_path
+    if interactive:
+        overwrite_choice = input(
+            f"\nOutput file already exists:\n{output_path}\n\nOverwrite it? [y/N]: ").strip().lower()
+        if overwrite_choice == "y":
+            return output_path
 
     base, ext = os.path.splitext(output_path)
     counter = 1
@@ -0,0 +1,92 @@
+"""Layout analysis of extracted text blocks, e.g. to find running headers and footers."""
+
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable, Sequence
+
+MARGIN_RATIO = 0.12
+MIN_REPEAT_RATIO = 0.5
+MIN_REPEAT_PAGES = 3
+DIGITS_PATTERN = re.compile(r"\d+")
+
+# Blocks as returned by pymupdf's page.get_text("blocks"): (x0, y0, x1, y1, text, block_no, block_type)
+Block = tuple[float, float, float, float, str, int, int]
+
+
+def block_template(text: str) -> str:
+    """Reduce block text to a template shared by every copy of a running header or footer.
+
+    Whitespace is collapsed and numbers are replaced, so "Page 3 of 10" and
+    "Page 4 of 10" share a template.
+
+    Args:
+        text: Block text
+
+    Returns:
+        Template text
+
+    """
+    return DIGITS_PATTERN.sub("#", " ".join(text.split()))
+
+def margin_of(block: Block, page_height: float) -> str | None:
+    """Get the page margin a block lies in.
+
+    Args:
+        block: Text block
+        page_height: Height of the page
+
+    Returns:
+        "top" or "bottom", or None for blocks in the body of the page
+
+    """
+    if block[3] <= page_height * MARGIN_RATIO:
+        return "top"
+    if block[1] >= page_height * (1 - MARGIN_RATIO):
+        return "bottom"
+    return None
+
+def find_repeated_blocks(pages: Sequence[tuple[Sequence[Block], float]]) -> set[tuple[str, str]]:
+    """Find header and footer blocks that recur across pages.
+
+    Args:
+        pages: Text blocks and height of each sampled page
+
+    Returns:
+        Set of (margin, template) pairs found on at least half of the pages
+
+    """
+    if len(pages) < MIN_REPEAT_PAGES:
+        return set()
+    counts: Counter[tuple[str, str]] = Counter()
+    for blocks, page_height in pages:
+        counts.update({(margin, block_template(block[4])) for block in blocks
+                       if block[6] == 0 and (margin := margin_of(block, page_height)) and block[4].strip()})
+    threshold = max(MIN_REPEAT_PAGES, math.ceil(len(pages) * MIN_REPEAT_RATIO))
+    return {key for key, count in counts.items() if count >= threshold}
+
+def split_repeated_blocks(blocks: Iterable[Block], page_height: float,
+                          repeated: set[tuple[str, str]]) -> tuple[list[str], list[str], list[str]]:
+    """Separate the running headers and footers of a page from its body.
+
+    Args:
+        blocks: Text blocks of the page, in reading order
+        page_height: Height of the page
+        repeated: Recurring (margin, template) pairs from find_repeated_blocks
+
+    Returns:
+        Tuple of (header texts, body texts, footer texts), each in reading order
+
+    """
+    headers: list[str] = []
+    body: list[str] = []
+    footers: list[str] = []
+    for block in blocks:
+        if block[6] != 0:
+            continue
+        margin = margin_of(block, page_height)
+        if margin and (margin, block_template(block[4])) in repeated:
+            (headers if margin == "top" else footers).append(block[4])
+        else:
+            body.append(block[4])
+    return headers, body, footers
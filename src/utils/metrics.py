@@ -0,0 +1,237 @@
+"""Run metrics: per-stage durations, counters and latency histograms."""
+
+import json
+import math
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, math.inf)
+METRICS_PREFIX = "pdf_translator"
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """Create an empty histogram.
+
+        Args:
+            buckets: Sorted upper bounds of the buckets, the last one should be infinity
+
+        """
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value.
+
+        Args:
+            value: Observed value
+
+        """
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def to_dict(self) -> dict:
+        """Get the histogram as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary with count, sum, mean and per-bucket counts
+
+        """
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "buckets": {_format_bound(bound): count for bound, count in zip(self.buckets, self.counts, strict=True)},
+        }
+
+class Metrics:
+    """Thread-safe registry of stage durations, counters and histograms.
+
+    Stage durations accumulate the time spent in each stage. In the streaming
+    pipeline stages overlap, so their sum can exceed the total wall time.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard every recorded value."""
+        with self._lock:
+            self.started = time.perf_counter()
+            self.stages: dict[str, float] = {}
+            self.stage_calls: dict[str, int] = {}
+            self.counters: dict[str, float] = {}
+            self.histograms: dict[str, Histogram] = {}
+
+    def add_stage_time(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage.
+
+        Args:
+            stage: Stage name
+            seconds: Duration to add
+
+        """
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as part of a stage.
+
+        Args:
+            stage: Stage name
+
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(stage, time.perf_counter() - start)
+
+    def increment(self, counter: str, value: float = 1) -> None:
+        """Increase a counter.
+
+        Args:
+            counter: Counter name
+            value: Amount to add
+
+        """
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def observe(self, histogram: str, value: float) -> None:
+        """Record a value in a histogram.
+
+        Args:
+            histogram: Histogram name
+            value: Observed value
+
+        """
+        with self._lock:
+            self.histograms.setdefault(histogram, Histogram()).observe(value)
+
+    def merge(self, data: dict) -> None:
+        """Add stage durations and counters recorded elsewhere, e.g. in a worker process.
+
+        Args:
+            data: Dictionary produced by to_dict
+
+        """
+        with self._lock:
+            for name, stage in data.get("stages", {}).items():
+                self.stages[name] = self.stages.get(name, 0.0) + stage["seconds"]
+                self.stage_calls[name] = self.stage_calls.get(name, 0) + stage["calls"]
+            for name, value in data.get("counters", {}).items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        """Get every metric as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary with wall time, stages, counters and histograms
+
+        """
+        with self._lock:
+            return {
+                "wall_seconds": round(time.perf_counter() - self.started, 6),
+                "stages": {name: {"seconds": round(seconds, 6), "calls": self.stage_calls[name]}
+                           for name, seconds in self.stages.items()},
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            }
+
+    def to_prometheus(self, prefix: str = METRICS_PREFIX) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Args:
+            prefix: Prefix of every metric name
+
+        Returns:
+            Metrics text
+
+        """
+        data = self.to_dict()
+        lines = [
+            f"# HELP {prefix}_wall_seconds Wall time of the run.",
+            f"# TYPE {prefix}_wall_seconds gauge",
+            f"{prefix}_wall_seconds {data['wall_seconds']}",
+            f"# HELP {prefix}_stage_seconds Time spent in each pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds gauge",
+        ]
+        lines.extend(f'{prefix}_stage_seconds{{stage="{name}"}} {stage["seconds"]}'
+                     for name, stage in sorted(data["stages"].items()))
+        for name, value in sorted(data["counters"].items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            for name, histogram in histograms:
+                lines.append(f"# TYPE {prefix}_{name} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts, strict=True):
+                    cumulative += count
+                    lines.append(f'{prefix}_{name}_bucket{{le="{_format_bound(bound)}"}} {cumulative}')
+                lines.append(f"{prefix}_{name}_sum {histogram.sum}")
+                lines.append(f"{prefix}_{name}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str) -> None:
+        """Write every metric to a JSON file.
+
+        Args:
+            path: Output file path
+
+        """
+        _write_atomically(path, json.dumps(self.to_dict(), indent=2) + "\n")
+
+    def write_prometheus(self, path: str) -> None:
+        """Write every metric to a Prometheus text file, e.g. for the node exporter textfile collector.
+
+        Args:
+            path: Output file path
+
+        """
+        _write_atomically(path, self.to_prometheus())
+
+def _format_bound(bound: float) -> str:
+    """Format a histogram bucket bound the way Prometheus expects it.
+
+    Args:
+        bound: Bucket upper bound
+
+    Returns:
+        Formatted bound
+
+    """
+    return "+Inf" if math.isinf(bound) else f"{bound:g}"
+
+def _write_atomically(path: str, content: str) -> None:
+    """Write a file so that readers never see partial content.
+
+    Args:
+        path: Output file path
+        content: File content
+
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+METRICS = Metrics()
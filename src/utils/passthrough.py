@@ -0,0 +1,323 @@
+"""Find the parts of a text that need no translation.
+
+Numbers and symbols, URLs and e-mail addresses, code listings and passages
+already in the target language are returned unchanged by any translator, so
+sending them only costs requests and billed characters.
+"""
+
+import functools
+import re
+from collections import Counter
+
+from src.utils.detection import get_detector_factory, sample_text
+from src.utils.language_map import normalize_language_code
+
+SYMBOLIC = "symbolic"
+URL = "url"
+CODE = "code"
+TARGET_LANGUAGE = "target_language"
+PASSTHROUGH_KINDS = (SYMBOLIC, URL, CODE, TARGET_LANGUAGE)
+PASSTHROUGH_LABELS = {SYMBOLIC: "numbers and symbols", URL: "URLs and e-mail addresses", CODE: "code",
+                      TARGET_LANGUAGE: "already in the target language"}
+TEXT = "text"
+BLANK = "blank"
+
+# Passed-through runs shorter than this are sent along with the text around
+# them, so a page number or a lone URL does not split one request into two.
+MIN_PASSTHROUGH_CHARS = 40
+CODE_MIN_LINES = 2
+# Code tokens per word a code run needs at least. Prose has few: brackets
+# of enumerations and trailing semicolons are not counted as tokens.
+CODE_MIN_TOKEN_RATIO = 0.25
+TARGET_LANGUAGE_MIN_CHARS = 80
+TARGET_LANGUAGE_PASSAGE_CHARS = 1000
+TARGET_LANGUAGE_SAMPLE_CHARS = 200
+TARGET_LANGUAGE_MIN_PROBABILITY = 0.95
+TARGET_LANGUAGE_TRIALS = 3
+# Letters a language profile uses less often than this are foreign to it,
+# e.g. umlauts or Cyrillic for English.
+ALPHABET_MIN_FREQUENCY = 1e-5
+MAX_FOREIGN_LETTER_RATIO = 0.005
+UPPERCASE_WORD_MIN_LETTERS = 4
+
+LETTERS_PATTERN = re.compile(r"[^\W\d_]{3,}")
+LETTER_SPACED_PATTERN = re.compile(r"(?<!\S)[^\W\d_](?: [^\W\d_]){2,}(?!\S)")
+# Scripts written without spaces between words: Thai, Lao, CJK, kana, Hangul
+UNSPACED_SCRIPT_PATTERN = re.compile(r"[\u0e00-\u0eff\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+URL_PATTERN = re.compile(r"(?:\b[a-z][a-z0-9+.-]*://|\bwww\.)\S+|[\w.+-]+@[\w-]+(?:\.[\w-]+)+", re.IGNORECASE)
+CODE_LINE_PATTERN = re.compile(
+    r"[;{}]\s*$"
+    r"|^\s*(?:#include\b|#define\b|#!|//|/\*|import\s+[\w.]+\s*$|from\s+[\w.]+\s+import\b|def\s+\w+\s*\("
+    r"|class\s+\w+\s*[:({]|return\b|(?:public|private|protected|static|void|function|const|let|var)\s+\w)"
+    r"|\b[A-Za-z_][\w.]*\([^()]*\)\s*[:;{]?\s*$"
+    r"|==|!=|&&|\|\||::|\+\+|\+=")
+# Operators, brackets and calls, leaving out gender and plural forms like Pumpe(n)
+CODE_TOKEN_PATTERN = re.compile(r"[{}\[\]<>=]|\b[A-Za-z_][\w.]*\((?![^\W\d_]{1,3}\))|::|->|&&|\|\||\+\+")
+IDENTIFIER_PATTERN = re.compile(r"[^\W\d]\w*")
+SENTENCE_END_PATTERN = re.compile(r"[.!?:;\u3002\uff01\uff1f]\s*$")
+
+
+def has_words(text: str) -> bool:
+    """Check whether text contains natural-language words.
+
+    A word is three or more letters, or a heading spelled with spaced
+    letters. Upper-case letters next to digits, like part numbers and
+    standards (ABC-1234, DIN 912), and short upper-case abbreviations do not
+    count. Any letter of a script written without spaces counts.
+
+    Args:
+        text: Text to check
+
+    Returns:
+        True if the text contains at least one word
+
+    """
+    if UNSPACED_SCRIPT_PATTERN.search(text) or LETTER_SPACED_PATTERN.search(text):
+        return True
+    for match in LETTERS_PATTERN.finditer(text):
+        letters = match.group()
+        if not letters.isupper():
+            return True
+        start = text.rfind(" ", 0, match.start()) + 1
+        end = text.find(" ", match.end())
+        token = text[start:] if end < 0 else text[start:end]
+        if len(letters) >= UPPERCASE_WORD_MIN_LETTERS and not any(c.isdigit() for c in token):
+            return True
+    return False
+
+def classify_line(line: str) -> str:
+    """Classify one line of text.
+
+    Args:
+        line: Line of text
+
+    Returns:
+        BLANK, SYMBOLIC (no words), URL (no words besides URLs and e-mail
+        addresses), CODE (looks like source code, to be confirmed by its
+        neighbours) or TEXT
+
+    """
+    body = line.strip()
+    if not body:
+        return BLANK
+    remainder, urls = URL_PATTERN.subn(" ", body)
+    if not has_words(remainder):
+        return URL if urls else SYMBOLIC
+    return CODE if CODE_LINE_PATTERN.search(body) else TEXT
+
+def _code_run_end(kinds: list[str], start: int) -> tuple[int, int]:
+    """Find the end of the code-like run starting at a line.
+
+    The run extends over code-like and symbolic lines and the blank lines
+    between them, up to the last non-blank one.
+
+    Args:
+        kinds: Kind of each line
+        start: Index of the first, code-like, line of the run
+
+    Returns:
+        Index after the last line of the run and number of code-like lines in it
+
+    """
+    end = start
+    code_lines = 0
+    for index in range(start, len(kinds)):
+        if kinds[index] in (CODE, SYMBOLIC):
+            code_lines += kinds[index] == CODE
+            end = index + 1
+        elif kinds[index] != BLANK:
+            break
+    return end, code_lines
+
+def _is_code_run(lines: list[str]) -> bool:
+    """Check whether a run of code-like lines shows the structure of code.
+
+    Line endings and first words alone also occur in prose, e.g. legal
+    enumerations ending with semicolons. A run is code only if its lines are
+    indented to different depths or its braces balance, and it has at least
+    CODE_MIN_TOKEN_RATIO code tokens per word.
+
+    Args:
+        lines: Lines of the run
+
+    Returns:
+        True if the run is code
+
+    """
+    body = [line.rstrip() for line in lines if line.strip()]
+    indents = {len(line) - len(line.lstrip()) for line in body}
+    text = "\n".join(body)
+    opening = text.count("{")
+    if len(indents) == 1 and not (opening and opening == text.count("}")):
+        return False
+    words = len(IDENTIFIER_PATTERN.findall(text))
+    return len(CODE_TOKEN_PATTERN.findall(text)) >= CODE_MIN_TOKEN_RATIO * max(words, 1)
+
+def _confirm_code(kinds: list[str], lines: list[str]) -> None:
+    """Mark runs of at least CODE_MIN_LINES code-like lines as code, in place.
+
+    Runs without the structure of code and other code-like lines are marked
+    as text.
+    """
+    start = 0
+    while start < len(kinds):
+        if kinds[start] != CODE:
+            start += 1
+            continue
+        end, code_lines = _code_run_end(kinds, start)
+        if code_lines >= CODE_MIN_LINES and _is_code_run(lines[start:end]):
+            kinds[start:end] = [CODE] * (end - start)
+        else:
+            kinds[start:end] = [TEXT if kind == CODE else kind for kind in kinds[start:end]]
+        start = end
+
+def _group_lines(text: str) -> list[list[str]]:
+    """Split text into runs of consecutive lines of the same kind, as [kind, text] pairs.
+
+    Code-like lines only count as code in runs that _is_code_run confirms,
+    together with the blank and symbolic lines between and after them, such
+    as closing braces. Blank lines join the run before them.
+    """
+    lines = text.splitlines(keepends=True)
+    kinds = [classify_line(line) for line in lines]
+    _confirm_code(kinds, lines)
+
+    runs: list[list[str]] = []
+    for line_kind, line in zip(kinds, lines, strict=True):
+        kind = runs[-1][0] if line_kind == BLANK and runs else line_kind
+        if runs and runs[-1][0] == kind:
+            runs[-1][1] += line
+        else:
+            runs.append([kind, line])
+    if runs and runs[0][0] == BLANK:
+        if len(runs) > 1:
+            runs[1][1] = runs.pop(0)[1] + runs[0][1]
+        else:
+            runs[0][0] = TEXT
+    return runs
+
+def _merge_short_runs(runs: list[list[str]]) -> list[list[str]]:
+    """Send passed-through runs shorter than MIN_PASSTHROUGH_CHARS along with the text around them.
+
+    Runs at the start or end of the text only need text on their one side,
+    so short words like "Ja" or "z. B." on the first or last line of a page
+    are translated too.
+    """
+    for index in range(len(runs)):
+        neighbours = [runs[other][0] for other in (index - 1, index + 1) if 0 <= other < len(runs)]
+        if (runs[index][0] != TEXT and len(runs[index][1].strip()) < MIN_PASSTHROUGH_CHARS
+                and neighbours and all(kind == TEXT for kind in neighbours)):
+            runs[index][0] = TEXT
+    merged: list[list[str]] = []
+    for kind, text in runs:
+        if merged and merged[-1][0] == kind:
+            merged[-1][1] += text
+        else:
+            merged.append([kind, text])
+    return merged
+
+@functools.cache
+def foreign_letters(lang: str) -> frozenset[str] | None:
+    """Get the letters known to language detection that a language does not use.
+
+    Scripts written without spaces are left out, since langdetect folds their
+    characters into classes whose profile frequencies say little about the
+    language.
+
+    Args:
+        lang: Normalized language code
+
+    Returns:
+        Letters, normalized like langdetect does, or None if the language cannot be detected
+
+    """
+    factory = get_detector_factory()
+    columns = [index for index, code in enumerate(factory.langlist) if normalize_language_code(code) == lang]
+    if not columns:
+        return None
+    return frozenset(gram for gram, probs in factory.word_lang_prob_map.items()
+                     if len(gram) == 1 and not UNSPACED_SCRIPT_PATTERN.match(gram)
+                     and max(probs[index] for index in columns) < ALPHABET_MIN_FREQUENCY)
+
+@functools.cache
+def _normalize_letter(letter: str) -> str:
+    """Normalize a letter like langdetect does, e.g. mapping CJK ideographs to representatives."""
+    from langdetect.utils.ngram import NGram
+
+    return NGram.normalize(letter)
+
+def is_in_language(text: str, lang: str) -> bool:
+    """Check with high confidence whether text is written in a language.
+
+    Text with more than a few letters foreign to the language, such as
+    umlauts for English, is rejected without running the detector.
+
+    Args:
+        text: Text to check, long enough for detection
+        lang: Normalized language code
+
+    Returns:
+        True if the text is detected as lang with at least TARGET_LANGUAGE_MIN_PROBABILITY
+
+    """
+    from langdetect.lang_detect_exception import LangDetectException
+
+    foreign = foreign_letters(lang)
+    if foreign is None:
+        return False
+    counts = [(count, _normalize_letter(char) in foreign) for char, count in Counter(text).items() if char.isalpha()]
+    if sum(count for count, is_foreign in counts if is_foreign) > MAX_FOREIGN_LETTER_RATIO * sum(c for c, _ in counts):
+        return False
+
+    detector = get_detector_factory().create()
+    detector.n_trial = TARGET_LANGUAGE_TRIALS
+    detector.append(sample_text([text], TARGET_LANGUAGE_SAMPLE_CHARS))
+    try:
+        best = detector.get_probabilities()[0]
+    except (LangDetectException, IndexError):
+        return False
+    return best.prob >= TARGET_LANGUAGE_MIN_PROBABILITY and normalize_language_code(best.lang) == lang
+
+def _split_passages(text: str) -> list[str]:
+    """Split text into passages of about TARGET_LANGUAGE_PASSAGE_CHARS ending with a sentence, for detection."""
+    passages: list[str] = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        current += line
+        if len(current) >= TARGET_LANGUAGE_PASSAGE_CHARS and SENTENCE_END_PATTERN.search(line):
+            passages.append(current)
+            current = ""
+    if current:
+        passages.append(current)
+    return passages
+
+def split_passthrough(text: str, tgt_lang: str) -> list[tuple[str, str]]:
+    """Split text into runs to translate and runs to pass through unchanged.
+
+    Lines without words, lines holding only URLs and e-mail addresses, and
+    code listings are passed through. The remaining text is checked for the
+    target language passage by passage, and passages detected in it with
+    high confidence are passed through as well.
+
+    Args:
+        text: Text to split
+        tgt_lang: Normalized target language code
+
+    Returns:
+        List of (kind, text) runs whose texts concatenate to the input, kind
+        being TEXT for runs to translate or one of PASSTHROUGH_KINDS
+
+    """
+    runs: list[tuple[str, str]] = []
+    for kind, run in _merge_short_runs(_group_lines(text)):
+        passages = _split_passages(run) if kind == TEXT else [run]
+        for passage in passages:
+            passage_kind = kind
+            if (kind == TEXT and len(passage.strip()) >= TARGET_LANGUAGE_MIN_CHARS
+                    and is_in_language(passage, tgt_lang)):
+                passage_kind = TARGET_LANGUAGE
+            if runs and runs[-1][0] == passage_kind:
+                runs[-1] = (passage_kind, runs[-1][1] + passage)
+            else:
+                runs.append((passage_kind, passage))
+    return runs
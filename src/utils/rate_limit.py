@@ -0,0 +1,247 @@
+"""Asyncio primitives limiting the rate and concurrency of translation requests."""
+
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from src.utils.cache import DEFAULT_CACHE_DIR
+
+DEFAULT_RATE_LIMIT_PATH = os.path.join(DEFAULT_CACHE_DIR, "rate_limit.sqlite3")
+RATE_LIMIT_TIMEOUT = 30.0
+
+
+class TokenBucket:
+    """Token bucket enforcing an average number of requests per second.
+
+    Tokens are taken as soon as they are requested, so a request larger than
+    the bucket waits for its deficit to be refilled instead of forever. A rate
+    of zero or less disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        """Create a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens, defaults to one second worth of tokens
+
+        """
+        self.rate = rate
+        self.capacity = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until the requested number of tokens is available and consume them.
+
+        Args:
+            tokens: Number of tokens to consume
+
+        """
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate) - tokens
+            self._updated = now
+            if self._tokens < 0:
+                await asyncio.sleep(-self._tokens / self.rate)
+
+class RateLimiter:
+    """Request and character rate limits of one process."""
+
+    def __init__(self, requests_per_second: float = 0.0, chars_per_second: float = 0.0) -> None:
+        """Create the limiter.
+
+        Args:
+            requests_per_second: Maximum request rate, zero for no limit
+            chars_per_second: Maximum rate of characters sent, zero for no limit
+
+        """
+        self.requests = TokenBucket(requests_per_second)
+        self.chars = TokenBucket(chars_per_second)
+
+    async def acquire(self, chars: int) -> None:
+        """Wait until a request of the given size may be sent.
+
+        Args:
+            chars: Number of characters sent with the request
+
+        """
+        await self.requests.acquire()
+        await self.chars.acquire(chars)
+
+    def close(self) -> None:
+        """Release the resources of the limiter."""
+
+class SharedRateLimiter:
+    """Request and character rate limits shared by every process on the host.
+
+    The token buckets live in a SQLite database, and each request reserves its
+    tokens in one locked transaction, so processes using the same file share a
+    single quota without any server. Tokens are reserved ahead of time: a
+    process that finds a bucket empty leaves it in deficit and sleeps until its
+    share is refilled, so waiting requests are served in order. Every process
+    should use the same limits.
+    """
+
+    def __init__(self, path: str = DEFAULT_RATE_LIMIT_PATH, requests_per_second: float = 0.0,
+                 chars_per_second: float = 0.0) -> None:
+        """Open or create the shared buckets.
+
+        Args:
+            path: Path to the SQLite database file holding the buckets
+            requests_per_second: Maximum request rate of all processes, zero for no limit
+            chars_per_second: Maximum rate of characters sent by all processes, zero for no limit
+
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.limits = {name: rate for name, rate in (("requests", requests_per_second), ("chars", chars_per_second))
+                       if rate > 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=RATE_LIMIT_TIMEOUT, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+
+    def reserve(self, chars: int) -> float:
+        """Take the tokens of a request from the shared buckets.
+
+        Args:
+            chars: Number of characters sent with the request
+
+        Returns:
+            Seconds to wait before sending the request
+
+        """
+        if not self.limits:
+            return 0.0
+        amounts = {"requests": 1, "chars": chars}
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # The monotonic clock is shared by all processes of the host
+                now = time.monotonic()
+                wait = max(self._take(name, rate, amounts[name], now) for name, rate in self.limits.items())
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def _take(self, name: str, rate: float, amount: float, now: float) -> float:
+        """Refill a bucket, take tokens from it, and get the wait until its deficit is refilled."""
+        capacity = max(1.0, rate)
+        row = self._conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+        tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+        tokens -= amount
+        self._conn.execute("INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                           (name, tokens, now))
+        return max(0.0, -tokens / rate)
+
+    async def acquire(self, chars: int) -> None:
+        """Wait until a request of the given size may be sent.
+
+        Args:
+            chars: Number of characters sent with the request
+
+        """
+        if not self.limits:
+            return
+        wait = await asyncio.get_running_loop().run_in_executor(None, self.reserve, chars)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+def create_rate_limiter(requests_per_second: float = 0.0, chars_per_second: float = 0.0,
+                        path: str | None = None) -> RateLimiter | SharedRateLimiter:
+    """Create the rate limiter of a translation scheduler.
+
+    Args:
+        requests_per_second: Maximum request rate, zero for no limit
+        chars_per_second: Maximum rate of characters sent, zero for no limit
+        path: Database file of limits shared with other processes, None for limits of this process
+
+    Returns:
+        Limiter shared through the database if a path is given and a limit is set, otherwise a limiter of this process
+
+    """
+    if path and (requests_per_second > 0 or chars_per_second > 0):
+        return SharedRateLimiter(path, requests_per_second, chars_per_second)
+    return RateLimiter(requests_per_second, chars_per_second)
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limit adjusted by additive increase, multiplicative decrease.
+
+    The limit is halved whenever the provider signals throttling or a server
+    error, and grows by one after a full window of successful requests, never
+    exceeding the configured ceiling.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1) -> None:
+        """Create a limiter starting at the ceiling.
+
+        Args:
+            maximum: Ceiling for the number of concurrent requests
+            minimum: Floor for the number of concurrent requests
+
+        """
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = self.maximum
+        self.active = 0
+        self.throttled = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        """Wait for a free request slot."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Release the request slot."""
+        async with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Record a successful request, growing the limit after a full window of successes."""
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self._successes = 0
+
+    def on_throttle(self) -> None:
+        """Record a throttled or failed request, halving the limit."""
+        self.throttled += 1
+        self._successes = 0
+        self.limit = max(self.minimum, self.limit // 2)
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Get a jittered exponential backoff delay.
+
+    The delay is drawn uniformly between zero and base * 2 ** attempt, so
+    requests throttled together do not retry together.
+
+    Args:
+        attempt: Zero-based number of the failed attempt
+        base: Upper bound of the first delay in seconds
+        cap: Largest upper bound in seconds
+
+    Returns:
+        Delay in seconds
+
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))  # noqa: S311
@@ -1,20 +1,213 @@
 """Content transformation functions."""
 
 import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
 
+LETTER = r"[^\W\d_]"
+# A hyphen followed by whitespace holding a line break, which the hyphen rule
+# removes to join the word. The whitespace is taken possessively, so no other
+# pattern can match part of it.
+HYPHEN_BREAK = r"-(?=\s*\n)\s++"
+HYPHEN_BREAK_PATTERN = re.compile(HYPHEN_BREAK)
+# Any number of hyphen breaks, read through as if already removed
+JOIN = rf"(?:{HYPHEN_BREAK})*+"
+# A hyphenated word fragment is at least one letter followed by the hyphen.
+MIN_HYPHENATED_FRAGMENT_CHARS = 2
+
+
+@dataclass(frozen=True)
+class CleaningRule:
+    """A pattern and its replacement, applied by TextCleaner.
+
+    Every match of a rule starts with one of the trigger characters. The
+    pattern matches what follows that character and may look back at it with
+    a lookbehind. Sharing the trigger scan lets all rules run in a single pass.
+    """
+
+    name: str
+    trigger: str
+    pattern: str
+    replacement: str | Callable[[str], str] = ""
+
+def _remove_spaces(text: str) -> str:
+    """Remove every space from text."""
+    return text.replace(" ", "")
+
+def _remove_hyphen_breaks(text: str) -> str:
+    """Remove every hyphen break from text, joining the words around them."""
+    return HYPHEN_BREAK_PATTERN.sub("", text)
+
+def _join_and_remove_spaces(text: str) -> str:
+    """Remove every hyphen break and then every space from text."""
+    return _remove_spaces(_remove_hyphen_breaks(text))
+
+HYPHEN_LINEBREAK_RULE = CleaningRule("hyphen_linebreak", r"\-", r"\s*\n\s*")
+SINGLE_LETTER_SPACING_RULE = CleaningRule(
+    "single_letter_spacing", r"\s\-",
+    rf"(?<=\b{LETTER}[\s\-])(?:(?<=-)\s|(?<!-)){LETTER}(?:-?\s{LETTER})+\b",
+    _remove_spaces,
+)
+# The spacing rule as seen after the hyphen rule: hyphen breaks around the
+# separators are read through and removed with the spaces, and a hyphen is only
+# a separator if no line break follows it.
+JOINED_SINGLE_LETTER_SPACING_RULE = CleaningRule(
+    "joined_single_letter_spacing", r"\s\-",
+    rf"(?<=\b{LETTER}[\s\-])(?:(?<=-)(?:(?=\s*\n)\s++{JOIN}-[^\S\n]|[^\S\n])|(?<!-)){JOIN}{LETTER}"
+    rf"(?:{JOIN}(?:-[^\S\n]|\s){JOIN}{LETTER})+(?!{JOIN}\w)",
+    _join_and_remove_spaces,
+)
+# A line break hyphen after a word, followed by a single letter or by more
+# breaks. The joined fragments and the character after them are taken too:
+# they continue the word before the break, so the spacing rule must not take
+# the single letter as a word of its own.
+JOINED_FRAGMENT_RULE = CleaningRule(
+    "joined_fragment", r"\-",
+    rf"(?<=\w-)(?=\s*\n)\s++(?:(?:\w*{HYPHEN_BREAK})+\w*[\s\-]?|{LETTER}[\s\-])",
+    _remove_hyphen_breaks,
+)
+DEFAULT_RULES = (JOINED_SINGLE_LETTER_SPACING_RULE, JOINED_FRAGMENT_RULE, HYPHEN_LINEBREAK_RULE)
+
+class TextCleaner:
+    """Apply several cleaning rules in a single pass over the text.
+
+    The rules are compiled into one pattern. Where several rules match at the
+    same position, the first rule wins, and text a match covers is not seen by
+    any other rule. Rules meant to run one after another therefore need
+    patterns that account for each other where their matches can overlap, as
+    DEFAULT_RULES does: it gives the same text as joining hyphenated line
+    breaks first and fixing letter spacing afterwards.
+    """
+
+    def __init__(self, rules: Iterable[CleaningRule] = DEFAULT_RULES) -> None:
+        """Compile the rules.
+
+        Args:
+            rules: Rules to apply, in priority order
+
+        """
+        self.rules = tuple(rules)
+        triggers = "".join(rule.trigger for rule in self.rules)
+        branches = "|".join(f"(?<=[{rule.trigger}])(?P<rule{i}>{rule.pattern})" for i, rule in enumerate(self.rules))
+        self._pattern = re.compile(f"[{triggers}](?:{branches})")
+        self._replacements = {f"rule{i}": rule.replacement for i, rule in enumerate(self.rules)}
+
+    def _replace(self, match: re.Match[str]) -> str:
+        """Get the replacement of a match from the rule that produced it."""
+        replacement = self._replacements[match.lastgroup]
+        return replacement if isinstance(replacement, str) else replacement(match.group())
+
+    def clean(self, text: str) -> str:
+        """Apply every rule to text.
+
+        Args:
+            text: Text to clean
+
+        Returns:
+            Cleaned text
+
+        """
+        return self._pattern.sub(self._replace, text)
+
+    def clean_pages(self, pages: Iterable[str]) -> Iterator[str]:
+        """Clean a stream of page texts.
+
+        Args:
+            pages: Stream of page texts
+
+        Yields:
+            Cleaned text of each page
+
+        """
+        stream = PageStreamCleaner(self)
+        for page in pages:
+            yield from stream.feed(page)
+        yield from stream.finish()
+
+class PageStreamCleaner:
+    """Clean pages one at a time, joining words hyphenated across a page break.
+
+    A word fragment ending in a hyphen at the end of a page is moved to the
+    start of the next page, so the word is rebuilt and translated as a whole.
+    The page that lost the fragment is held back until the next page arrives,
+    in case it turns out to be the last one.
+    """
+
+    def __init__(self, cleaner: TextCleaner) -> None:
+        """Create the stream.
+
+        Args:
+            cleaner: Cleaner applied to every page
+
+        """
+        self.cleaner = cleaner
+        self._carry = ""
+        self._held: str | None = None
+
+    def feed(self, page: str) -> list[str]:
+        """Clean the next page.
+
+        Args:
+            page: Page text
+
+        Returns:
+            Cleaned pages that are complete, zero to two: the page held back by
+            the previous call, then this page unless it is held back in turn
+
+        """
+        text = self._carry + page
+        head, self._carry = split_hyphenated_tail(text)
+        completed = [] if self._held is None else [self._held]
+        self._held = None
+        cleaned = self.cleaner.clean(head)
+        if self._carry:
+            self._held = cleaned
+        else:
+            completed.append(cleaned)
+        return completed
+
+    def finish(self) -> list[str]:
+        """Complete the stream after the last page.
+
+        Returns:
+            The held back last page, if any
+
+        """
+        completed = [] if self._held is None else [self._held + self.cleaner.clean(self._carry)]
+        self._carry = ""
+        self._held = None
+        return completed
+
+def split_hyphenated_tail(text: str) -> tuple[str, str]:
+    """Split off a trailing word fragment that ends in a hyphen.
+
+    Args:
+        text: Page text
+
+    Returns:
+        Tuple of (text before the fragment, fragment with its trailing whitespace)
+
+    """
+    stripped = text.rstrip()
+    if len(stripped) < MIN_HYPHENATED_FRAGMENT_CHARS or stripped[-1] != "-" or not stripped[-2].isalpha():
+        return text, ""
+    start = len(stripped) - 1
+    while start > 0 and not stripped[start - 1].isspace():
+        start -= 1
+    return text[:start], text[start:]
+
+DEFAULT_CLEANER = TextCleaner()
+_HYPHEN_CLEANER = TextCleaner([HYPHEN_LINEBREAK_RULE])
+_SPACING_CLEANER = TextCleaner([SINGLE_LETTER_SPACING_RULE])
 
 def fix_single_letter_spacing(text: str) -> str:
     """Fix excessive spacing between letters in words."""
-    return re.sub(r"\b(?:[A-ZÄÖÜa-zäöü]-?\s){2,}[A-ZÄÖÜa-zäöü]\b",
-                  lambda m: m.group(0).replace(" ", "").replace("- ", "-"),
-                  text)
+    return _SPACING_CLEANER.clean(text)
 
 def fix_hyphen_linebreaks(text: str) -> str:
     """Merge words split across lines with hyphens."""
-    return re.sub(r"-\s*\n\s*", "", text)
+    return _HYPHEN_CLEANER.clean(text)
 
 def clean_extracted_text(text: str) -> str:
     """Cleanse extracted text by removing unwanted characters and spacing."""
-    text = fix_hyphen_linebreaks(text)
-    text = fix_single_letter_spacing(text)
-    return text
+    return DEFAULT_CLEANER.clean(text)
@@ -0,0 +1,44 @@
+"""Shared fixtures: small PDFs and command line runs with the offline backend."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from pdf_translator import run
+from src.core import options_parser
+
+# Offline, non-interactive options every test run starts from
+OFFLINE_OPTIONS = ["-s", "de", "-b", "offline", "--clean", "-e", "txt", "-f", "--no-cache"]
+
+
+def write_pdf(path: Path, pages: list[str]) -> Path:
+    """Write a PDF with one line of text per page.
+
+    Args:
+        path: Output file path
+        pages: Text of each page
+
+    Returns:
+        Path of the written file
+
+    """
+    with pymupdf.open() as doc:
+        for text in pages:
+            doc.new_page().insert_text((72, 72), text)
+        doc.save(str(path))
+    return path
+
+@pytest.fixture
+def manual_pdf(tmp_path: Path) -> Path:
+    """Three-page German manual in a temporary directory."""
+    return write_pdf(tmp_path / "manual.pdf",
+                     [f"Seite {number} des Handbuchs über die Wartung der Pumpe." for number in range(3)])
+
+@pytest.fixture
+def cli() -> Callable[..., bool]:
+    """Run the command line with the offline backend and return whether it succeeded."""
+    def run_cli(*arguments: str) -> bool:
+        return run(options_parser().parse_args([*OFFLINE_OPTIONS, *arguments]))
+    return run_cli
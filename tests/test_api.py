@@ -0,0 +1,109 @@
+"""Tests for the library API."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from src.api import (
+    BackendError,
+    EmptyDocumentError,
+    ExtractionError,
+    LanguageDetectionError,
+    TranslatedPage,
+    Translator,
+    UnsupportedFormatError,
+)
+from src.backends import OfflineBackend
+from tests.test_core import pseudo
+
+GERMAN_TEXT = ("Die Pumpe muss vor jeder Wartung vom Stromnetz getrennt werden. Danach wird das Gehäuse geöffnet "
+               "und die Dichtung auf Schäden geprüft.")
+
+
+class FailingBackend(OfflineBackend):
+    """Offline backend whose requests fail and which records whether it was closed."""
+
+    def __init__(self) -> None:
+        """Create the backend."""
+        super().__init__()
+        self.closed = False
+
+    def translate_batch(self, texts: list[str], src_lang: str, tgt_lang: str) -> list[str]:
+        """Fail the request."""
+        msg = f"service unavailable for {len(texts)} texts from {src_lang} to {tgt_lang}"
+        raise RuntimeError(msg)
+
+    def close(self) -> None:
+        """Record that the backend was closed."""
+        self.closed = True
+
+@pytest.fixture
+def translator() -> Iterator[Translator]:
+    """Create a translator with the pseudo-translating offline backend."""
+    with Translator("offline", mode="pseudo", max_workers=2) as translator:
+        yield translator
+
+def test_translate_returns_the_pages_without_printing(translator: Translator, manual_pdf: Path,
+                                                      capsys: pytest.CaptureFixture[str]) -> None:
+    """A document is translated page by page into a result, and nothing is printed."""
+    result = translator.translate(str(manual_pdf), tgt_lang="EN", src_lang="de")
+    assert (result.src_lang, result.tgt_lang) == ("de", "en")
+    assert [page.number for page in result.pages] == [0, 1, 2]
+    assert all(isinstance(page, TranslatedPage) and page.text.strip() == pseudo(page.source.text.strip())
+               for page in result.pages)
+    assert result.text == "".join(page.text for page in result.pages)
+    assert capsys.readouterr() == ("", "")
+
+def test_iter_pages_detects_the_source_language(translator: Translator, tmp_path: Path) -> None:
+    """Without a source language, the language of the document is detected."""
+    pdf_path = tmp_path / "german.pdf"
+    with pymupdf.open() as doc:
+        doc.new_page().insert_textbox(pymupdf.Rect(56, 56, 539, 786), GERMAN_TEXT)
+        doc.save(str(pdf_path))
+    assert translator.detect_language(str(pdf_path)) == "de"
+    assert [page.src_lang for page in translator.iter_pages(str(pdf_path), tgt_lang="fr")] == ["de"]
+
+def test_result_is_rendered_and_saved(translator: Translator, manual_pdf: Path, tmp_path: Path) -> None:
+    """A result is rendered in each format and saved in the format of the file extension."""
+    result = translator.translate(str(manual_pdf), src_lang="de")
+    path = result.save(str(tmp_path / "out" / "manual.html"), title="Manual")
+    assert Path(path).read_text(encoding="utf-8") == result.render("html", "Manual")
+    with pytest.raises(UnsupportedFormatError):
+        result.render("pdf")
+
+def test_translate_text(translator: Translator) -> None:
+    """Plain text is translated, detecting its language if not given."""
+    assert translator.translate_text(GERMAN_TEXT) == pseudo(GERMAN_TEXT)
+    with pytest.raises(LanguageDetectionError):
+        translator.translate_text("12345 67890")
+
+def test_unreadable_documents_raise_extraction_errors(translator: Translator, tmp_path: Path) -> None:
+    """Missing, broken and empty PDFs raise library errors instead of printing."""
+    with pytest.raises(ExtractionError, match="not found"):
+        translator.translate(str(tmp_path / "missing.pdf"), src_lang="de")
+    with pytest.raises(ExtractionError):
+        translator.translate(b"not a PDF", src_lang="de")
+    empty = tmp_path / "empty.pdf"
+    with pymupdf.open() as doc:
+        doc.new_page()
+        doc.save(str(empty))
+    with pytest.raises(EmptyDocumentError):
+        translator.translate(str(empty), src_lang="de")
+
+def test_backend_failures_raise_backend_errors(manual_pdf: Path) -> None:
+    """A failing backend raises BackendError with the original error as its cause, and stays open."""
+    backend = FailingBackend()
+    with Translator(backend) as translator:
+        with pytest.raises(BackendError) as raised:
+            translator.translate(str(manual_pdf), src_lang="de")
+        assert isinstance(raised.value.__cause__, RuntimeError)
+    assert not backend.closed
+
+def test_invalid_options_are_rejected() -> None:
+    """An unknown repeated_blocks mode or backend is rejected when the translator is created."""
+    with pytest.raises(ValueError, match="repeated_blocks"):
+        Translator("offline", repeated_blocks="drop")
+    with pytest.raises(ValueError, match="backend"):
+        Translator("unknown")
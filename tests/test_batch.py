@@ -0,0 +1,54 @@
+"""Tests for batch translation of many PDF files."""
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+from src.backends import OfflineBackend
+from src.batch import BatchOptions, expand_pdf_paths, is_batch_input, run_batch
+from src.core import TranslationScheduler
+from tests.conftest import write_pdf
+
+
+def test_directories_and_globs_select_batch_mode(tmp_path: Path) -> None:
+    """Several paths, a directory or a glob pattern run in batch mode, a single file does not."""
+    assert not is_batch_input([str(tmp_path / "manual.pdf")])
+    assert is_batch_input([str(tmp_path / "a.pdf"), str(tmp_path / "b.pdf")])
+    assert is_batch_input([str(tmp_path)])
+    assert is_batch_input([str(tmp_path / "*.pdf")])
+
+def test_expand_pdf_paths_searches_directories_and_removes_duplicates(tmp_path: Path) -> None:
+    """Directories are searched recursively for PDFs of any extension case, each file listed once."""
+    (tmp_path / "sub").mkdir()
+    for name in ("a.pdf", "b.PDF", os.path.join("sub", "c.pdf"), "notes.txt"):
+        (tmp_path / name).write_bytes(b"%PDF-1.7")
+    expected = [str(tmp_path / "a.pdf"), str(tmp_path / "b.PDF"), str(tmp_path / "sub" / "c.pdf")]
+    assert expand_pdf_paths([str(tmp_path)]) == expected
+    assert expand_pdf_paths([str(tmp_path / "a.pdf"), str(tmp_path / "*.pdf")]) == [str(tmp_path / "a.pdf")]
+
+def test_run_batch_translates_every_file_into_every_language(tmp_path: Path) -> None:
+    """Each file and target language gets a result, and a broken file does not stop the others."""
+    pdf_paths = [str(write_pdf(tmp_path / f"manual{index}.pdf", [f"Handbuch {index} über die Wartung der Pumpe."]))
+                 for index in range(2)]
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a PDF")
+    options = BatchOptions("de", ["en", "fr"], ["txt"], overwrite=True)
+    with TranslationScheduler(2, backend=OfflineBackend("pseudo")) as scheduler:
+        results = list(run_batch([*pdf_paths, str(broken)], scheduler, options, document_jobs=2, extract_workers=1))
+
+    outcomes = {(os.path.basename(result.pdf_path), result.tgt_lang): result.succeeded for result in results}
+    assert outcomes == {("manual0.pdf", "en"): True, ("manual0.pdf", "fr"): True,
+                        ("manual1.pdf", "en"): True, ("manual1.pdf", "fr"): True,
+                        ("broken.pdf", "en"): False, ("broken.pdf", "fr"): False}
+    for index in range(2):
+        for tgt_lang in ("en", "fr"):
+            text = (tmp_path / f"manual{index}_de_{tgt_lang}.txt").read_text(encoding="utf-8")
+            assert text.strip()
+            assert "Handbuch" not in text
+
+def test_batch_command_line_writes_an_output_per_file(tmp_path: Path, cli: Callable[..., bool]) -> None:
+    """A directory on the command line translates each PDF in it without prompting."""
+    for index in range(3):
+        write_pdf(tmp_path / f"manual{index}.pdf", [f"Handbuch {index} über die Wartung der Pumpe."])
+    assert cli(str(tmp_path), "-t", "en", "--extract-workers", "1")
+    assert sorted(path.name for path in tmp_path.glob("*.txt")) == [f"manual{index}_de_en.txt" for index in range(3)]
@@ -0,0 +1,68 @@
+"""Tests for the persistent translation memory."""
+
+from pathlib import Path
+
+from src.core import TranslationScheduler
+from src.utils.cache import TranslationMemory
+from tests.test_core import RecordingBackend
+
+SEGMENT = "Die Pumpe wird vor der Wartung abgeschaltet."
+TRANSLATION = "The pump is switched off before maintenance."
+
+
+def entry_size(text: str, translation: str) -> int:
+    """Get the stored size of one entry."""
+    return len(text.encode("utf-8")) + len(translation.encode("utf-8"))
+
+def test_translations_are_kept_per_language_pair_and_backend(tmp_path: Path) -> None:
+    """A segment is found again with its languages and backend, ignoring whitespace differences."""
+    with TranslationMemory(str(tmp_path / "memory.sqlite3")) as memory:
+        memory.put(SEGMENT, "de", "en", "google", TRANSLATION)
+        assert memory.get(SEGMENT, "de", "en", "google") == TRANSLATION
+        assert memory.get(SEGMENT.replace(" ", "\n  "), "de", "en", "google") == TRANSLATION
+        assert memory.get(SEGMENT, "de", "fr", "google") is None
+        assert memory.get(SEGMENT, "de", "en", "offline-identity") is None
+        assert memory.stats() == {"hits": 2, "misses": 2, "entries": 1,
+                                  "bytes": entry_size(SEGMENT, TRANSLATION)}
+
+def test_translations_persist_between_runs(tmp_path: Path) -> None:
+    """A memory reopened from the same file holds the translations stored before."""
+    path = str(tmp_path / "memory.sqlite3")
+    with TranslationMemory(path) as memory:
+        memory.put(SEGMENT, "de", "en", "google", TRANSLATION)
+    with TranslationMemory(path) as memory:
+        assert memory.get(SEGMENT, "de", "en", "google") == TRANSLATION
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    """Once the memory is full, the entries used longest ago go first, down to 90% of the limit."""
+    texts = [f"Segment {index} der Betriebsanleitung" for index in range(5)]
+    with TranslationMemory(str(tmp_path / "memory.sqlite3"), max_bytes=4 * entry_size(texts[0], texts[0])) as memory:
+        for text in texts[:4]:
+            memory.put(text, "de", "en", "google", text)
+        assert memory.get(texts[0], "de", "en", "google") == texts[0]
+        memory.put(texts[4], "de", "en", "google", texts[4])
+        kept = [text for text in texts if memory.get(text, "de", "en", "google") == text]
+        assert kept == [texts[0], texts[3], texts[4]]
+        assert memory.stats()["bytes"] == 3 * entry_size(texts[0], texts[0])
+
+def test_stored_size_is_shared_between_processes(tmp_path: Path) -> None:
+    """Entries added through one connection count towards the size seen by another."""
+    path = str(tmp_path / "memory.sqlite3")
+    with TranslationMemory(path) as first, TranslationMemory(path) as second:
+        first.put(SEGMENT, "de", "en", "google", TRANSLATION)
+        second.put(TRANSLATION, "en", "de", "google", SEGMENT)
+        assert first.stats()["bytes"] == second.stats()["bytes"] == 2 * entry_size(SEGMENT, TRANSLATION)
+        assert second.get(SEGMENT, "de", "en", "google") == TRANSLATION
+
+def test_scheduler_sends_only_segments_missing_from_the_memory(tmp_path: Path) -> None:
+    """A second run over the same pages is answered from the memory without backend calls."""
+    pages = [f"Seite {index} des Handbuchs über die Wartung" for index in range(10)]
+    with TranslationMemory(str(tmp_path / "memory.sqlite3")) as memory:
+        results = []
+        for _ in range(2):
+            backend = RecordingBackend()
+            with TranslationScheduler(4, cache=memory, backend=backend) as scheduler:
+                results.append(list(scheduler.translate_pages(pages, "de", "en")))
+        assert results[0] == results[1]
+        assert backend.batches == []
+        assert memory.stats()["hits"] == len(pages)
@@ -0,0 +1,29 @@
+"""Tests for job manifests and page indexes."""
+
+import os
+from pathlib import Path
+
+from src.utils.checkpoint import PAGE_INDEX_SUFFIX, language_page_index_path, page_index_path_in
+
+
+def test_page_index_path_in_keeps_documents_of_the_same_name_apart(tmp_path: Path) -> None:
+    """Documents with the same file name in different directories get their own page index."""
+    index_dir = str(tmp_path / "indexes")
+    first = page_index_path_in(index_dir, os.path.join(str(tmp_path), "a", "manual_de_en"))
+    second = page_index_path_in(index_dir, os.path.join(str(tmp_path), "b", "manual_de_en"))
+    assert first != second
+    assert os.path.dirname(first) == index_dir
+    assert os.path.basename(first).startswith("manual_de_en.")
+    assert first.endswith(PAGE_INDEX_SUFFIX)
+
+def test_page_index_path_in_is_stable_for_one_document(tmp_path: Path) -> None:
+    """The same document maps to the same page index, however its path is spelled."""
+    index_dir = str(tmp_path / "indexes")
+    output = os.path.join(str(tmp_path), "a", "manual_de_en")
+    spelled_differently = os.path.join(str(tmp_path), "a", "..", "a", "manual_de_en")
+    assert page_index_path_in(index_dir, output) == page_index_path_in(index_dir, spelled_differently)
+
+def test_language_page_index_path_inserts_the_language() -> None:
+    """Each target language gets its own index next to the given path."""
+    assert language_page_index_path(os.path.join("indexes", "manual.pages.json"), "fr") == os.path.join(
+        "indexes", "manual.pages.fr.json")
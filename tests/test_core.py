@@ -0,0 +1,141 @@
+"""Tests for the translation scheduler and resumable translation jobs."""
+
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+import pytest
+
+from src.backends import OfflineBackend
+from src.core import TranslationScheduler, run_translation_job
+from src.document import Page
+from src.utils.checkpoint import manifest_path_for
+
+PAGE_COUNT = 8
+SETTINGS = {"src": "de", "tgt": "en", "backend": "test"}
+
+
+class RecordingBackend(OfflineBackend):
+    """Pseudo-translating offline backend that records every batch it is sent."""
+
+    def __init__(self) -> None:
+        """Create the backend in pseudo mode."""
+        super().__init__("pseudo")
+        self.batches: list[list[str]] = []
+
+    def translate_batch(self, texts: list[str], src_lang: str, tgt_lang: str) -> list[str]:
+        """Record the batch and pseudo-translate it."""
+        self.batches.append(list(texts))
+        return super().translate_batch(texts, src_lang, tgt_lang)
+
+    def sent(self) -> list[str]:
+        """Get every text sent, in the order the batches arrived."""
+        return [text for batch in self.batches for text in batch]
+
+def pseudo(text: str) -> str:
+    """Get the pseudo translation of one chunk."""
+    return OfflineBackend("pseudo").translate_batch([text], "de", "en")[0]
+
+def translate_with(pages: list[str], *, passthrough: bool = False) -> tuple[list[str], RecordingBackend]:
+    """Translate pages through a scheduler with a recording backend."""
+    backend = RecordingBackend()
+    with TranslationScheduler(4, backend=backend, passthrough=passthrough) as scheduler:
+        return list(scheduler.translate_pages(pages, "de", "en")), backend
+
+def test_translate_pages_keeps_page_order() -> None:
+    """Pages come back in input order, each translated."""
+    pages = [f"Seite {index} des Handbuchs über die Wartung" for index in range(40)]
+    translated, _ = translate_with(pages)
+    assert translated == [pseudo(page) for page in pages]
+
+def test_short_pages_are_sent_in_batches() -> None:
+    """Short pages are grouped into fewer backend calls than pages."""
+    pages = [f"Kapitel {index}" for index in range(40)]
+    translated, backend = translate_with(pages)
+    assert translated == [pseudo(page) for page in pages]
+    assert sorted(backend.sent()) == sorted(pages)
+    assert len(backend.batches) < len(pages)
+
+def test_repeated_chunks_are_translated_once() -> None:
+    """A running header repeated on every page is sent only once."""
+    pages = ["Vertraulich - nur für den internen Gebrauch"] * 20
+    translated, backend = translate_with(pages)
+    assert translated == [pseudo(pages[0])] * len(pages)
+    assert backend.sent() == [pages[0]]
+
+def test_passthrough_sends_only_prose() -> None:
+    """Lines without words are returned unchanged without being sent."""
+    table = "4711-0815  M8x40  12.50\n4711-0816  M8x45  13.75\n4711-0817  M8x50  14.00\n"
+    prose = "Die folgenden Schrauben werden für die Montage des Gehäuses benötigt.\n"
+    translated, backend = translate_with([prose + table], passthrough=True)
+    assert translated[0].endswith(table)
+    assert all("4711" not in text for text in backend.sent())
+
+class InterruptedRunError(Exception):
+    """Raised by the test translation function to simulate an interrupted run."""
+
+def uppercase_pages(calls: list[str], fail_after: int | None = None) -> Callable[[Iterable[str]], Iterator[str]]:
+    """Build a translation function that upper-cases pages and records the pages it is given."""
+    def translate(texts: Iterable[str]) -> Iterator[str]:
+        for text in texts:
+            if fail_after is not None and len(calls) == fail_after:
+                raise InterruptedRunError
+            calls.append(text)
+            yield text.upper()
+    return translate
+
+def document(revision: int = 0) -> list[Page]:
+    """Build the pages of a document, whose second page changes with each revision."""
+    return [Page.from_text(number, f"Seite {number} Revision {revision if number == 1 else 0}")
+            for number in range(PAGE_COUNT)]
+
+def run_job(tmp_path: Path, name: str, pages: list[Page], calls: list[str], *,  # noqa: PLR0913
+            fail_after: int | None = None, resume: bool = False,
+            page_index_path: str | None = None) -> tuple[str, dict[str, int]]:
+    """Run a translation job into a txt output and return the output text and page counts."""
+    pdf_path = tmp_path / "manual.pdf"
+    if not pdf_path.exists():
+        pdf_path.write_bytes(b"%PDF-1.7")
+    output_paths, counts = run_translation_job(
+        str(pdf_path), pages, uppercase_pages(calls, fail_after), str(tmp_path / name), ["txt"], title="Manual",
+        settings=SETTINGS, page_index_path=page_index_path, resume=resume, interactive=False)
+    return Path(output_paths["txt"]).read_text(encoding="utf-8"), counts
+
+def test_resume_translates_only_the_missing_pages(tmp_path: Path) -> None:
+    """An interrupted job resumes from its manifest and produces the same output as an uninterrupted run."""
+    expected, _ = run_job(tmp_path, "uninterrupted", document(), [])
+
+    calls: list[str] = []
+    with pytest.raises(InterruptedRunError):
+        run_job(tmp_path, "manual_de_en", document(), calls, fail_after=3)
+    assert Path(manifest_path_for(str(tmp_path / "manual_de_en"))).exists()
+
+    resumed_calls: list[str] = []
+    output, counts = run_job(tmp_path, "manual_de_en", document(), resumed_calls, resume=True)
+    assert output == expected
+    assert counts == {"resumed": 3, "reused": 0, "translated": PAGE_COUNT - 3}
+    assert resumed_calls == [page.text for page in document()[3:]]
+    assert not Path(manifest_path_for(str(tmp_path / "manual_de_en"))).exists()
+
+def test_page_index_reuses_unchanged_pages(tmp_path: Path) -> None:
+    """A new revision only translates the pages whose content changed."""
+    page_index_path = str(tmp_path / "manual.pages.json")
+    run_job(tmp_path, "revision0", document(0), [], page_index_path=page_index_path)
+
+    calls: list[str] = []
+    output, counts = run_job(tmp_path, "revision1", document(1), calls, page_index_path=page_index_path)
+    assert counts == {"resumed": 0, "reused": PAGE_COUNT - 1, "translated": 1}
+    assert calls == [document(1)[1].text]
+    expected, _ = run_job(tmp_path, "expected", document(1), [])
+    assert output == expected
+
+def test_page_index_is_ignored_with_other_settings(tmp_path: Path) -> None:
+    """A page index recorded with other settings is not reused."""
+    page_index_path = str(tmp_path / "manual.pages.json")
+    run_job(tmp_path, "revision0", document(0), [], page_index_path=page_index_path)
+
+    calls: list[str] = []
+    pdf_path = tmp_path / "manual.pdf"
+    run_translation_job(str(pdf_path), document(0), uppercase_pages(calls), str(tmp_path / "french"), ["txt"],
+                        title="Manual", settings={**SETTINGS, "tgt": "fr"}, page_index_path=page_index_path,
+                        interactive=False)
+    assert len(calls) == PAGE_COUNT
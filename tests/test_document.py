@@ -0,0 +1,62 @@
+"""Tests for the document model."""
+
+import pickle
+
+from src.core import clean_pages
+from src.document import BODY, FOOTER, HEADER, Page
+from src.utils.chunking import SEGMENT_SEPARATOR
+
+PAGE_NUMBER = 3
+
+
+def manual_page(number: int = PAGE_NUMBER) -> Page:
+    """Build a page with a running header, two body blocks and a footer."""
+    return Page.from_blocks(number, [(HEADER, "Betriebsanleitung"), (BODY, "Erster Absatz\nzweite Zeile\n"),
+                                     (BODY, "Zweiter Absatz"), (FOOTER, "Seite 4")])
+
+def test_blocks_are_spans_of_the_page_text() -> None:
+    """Each block is a span of the page text, separated from running headers and footers."""
+    page = manual_page()
+    assert page.text == (f"Betriebsanleitung{SEGMENT_SEPARATOR}Erster Absatz\nzweite Zeile\nZweiter Absatz"
+                         f"{SEGMENT_SEPARATOR}Seite 4")
+    assert [(block.kind, block.text) for block in page.blocks] == [
+        (HEADER, "Betriebsanleitung"), (BODY, "Erster Absatz\nzweite Zeile\n"), (BODY, "Zweiter Absatz"),
+        (FOOTER, "Seite 4")]
+
+def test_segment_ids_depend_only_on_position() -> None:
+    """Pages, blocks and lines have stable IDs built from their positions."""
+    page = manual_page()
+    assert page.id == "p3"
+    assert [block.id for block in page.blocks] == ["p3.b0", "p3.b1", "p3.b2", "p3.b3"]
+    assert [(line.id, line.text) for line in page.blocks[1].lines()] == [("p3.b1.l0", "Erster Absatz"),
+                                                                        ("p3.b1.l1", "zweite Zeile")]
+    assert [line.id for line in manual_page().lines()] == [line.id for line in page.lines()]
+
+def test_from_text_holds_one_body_block() -> None:
+    """A page built from text has a single body block, or none when empty."""
+    page = Page.from_text(0, "Nur Text")
+    assert [(block.kind, block.text) for block in page.blocks] == [(BODY, "Nur Text")]
+    assert Page.from_text(0, "").blocks == ()
+
+def test_with_block_texts_keeps_numbers_and_kinds() -> None:
+    """Replacing the block texts keeps the page number and the kind of each block."""
+    page = manual_page().with_block_texts(["Manual", "First paragraph\n", "Second paragraph", "Page 4"])
+    assert page.number == PAGE_NUMBER
+    assert [(block.kind, block.text) for block in page.blocks] == [
+        (HEADER, "Manual"), (BODY, "First paragraph\n"), (BODY, "Second paragraph"), (FOOTER, "Page 4")]
+
+def test_pages_survive_pickling() -> None:
+    """A page sent to or from a worker process keeps its text and blocks."""
+    page = pickle.loads(pickle.dumps(manual_page()))  # noqa: S301
+    assert page.text == manual_page().text
+    assert [(block.id, block.kind, block.text) for block in page.blocks] == [
+        (block.id, block.kind, block.text) for block in manual_page().blocks]
+    assert all(block.page is page for block in page.blocks)
+
+def test_clean_pages_joins_body_blocks_across_pages_only() -> None:
+    """Words hyphenated at the end of a body block are joined with the next body block, headers stay apart."""
+    pages = [Page.from_blocks(0, [(HEADER, "Kopf-"), (BODY, "Die Über-")]),
+             Page.from_blocks(1, [(HEADER, "Kopf-"), (BODY, "setzung ist fertig.")])]
+    cleaned = list(clean_pages(pages))
+    assert [[(block.kind, block.text) for block in page.blocks] for page in cleaned] == [
+        [(HEADER, "Kopf-"), (BODY, "Die ")], [(HEADER, "Kopf-"), (BODY, "Über-setzung ist fertig.")]]
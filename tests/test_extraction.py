@@ -0,0 +1,48 @@
+"""Tests for extracting page ranges in parallel worker processes."""
+
+from pathlib import Path
+
+import pytest
+
+from src import core
+from src.core import iter_pdf_pages
+from src.utils.metrics import METRICS
+from tests.conftest import write_pdf
+
+PAGE_COUNT = 7
+RANGE_PAGES = 2
+
+
+@pytest.fixture
+def long_pdf(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """PDF split into several extraction ranges of RANGE_PAGES pages."""
+    monkeypatch.setattr(core, "EXTRACTION_RANGE_PAGES", RANGE_PAGES)
+    return write_pdf(tmp_path / "long.pdf", [f"Seite {number} der Betriebsanleitung." for number in range(PAGE_COUNT)])
+
+def page_texts(pdf_path: Path, **options: int) -> list[tuple[int, str]]:
+    """Extract the number and text of each page."""
+    return [(page.number, page.text) for page in iter_pdf_pages(str(pdf_path), **options)]
+
+def test_parallel_extraction_matches_serial_extraction(long_pdf: Path) -> None:
+    """Page ranges extracted by worker processes give the same pages, in order, as one process."""
+    serial = page_texts(long_pdf)
+    assert [number for number, _ in serial] == list(range(PAGE_COUNT))
+    assert page_texts(long_pdf, workers=2, min_parallel_pages=1) == serial
+
+def test_worker_metrics_are_merged(long_pdf: Path) -> None:
+    """Pages extracted by worker processes are counted in the metrics of the run."""
+    METRICS.reset()
+    page_texts(long_pdf, workers=2, min_parallel_pages=1)
+    assert METRICS.counters["pages_extracted"] == PAGE_COUNT
+
+def test_small_documents_and_content_are_extracted_in_process(long_pdf: Path,
+                                                              monkeypatch: pytest.MonkeyPatch) -> None:
+    """No worker pool is started below min_parallel_pages or for a document given by its content."""
+    def no_pool(*_: object, **__: object) -> None:
+        pytest.fail("started an extraction pool")
+
+    monkeypatch.setattr(core, "ProcessPoolExecutor", no_pool)
+    serial = page_texts(long_pdf)
+    assert page_texts(long_pdf, workers=2, min_parallel_pages=PAGE_COUNT + 1) == serial
+    assert [(page.number, page.text) for page in iter_pdf_pages(long_pdf.read_bytes(), workers=2,
+                                                                min_parallel_pages=1)] == serial
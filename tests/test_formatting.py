@@ -0,0 +1,55 @@
+"""Tests for the streaming output formatters."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from src.core import write_formatted_output, write_formatted_outputs
+from src.utils.formatting import STREAM_FORMATTERS, HtmlFormatter, get_formatter, get_stream_formatter
+
+BODY = "Seite 1: Drücken Sie <Start> & warten Sie.\n\fSeite 2: Temperatur > 40 °C prüfen.\n"
+
+
+@pytest.mark.parametrize("format_type", sorted(STREAM_FORMATTERS))
+def test_chunked_output_matches_whole_document(format_type: str) -> None:
+    """Formatting a body in chunks, split anywhere, gives the same document as formatting it at once."""
+    formatter = get_stream_formatter(format_type, "Handbuch <Entwurf>")
+    whole = get_formatter(format_type)(BODY, "Handbuch <Entwurf>")
+    for split in range(len(BODY) + 1):
+        chunks = [BODY[:split], BODY[split:]]
+        assert formatter.header() + "".join(map(formatter.format_chunk, chunks)) + formatter.footer() == whole
+
+def test_html_escapes_the_title_and_body() -> None:
+    """Markup in the title and body is escaped, so it shows as text."""
+    document = HtmlFormatter("Handbuch <Entwurf>").format(BODY)
+    assert "<title>Handbuch &lt;Entwurf&gt;</title>" in document
+    assert "Drücken Sie &lt;Start&gt; &amp; warten Sie." in document
+    assert "<Start>" not in document
+
+def test_unknown_format_falls_back_to_text() -> None:
+    """An unknown format writes plain text."""
+    assert get_stream_formatter("pdf").format(BODY) == BODY
+
+def test_outputs_are_written_as_chunks_arrive(tmp_path: Path) -> None:
+    """Each chunk is on disk before the next one is read, in every output."""
+    paths = {format_type: str(tmp_path / f"manual.{format_type}") for format_type in STREAM_FORMATTERS}
+    outputs = {path: get_stream_formatter(format_type, "Handbuch") for format_type, path in paths.items()}
+
+    def chunks() -> Iterator[str]:
+        for index in range(3):
+            if index:
+                for path in paths.values():
+                    assert f"Seite {index - 1}" in Path(path).read_text(encoding="utf-8")
+            yield f"Seite {index}\n"
+
+    write_formatted_outputs(outputs, chunks())
+    for format_type, path in paths.items():
+        expected = get_formatter(format_type)("Seite 0\nSeite 1\nSeite 2\n", "Handbuch")
+        assert Path(path).read_text(encoding="utf-8") == expected
+
+def test_write_formatted_output_creates_the_directory(tmp_path: Path) -> None:
+    """The output directory is created if it does not exist."""
+    path = tmp_path / "out" / "manual.md"
+    write_formatted_output(str(path), iter(["Seite 1\n"]), get_stream_formatter("md"))
+    assert path.read_text(encoding="utf-8") == "```\nSeite 1\n\n```"
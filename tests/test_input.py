@@ -0,0 +1,74 @@
+"""Tests for PDFs given by their content or on standard input, and output to standard output."""
+
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.api import Translator
+from src.core import iter_pdf_pages, read_pdf_source
+
+SCRIPT = str(Path(__file__).resolve().parent.parent / "pdf_translator.py")
+OPTIONS = ["-s", "de", "-b", "offline", "--offline-mode", "pseudo", "--no-cache"]
+
+
+def page_texts(source: object) -> list[str]:
+    """Extract the text of each page of a PDF given in any supported form."""
+    return [page.text for page in iter_pdf_pages(source)]
+
+def test_content_is_read_without_copying(manual_pdf: Path) -> None:
+    """Content already in memory is handed to PyMuPDF as it is, file objects are read once."""
+    content = manual_pdf.read_bytes()
+    assert read_pdf_source(content) is content
+    mutable = bytearray(content)
+    view = read_pdf_source(mutable)
+    assert isinstance(view, memoryview)
+    assert view.obj is mutable
+    buffer = read_pdf_source(io.BytesIO(content))
+    assert isinstance(buffer, memoryview)
+    assert buffer == content
+    with manual_pdf.open("rb") as file:
+        assert read_pdf_source(file) == content
+    assert read_pdf_source(manual_pdf) == str(manual_pdf)
+
+def test_every_input_form_extracts_the_same_pages(manual_pdf: Path) -> None:
+    """A PDF given by path, bytes, bytearray, memoryview, BytesIO or file object gives the same pages."""
+    expected = page_texts(str(manual_pdf))
+    content = manual_pdf.read_bytes()
+    for source in (content, bytearray(content), memoryview(content), io.BytesIO(content)):
+        assert page_texts(source) == expected
+    with manual_pdf.open("rb") as file:
+        assert page_texts(file) == expected
+
+def test_library_translates_content(manual_pdf: Path) -> None:
+    """The library translates a PDF given by its content like the same file given by path."""
+    with Translator("offline", mode="pseudo") as translator:
+        expected = translator.translate(str(manual_pdf), src_lang="de").text
+        assert translator.translate(manual_pdf.read_bytes(), src_lang="de").text == expected
+        with manual_pdf.open("rb") as file:
+            assert translator.translate(file, src_lang="de").text == expected
+
+def run_script(*arguments: str, stdin: bytes | None = None, cwd: Path) -> subprocess.CompletedProcess[bytes]:
+    """Run the command line in a new process."""
+    return subprocess.run([sys.executable, SCRIPT, *OPTIONS, *arguments], input=stdin,  # noqa: S603
+                          capture_output=True, check=False, cwd=cwd, timeout=120)
+
+@pytest.mark.parametrize("output_format", ["txt", "md"])
+def test_standard_input_is_translated_to_standard_output(manual_pdf: Path, output_format: str) -> None:
+    """A PDF piped to - is translated to standard output, with the messages on standard error."""
+    stdin = run_script("-", "-e", output_format, stdin=manual_pdf.read_bytes(), cwd=manual_pdf.parent)
+    assert stdin.returncode == 0, stdin.stderr
+    assert "completed" in stdin.stderr.decode("utf-8")
+    from_file = run_script(str(manual_pdf), "-c", "-e", output_format, "-o", "-", cwd=manual_pdf.parent)
+    assert from_file.returncode == 0, from_file.stderr
+    assert stdin.stdout.decode("utf-8").count("Šéîţé") == len(page_texts(str(manual_pdf)))
+    assert stdin.stdout.replace(b"standard input", b"manual.pdf") == from_file.stdout
+    assert not list(manual_pdf.parent.glob("manual_de_*"))
+
+def test_standard_input_rejects_several_outputs(manual_pdf: Path) -> None:
+    """Standard output takes a single target language."""
+    result = run_script("-", "-t", "en,fr", stdin=manual_pdf.read_bytes(), cwd=manual_pdf.parent)
+    assert result.returncode == 1
+    assert result.stdout == b""
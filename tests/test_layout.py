@@ -0,0 +1,79 @@
+"""Tests for finding running headers and footers and translating them once."""
+
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from src.core import TranslationScheduler, iter_pdf_pages
+from src.document import BODY, FOOTER, HEADER
+from src.utils.layout import Block, block_template, find_repeated_blocks, split_repeated_blocks
+from tests.test_core import RecordingBackend
+
+PAGE_HEIGHT = 842.0
+HEADER_TEXT = "Muster GmbH - Betriebsanleitung der Pumpe"
+PAGE_COUNT = 6
+
+
+def block(y: float, text: str, block_type: int = 0) -> Block:
+    """Build a text block of one line at a vertical position."""
+    return (56.0, y, 539.0, y + 10, text, 0, block_type)
+
+def page_blocks(number: int) -> list[Block]:
+    """Build the blocks of a page with a running header, a body and a numbered footer."""
+    return [block(36, HEADER_TEXT), block(300, f"Abschnitt {number} beschreibt die Wartung."),
+            block(800, f"Seite {number + 1} von {PAGE_COUNT}")]
+
+def test_block_template_ignores_numbers_and_whitespace() -> None:
+    """Copies of a footer that differ in page numbers and spacing share a template."""
+    assert block_template("Seite 3 von 10") == block_template("Seite  12\nvon 10") == "Seite # von #"
+
+def test_repeated_margin_blocks_are_found() -> None:
+    """Blocks recurring in the margins of most pages are found, body text and images are not."""
+    pages = [([*page_blocks(number), block(36, "Logo", block_type=1)], PAGE_HEIGHT) for number in range(PAGE_COUNT)]
+    assert find_repeated_blocks(pages) == {("top", HEADER_TEXT), ("bottom", "Seite # von #")}
+
+def test_too_few_pages_have_no_repeated_blocks() -> None:
+    """A document shorter than three pages has no running headers."""
+    assert find_repeated_blocks([(page_blocks(number), PAGE_HEIGHT) for number in range(2)]) == set()
+
+def test_split_repeated_blocks_separates_headers_and_footers() -> None:
+    """The running header and footer of a page are separated from its body."""
+    repeated = find_repeated_blocks([(page_blocks(number), PAGE_HEIGHT) for number in range(PAGE_COUNT)])
+    assert split_repeated_blocks(page_blocks(2), PAGE_HEIGHT, repeated) == (
+        [HEADER_TEXT], ["Abschnitt 2 beschreibt die Wartung."], [f"Seite 3 von {PAGE_COUNT}"])
+
+@pytest.fixture
+def headed_pdf(tmp_path: Path) -> Path:
+    """PDF whose pages share a running header and a numbered footer."""
+    path = tmp_path / "headed.pdf"
+    with pymupdf.open() as doc:
+        for number in range(PAGE_COUNT):
+            page = doc.new_page()
+            for _, y, _, _, text, _, _ in page_blocks(number):
+                page.insert_text((56, y + 8), text)
+        doc.save(str(path))
+    return path
+
+@pytest.mark.parametrize(("mode", "kinds"), [
+    ("keep", [BODY, BODY, BODY]),
+    ("strip", [BODY]),
+    ("once", [HEADER, BODY, FOOTER]),
+])
+def test_extraction_handles_running_headers(headed_pdf: Path, mode: str, kinds: list[str]) -> None:
+    """Running headers and footers are kept as body text, stripped, or kept as blocks of their own."""
+    pages = list(iter_pdf_pages(str(headed_pdf), mode))
+    assert len(pages) == PAGE_COUNT
+    for page in pages:
+        assert [block.kind for block in page.blocks] == kinds
+        assert f"Abschnitt {page.number}" in page.text
+        assert (HEADER_TEXT in page.text) == (mode != "strip")
+
+def test_running_header_is_translated_once(headed_pdf: Path) -> None:
+    """In once mode the header repeated on every page is sent to the translator a single time."""
+    backend = RecordingBackend()
+    pages = [page.text for page in iter_pdf_pages(str(headed_pdf), "once")]
+    with TranslationScheduler(4, backend=backend) as scheduler:
+        translated = list(scheduler.translate_pages(pages, "de", "en"))
+    assert len(translated) == PAGE_COUNT
+    assert sum(HEADER_TEXT in text for text in backend.sent()) == 1
@@ -0,0 +1,68 @@
+"""Tests for finding the parts of a text that need no translation."""
+
+import pytest
+
+from src.utils.passthrough import CODE, TEXT, split_passthrough
+
+PYTHON_CODE = """def read_sensor(port, timeout=0.5):
+    frame = port.read(16)
+    if len(frame) != 16:
+        raise TimeoutError(port.name)
+    return int.from_bytes(frame[4:8], "little") / 1000
+"""
+
+C_CODE = """int main(void) {
+printf("hello");
+return 0;
+}
+"""
+
+PROSE = [
+    pytest.param("(a) der Lieferant liefert die Ware bis zum vereinbarten Termin;\n"
+                 "(b) der Käufer zahlt den Kaufpreis innerhalb von 30 Tagen;\n"
+                 "(c) die Gewährleistung beträgt zwölf Monate;\n", id="legal-enumeration"),
+    pytest.param("1. Der Vertrag beginnt am 1. Januar;\n"
+                 "    a) Kündigungen sind schriftlich einzureichen;\n"
+                 "    b) die Frist beträgt drei Monate;\n", id="nested-enumeration"),
+    pytest.param("Die folgenden Teile werden geliefert;\n"
+                 "return of goods is handled by the supplier;\n"
+                 "const and var are costs to be agreed;\n", id="keyword-first-words"),
+    pytest.param("Pumpe(n) austauschen und Dichtung(en) prüfen;\n"
+                 "    Ventil(e) reinigen und Filter(n) wechseln;\n"
+                 "Motor(en) abschalten;\n", id="plural-forms"),
+    pytest.param("Sicherheit == Qualität && Termintreue;\n"
+                 "Kunde :: Lieferant;\n", id="operators-in-prose"),
+]
+
+
+def kinds_of(text: str) -> list[str]:
+    """Get the kinds of the runs text is split into for translation into English."""
+    return [kind for kind, _ in split_passthrough(text, "en")]
+
+@pytest.mark.parametrize("text", PROSE)
+def test_prose_is_translated(text: str) -> None:
+    """Prose with code-like line endings and words stays TEXT."""
+    assert kinds_of(text) == [TEXT]
+
+@pytest.mark.parametrize("code", [PYTHON_CODE, C_CODE])
+def test_code_listing_is_passed_through(code: str) -> None:
+    """An indented or brace-balanced listing between paragraphs is passed through."""
+    before = "Die Messwerte werden mit der folgenden Funktion über die serielle Schnittstelle gelesen.\n"
+    after = "Der Rückgabewert ist die Temperatur in Grad Celsius, gemessen am Gehäuse des Sensors.\n"
+    runs = split_passthrough(before + code + after, "en")
+    assert [kind for kind, _ in runs] == [TEXT, CODE, TEXT]
+    assert runs[1][1] == code
+
+def test_runs_concatenate_to_input() -> None:
+    """The runs always reassemble the input."""
+    text = "Einleitung zum Kapitel.\n" + PYTHON_CODE + "\n(a) erstens;\n(b) zweitens;\nhttps://example.com/x\n"
+    assert "".join(run for _, run in split_passthrough(text, "en")) == text
+
+@pytest.mark.parametrize("text", [
+    "Ja\nNein\nJa\n",
+    "Ok.\nDie Schraube wird mit dem angegebenen Drehmoment angezogen.\n",
+    "Die Schraube wird mit dem angegebenen Drehmoment angezogen.\nz. B. 5 mm\n",
+])
+def test_short_words_at_page_edges_are_translated(text: str) -> None:
+    """Short words on the first or last line of a page are sent along with the text next to them."""
+    assert kinds_of(text) == [TEXT]
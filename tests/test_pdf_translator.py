@@ -0,0 +1,20 @@
+"""Tests for the command line modes."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.parametrize(("first", "second"), [("en", "en,fr"), ("en,fr", "en")])
+def test_page_index_is_shared_by_single_and_multi_language_runs(
+        manual_pdf: Path, cli: Callable[..., bool], capsys: pytest.CaptureFixture[str], first: str,
+        second: str) -> None:
+    """A language's page index is found whether it was translated alone or with other languages."""
+    page_index = str(manual_pdf.with_name("manual.pages.json"))
+    assert cli(str(manual_pdf), "-t", first, "--page-index", page_index)
+    capsys.readouterr()
+
+    assert cli(str(manual_pdf), "-t", second, "--page-index", page_index)
+    assert "Pages: 0 translated, 3 reused from the previous revision" in capsys.readouterr().out
+    assert manual_pdf.with_name("manual.pages.en.json").exists()
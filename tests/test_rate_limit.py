@@ -0,0 +1,88 @@
+"""Tests for the request and character rate limits shared between processes."""
+
+import asyncio
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from src.utils.rate_limit import RateLimiter, SharedRateLimiter, create_rate_limiter
+
+RATE = 10.0
+# Allowance for the time that passes between reservations in a test
+TOLERANCE = 0.05
+
+
+def reserve_burst(path: str, count: int) -> None:
+    """Reserve count requests from the shared buckets, in a separate process."""
+    limiter = SharedRateLimiter(path, RATE)
+    for _ in range(count):
+        limiter.reserve(0)
+    limiter.close()
+
+def test_shared_buckets_allow_a_burst_then_space_requests(tmp_path: Path) -> None:
+    """A full bucket lets one second of requests through, later requests wait for their share."""
+    limiter = SharedRateLimiter(str(tmp_path / "rate.sqlite3"), RATE)
+    waits = [limiter.reserve(0) for _ in range(int(RATE) + 3)]
+    limiter.close()
+    assert waits[:int(RATE)] == pytest.approx([0.0] * int(RATE), abs=TOLERANCE)
+    assert waits[int(RATE):] == pytest.approx([0.1, 0.2, 0.3], abs=TOLERANCE)
+
+def test_limiters_on_one_file_share_the_quota(tmp_path: Path) -> None:
+    """Requests reserved through one limiter count against every limiter using the same file."""
+    path = str(tmp_path / "rate.sqlite3")
+    first = SharedRateLimiter(path, RATE)
+    second = SharedRateLimiter(path, RATE)
+    for _ in range(int(RATE)):
+        first.reserve(0)
+    assert second.reserve(0) == pytest.approx(1 / RATE, abs=TOLERANCE)
+    first.close()
+    second.close()
+
+def test_processes_share_the_quota(tmp_path: Path) -> None:
+    """Requests reserved by another process count against this one."""
+    path = str(tmp_path / "rate.sqlite3")
+    process = multiprocessing.get_context("spawn").Process(target=reserve_burst, args=(path, int(RATE)))
+    process.start()
+    process.join(60)
+    assert process.exitcode == 0
+    limiter = SharedRateLimiter(path, RATE)
+    assert limiter.reserve(0) > 0
+    limiter.close()
+
+def test_character_limit_waits_for_large_requests(tmp_path: Path) -> None:
+    """A request larger than the character bucket waits until its deficit is refilled."""
+    limiter = SharedRateLimiter(str(tmp_path / "rate.sqlite3"), chars_per_second=1000)
+    assert limiter.reserve(1000) == pytest.approx(0.0, abs=TOLERANCE)
+    assert limiter.reserve(500) == pytest.approx(0.5, abs=TOLERANCE)
+    limiter.close()
+
+def test_without_limits_nothing_is_reserved(tmp_path: Path) -> None:
+    """A limiter without limits never waits."""
+    limiter = SharedRateLimiter(str(tmp_path / "rate.sqlite3"))
+    assert [limiter.reserve(10**6) for _ in range(100)] == [0.0] * 100
+    limiter.close()
+
+def test_create_rate_limiter_shares_limits_only_with_a_path(tmp_path: Path) -> None:
+    """Limits are shared through the database only when a path is given and a limit is set."""
+    path = str(tmp_path / "rate.sqlite3")
+    shared = create_rate_limiter(RATE, 0, path)
+    assert isinstance(shared, SharedRateLimiter)
+    shared.close()
+    assert isinstance(create_rate_limiter(RATE, 0, None), RateLimiter)
+    assert isinstance(create_rate_limiter(0, 0, path), RateLimiter)
+
+def test_shared_limiter_spaces_concurrent_acquires(tmp_path: Path) -> None:
+    """Concurrent acquires through two limiters on one file together keep to the rate."""
+    path = str(tmp_path / "rate.sqlite3")
+    limiters = [SharedRateLimiter(path, RATE) for _ in range(2)]
+
+    async def acquire_all() -> None:
+        await asyncio.gather(*(limiters[index % 2].acquire(0) for index in range(int(RATE) + 5)))
+
+    start = time.monotonic()
+    asyncio.run(acquire_all())
+    assert time.monotonic() - start >= 5 / RATE - TOLERANCE
+    for limiter in limiters:
+        limiter.close()
@@ -0,0 +1,133 @@
+"""Tests for the resident service and its HTTP job API."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+
+from src.backends import OfflineBackend
+from src.core import TranslationScheduler
+from src.service import (
+    JobError,
+    JobOptions,
+    ServiceHTTPServer,
+    TranslationService,
+    parse_service_address,
+    safe_filename,
+)
+
+PAGES = [f"Seite {number} des Handbuchs über die Wartung der Pumpe." for number in range(3)]
+
+
+@pytest.fixture
+def service_url() -> Iterator[str]:
+    """Run a service with the pseudo-translating offline backend and yield its base URL."""
+    scheduler = TranslationScheduler(2, backend=OfflineBackend("pseudo"))
+    with TranslationService(scheduler, document_jobs=2, overwrite=True, defaults={"src": "de"}) as service:
+        server = ServiceHTTPServer(("127.0.0.1", 0), service)
+        thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_address[1]}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+def request(url: str, data: bytes | None = None, content_type: str = "application/pdf") -> tuple[int, bytes, dict]:
+    """Send a request and return the status, body and headers, also for error responses."""
+    headers = {"Content-Type": content_type} if data is not None else {}
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data, headers=headers)) as response:  # noqa: S310
+            return response.status, response.read(), dict(response.headers)
+    except urllib.error.HTTPError as e:
+        return e.code, e.read(), dict(e.headers)
+
+def wait_for_job(url: str, job_id: str) -> list[dict]:
+    """Stream the translated pages of a job until it finishes."""
+    _, body, _ = request(f"{url}/jobs/{job_id}/pages")
+    return [json.loads(line) for line in body.splitlines()]
+
+def test_uploaded_pdf_is_translated_and_streamed(service_url: str, manual_pdf: Path) -> None:
+    """An uploaded PDF is translated in memory, its pages streamed, and its outputs rendered on request."""
+    status, body, headers = request(f"{service_url}/jobs?filename=../manual.pdf&tgt=en,fr&format=txt,html",
+                                    manual_pdf.read_bytes())
+    assert status == HTTPStatus.ACCEPTED
+    job = json.loads(body)
+    assert headers["Location"] == f"/jobs/{job['id']}"
+
+    lines = wait_for_job(service_url, job["id"])
+    assert lines[-1] == {"status": "done", "error": None}
+    assert sorted((line["lang"], line["page"]) for line in lines[:-1]) == [
+        (lang, page) for lang in ("en", "fr") for page in range(len(PAGES))]
+
+    status, body, headers = request(f"{service_url}/jobs/{job['id']}/result?lang=fr&format=html")
+    assert status == HTTPStatus.OK
+    assert headers["Content-Type"] == "text/html; charset=utf-8"
+    assert headers["Content-Disposition"] == 'attachment; filename="manual_de_fr.html"'
+    assert body.startswith(b"<!DOCTYPE html>")
+    assert "Handbuchs" not in body.decode("utf-8")
+    assert not list(manual_pdf.parent.glob("manual_de_*"))
+
+def test_pdf_path_is_translated_next_to_the_file(service_url: str, manual_pdf: Path) -> None:
+    """A job given by path writes its outputs next to the PDF and serves them."""
+    status, body, _ = request(f"{service_url}/jobs", json.dumps({"path": str(manual_pdf)}).encode(),
+                              "application/json")
+    assert status == HTTPStatus.ACCEPTED
+    job_id = json.loads(body)["id"]
+    assert wait_for_job(service_url, job_id)[-1]["status"] == "done"
+
+    output = manual_pdf.with_name("manual_de_en.txt")
+    status, body, _ = request(f"{service_url}/jobs/{job_id}/result")
+    assert status == HTTPStatus.OK
+    assert body == output.read_bytes()
+    _, body, _ = request(f"{service_url}/health")
+    assert json.loads(body) == {"status": "ok", "jobs": {"queued": 0, "running": 0, "done": 1, "failed": 0}}
+
+def test_failed_job_reports_its_error(service_url: str) -> None:
+    """A PDF that cannot be opened fails its job instead of the service."""
+    _, body, _ = request(f"{service_url}/jobs", b"not a PDF")
+    job_id = json.loads(body)["id"]
+    assert wait_for_job(service_url, job_id)[-1]["status"] == "failed"
+    status, _, _ = request(f"{service_url}/jobs/{job_id}/result")
+    assert status == HTTPStatus.CONFLICT
+
+@pytest.mark.parametrize(("path", "data", "content_type", "expected"), [
+    ("/jobs/unknown", None, "", HTTPStatus.NOT_FOUND),
+    ("/unknown", None, "", HTTPStatus.NOT_FOUND),
+    ("/jobs?format=pdf", b"%PDF-1.7", "application/pdf", HTTPStatus.BAD_REQUEST),
+    ("/jobs", b"{", "application/json", HTTPStatus.BAD_REQUEST),
+    ("/jobs", b'{"path": 1}', "application/json", HTTPStatus.BAD_REQUEST),
+    ("/jobs", b'{"path": "missing.pdf"}', "application/json", HTTPStatus.BAD_REQUEST),
+    ("/jobs", b"", "application/pdf", HTTPStatus.BAD_REQUEST),
+])
+def test_invalid_requests_are_rejected(service_url: str, path: str, data: bytes | None, content_type: str,
+                                       expected: HTTPStatus) -> None:
+    """Unknown paths and invalid jobs get an error status with a JSON message."""
+    status, body, _ = request(f"{service_url}{path}", data, content_type)
+    assert status == expected
+    assert "error" in json.loads(body)
+
+def test_job_options_fall_back_to_the_service_defaults() -> None:
+    """Options missing from a request take the defaults the service was started with."""
+    options = JobOptions.from_values({"tgt": "EN,fr,en", "clean": "yes"}, {"src": "de", "format": "md"})
+    assert options == JobOptions("de", ["en", "fr"], ["md"], clean=True)
+    with pytest.raises(JobError):
+        JobOptions.from_values({"repeated_blocks": "drop"}, {})
+    with pytest.raises(JobError):
+        JobOptions.from_values({"tgt": ["en"]}, {})
+
+def test_client_file_names_are_made_safe() -> None:
+    """Client-supplied names lose their directories and characters unsafe in headers."""
+    assert safe_filename("../../etc/pass wd.pdf") == "pass_wd.pdf"
+    assert safe_filename('C:\\Users\\a"b.pdf') == "a_b.pdf"
+    assert safe_filename("..") == ""
+
+def test_service_address_defaults_to_localhost() -> None:
+    """A port alone listens on localhost."""
+    assert parse_service_address("8080") == ("127.0.0.1", 8080)
+    assert parse_service_address("0.0.0.0:9000") == ("0.0.0.0", 9000)  # noqa: S104
@@ -0,0 +1,72 @@
+"""Tests for the single-pass text cleaner and the page stream around it."""
+
+import random
+import re
+
+import pytest
+
+from src.utils.transformation import (
+    LETTER,
+    PageStreamCleaner,
+    TextCleaner,
+    clean_extracted_text,
+    fix_hyphen_linebreaks,
+    fix_single_letter_spacing,
+)
+
+SEQUENTIAL_HYPHEN_PATTERN = r"-\s*\n\s*"
+SEQUENTIAL_SPACING_PATTERN = rf"\b(?:{LETTER}-?\s){{2,}}{LETTER}\b"
+FUZZ_ALPHABET = "abcäBÖé  --\n\n\t1_."
+FUZZ_CASES = 20000
+
+
+def sequential_hyphen(text: str) -> str:
+    """Join hyphenated line breaks like the two-pass cleaner did."""
+    return re.sub(SEQUENTIAL_HYPHEN_PATTERN, "", text)
+
+def sequential_spacing(text: str) -> str:
+    """Fix single letter spacing like the two-pass cleaner did."""
+    return re.sub(SEQUENTIAL_SPACING_PATTERN, lambda m: m.group(0).replace(" ", "").replace("- ", "-"), text)
+
+def sequential_clean(text: str) -> str:
+    """Clean text like the two-pass cleaner did, joining line breaks before fixing letter spacing."""
+    return sequential_spacing(sequential_hyphen(text))
+
+@pytest.mark.parametrize(("text", "expected"), [
+    (" c ä-\nB.", " c äB."),
+    (" a b c-\nd", " a b cd"),
+    ("a -\nb c", "abc"),
+    ("a-\nb c d", "ab c d"),
+    ("a-\n- b c", "a-bc"),
+    ("H e l l o  W o r l d", "Hello  World"),
+    ("Über-\n  setzung", "Übersetzung"),
+])
+def test_clean_examples(text: str, expected: str) -> None:
+    """Letter spacing is fixed on the text as it reads after hyphenated line breaks are joined."""
+    assert sequential_clean(text) == expected
+    assert clean_extracted_text(text) == expected
+
+def test_clean_matches_sequential_cleaner() -> None:
+    """The single pass gives the same text as the two passes on random input."""
+    rng = random.Random(0)  # noqa: S311
+    for _ in range(FUZZ_CASES):
+        text = "".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 30)))
+        assert clean_extracted_text(text) == sequential_clean(text), text
+        assert fix_hyphen_linebreaks(text) == sequential_hyphen(text), text
+        assert fix_single_letter_spacing(text) == sequential_spacing(text), text
+
+def test_page_stream_completes_the_held_page_and_the_current_one() -> None:
+    """A page without a trailing fragment is returned together with the page held back before it."""
+    stream = PageStreamCleaner(TextCleaner())
+    assert stream.feed("Die Über-") == []
+    assert stream.feed("setzung ist fertig.\n") == ["Die ", "Über-setzung ist fertig.\n"]
+    assert stream.feed("Ende") == ["Ende"]
+    assert stream.finish() == []
+
+def test_page_stream_holds_back_each_page_ending_in_a_fragment() -> None:
+    """A page ending in a fragment is held back while the page before it is completed."""
+    stream = PageStreamCleaner(TextCleaner())
+    assert stream.feed("Die Über-") == []
+    assert stream.feed("setzung der Ge-") == ["Die "]
+    assert stream.feed("räte.") == ["Über-setzung der ", "Ge-räte."]
+    assert stream.finish() == []